@@ -0,0 +1,54 @@
+"""Benchmark de contención de NameNumerator.reserve(): varios procesos reservan
+a la vez en el mismo directorio y se comprueba que no se repite ningún indice.
+
+Uso: python benchmarks/bench_reserve.py [procesos] [reservas por proceso]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from namenumerator import NameNumerator  # noqa: E402
+
+
+def worker(directory: str, count: int, start, results):
+    nd = NameNumerator(def_name="shard", def_ext="out")
+    start.wait()
+    results.put([nd.reserve(directory)[0] for _ in range(count)])
+
+
+def main(processes: int = 16, count: int = 500):
+    with tempfile.TemporaryDirectory() as directory:
+        start = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(
+                target=worker, args=(directory, count, start, results)
+            )
+            for _ in range(processes)
+        ]
+        for process in workers:
+            process.start()
+
+        began = time.perf_counter()
+        start.set()
+        indexes = [index for _ in workers for index in results.get()]
+        seconds = time.perf_counter() - began
+        for process in workers:
+            process.join()
+
+        total = processes * count
+        assert len(set(indexes)) == total, "se ha repetido algún indice"
+        assert sorted(indexes) == list(range(total)), "la secuencia tiene huecos"
+        print(
+            f"{processes} procesos x {count} reservas: {total / seconds:,.0f}"
+            f" reservas/s ({seconds:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
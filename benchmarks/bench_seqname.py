@@ -0,0 +1,29 @@
+"""Micro-benchmark del coste de get_seqname() con entradas válidas.
+
+Uso: python benchmarks/bench_seqname.py [repeticiones]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from namenumerator import NameNumerator  # noqa: E402
+
+
+def main(number: int = 100_000):
+    nd = NameNumerator(def_name="light", def_ext="bak")
+    cases = {
+        "get_seqname(0)": lambda: nd.get_seqname(0),
+        "get_seqname(7)": lambda: nd.get_seqname(7),
+        "seqname_to_index": lambda: nd.seqname_to_index("light_7.bak"),
+        "NameNumerator()": lambda: NameNumerator(def_name="light"),
+    }
+    for label, func in cases.items():
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        print(f"{label:<20} {best / number * 1e6:8.3f} us/llamada")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,447 @@
+"""Suite de benchmarks de las operaciones públicas de NameNumerator.
+
+Cada benchmark se mide para varios tamaños de entrada (por defecto de 10^3 a
+10^7) y varias combinaciones de settings. Los listados son "directorios
+mixtos": solo el 5% de las entradas son miembros de la secuencia, el resto son
+nombres ajenos, algunos con el mismo prefijo o la misma extensión.
+
+Los resultados se guardan en JSON (con el commit, la versión de python y la
+máquina) para poder comparar dos ejecuciones:
+
+    python benchmarks/bench_suite.py -o base.json
+    ... cambios ...
+    python benchmarks/bench_suite.py -o nuevo.json --compare base.json
+
+--compare muestra la relación nuevo/base de cada medida y termina con código 1
+si alguna empeora más que --threshold. Con --sizes y --filter se puede acotar
+la ejecución, la suite completa con 10^7 tarda varios minutos y necesita
+~1GB de memoria.
+"""
+
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from namenumerator import (  # noqa: E402
+    NameNumerator,
+    SeqIndexSet,
+    SequenceRegistry,
+)
+
+SIZES = (10**3, 10**4, 10**5, 10**6, 10**7)
+
+SETTINGS: Dict[str, dict] = {
+    "default": {},
+    "enumerate_first": {"enumerate_first": True},
+    "from_zero": {"from_zero": True},
+    "enumerate_first+from_zero": {"enumerate_first": True, "from_zero": True},
+    "min_numlen4": {"min_numlen": 4},
+}
+
+NAME, EXT = "light", "bak"
+MEMBER_EVERY = 20  # 1 de cada 20 entradas es miembro (5%)
+FOREIGN_POOL = 4096  # nombres ajenos distintos, se reutilizan en el listado
+SCAN_DIR_MAX = 10**5  # scan_dir crea ficheros reales, no pasa de aquí
+PARALLEL_MIN = 10**5  # classify_parallel arranca un proceso por CPU
+
+_TEMPORARY: List[str] = []  # directorios creados por bench_scan_dir/index_file
+
+# (función a medir, número de elementos que procesa)
+Case = Tuple[Callable[[], object], int]
+BENCHMARKS: Dict[str, Callable[["Inputs"], Optional[Case]]] = {}
+
+
+def benchmark(func: Callable[["Inputs"], Optional[Case]]):
+    """Registra un benchmark: recibe las entradas ya preparadas y retorna la
+    función a medir y cuántos elementos procesa, o None si no aplica a ese
+    tamaño."""
+    BENCHMARKS[func.__name__[len("bench_") :]] = func
+    return func
+
+
+class Inputs:
+    """Entradas de un tamaño y unas settings, se generan una vez (sin medir) y
+    las comparten todos los benchmarks."""
+
+    def __init__(self, settings: dict, size: int):
+        self.size = size
+        self.nd = NameNumerator(**settings, def_name=NAME, def_ext=EXT)
+        members = self.nd.get_seqnames(0, size // MEMBER_EVERY)
+        foreign = _foreign_names(self.nd)
+
+        # El listado mixto, en orden de directorio simulado
+        listing = []
+        member = iter(members)
+        for position in range(size):
+            if position % MEMBER_EVERY == 0:
+                listing.append(next(member))
+            else:
+                listing.append(foreign[position % FOREIGN_POOL])
+        self.listing = listing
+        self.members = members
+        self.numbers = [str(number) for number in range(1, len(members) + 1)]
+
+        # Indices de una secuencia rota: falta el 1% y, en la versión con
+        # duplicados, otro 1% aparece dos veces
+        broken = [index for index in range(size) if index % 100 != 37]
+        self.broken = broken
+        self.broken_set = SeqIndexSet.from_ranges(_ranges(broken))
+        self.duplicated = sorted(broken + broken[::100])
+
+
+def _foreign_names(nd: NameNumerator) -> List[str]:
+    """Nombres que no son de la secuencia pero se le parecen: mismo prefijo,
+    misma extensión, número mal formado u otra cosa distinta."""
+    kinds = (
+        lambda i: f"{NAME}_{i}.tmp",
+        lambda i: f"other_{i}.{EXT}",
+        lambda i: f"{NAME}weight_{i}.{EXT}",
+        lambda i: f"{NAME}_{i}x.{EXT}",
+        lambda i: f"video{i}.mp4",
+        lambda i: f"IMG_{i:04d}.jpg",
+    )
+    return [kinds[i % len(kinds)](i) for i in range(FOREIGN_POOL)]
+
+
+def _ranges(ordered: List[int]) -> Iterator[Tuple[int, int]]:
+    start = previous = None
+    for index in ordered:
+        if previous is None or index != previous + 1:
+            if start is not None:
+                yield start, previous + 1
+            start = index
+        previous = index
+    if start is not None:
+        yield start, previous + 1
+
+
+#  CAT: Benchmarks
+@benchmark
+def bench_get_seqname(inputs: Inputs) -> Case:
+    get_seqname = inputs.nd.get_seqname
+    indexes = range(inputs.size)
+    return (lambda: [get_seqname(index) for index in indexes]), inputs.size
+
+
+@benchmark
+def bench_get_seqnames(inputs: Inputs) -> Case:
+    nd, size = inputs.nd, inputs.size
+    return (lambda: nd.get_seqnames(0, size)), size
+
+
+@benchmark
+def bench_iter_seqnames(inputs: Inputs) -> Case:
+    nd, size = inputs.nd, inputs.size
+    return (lambda: deque(nd.iter_seqnames(0, size), 0)), size
+
+
+@benchmark
+def bench_seqname_to_index(inputs: Inputs) -> Case:
+    seqname_to_index = inputs.nd.seqname_to_index
+    listing = inputs.listing
+    return (lambda: [seqname_to_index(item) for item in listing]), len(listing)
+
+
+@benchmark
+def bench_is_seqname(inputs: Inputs) -> Case:
+    is_seqname = inputs.nd.is_seqname
+    listing = inputs.listing
+    return (lambda: [is_seqname(item) for item in listing]), len(listing)
+
+
+@benchmark
+def bench_matcher_index_of(inputs: Inputs) -> Case:
+    index_of = inputs.nd.matcher().index_of
+    listing = inputs.listing
+    return (lambda: [index_of(item) for item in listing]), len(listing)
+
+
+@benchmark
+def bench_seqname_next(inputs: Inputs) -> Case:
+    seqname_next = inputs.nd.seqname_next
+    members = inputs.members
+    return (lambda: [seqname_next(item) for item in members]), len(members)
+
+
+@benchmark
+def bench_extract_seqname_parts(inputs: Inputs) -> Case:
+    extract = inputs.nd.extract_seqname_parts
+    listing = inputs.listing
+    return (lambda: [extract(item) for item in listing]), len(listing)
+
+
+@benchmark
+def bench_number_to_index(inputs: Inputs) -> Case:
+    number_to_index = inputs.nd.number_to_index
+    numbers = inputs.numbers
+    return (lambda: [number_to_index(item) for item in numbers]), len(numbers)
+
+
+@benchmark
+def bench_get_seqindexes(inputs: Inputs) -> Case:
+    nd, listing = inputs.nd, inputs.listing
+    return (lambda: nd.get_seqindexes(listing)), len(listing)
+
+
+@benchmark
+def bench_get_seqindexes_set(inputs: Inputs) -> Case:
+    nd, listing = inputs.nd, inputs.listing
+    return (lambda: nd.get_seqindexes(listing, as_set=True)), len(listing)
+
+
+@benchmark
+def bench_iter_seqindexes(inputs: Inputs) -> Case:
+    nd, listing = inputs.nd, inputs.listing
+    return (lambda: deque(nd.iter_seqindexes(listing), 0)), len(listing)
+
+
+@benchmark
+def bench_classify_parallel(inputs: Inputs) -> Optional[Case]:
+    # Por debajo de esto solo se mediría el arranque de los procesos
+    if inputs.size < PARALLEL_MIN:
+        return None
+    nd, listing = inputs.nd, inputs.listing
+    return (lambda: nd.classify_parallel(listing)), len(listing)
+
+
+@benchmark
+def bench_classify(inputs: Inputs) -> Case:
+    registry = SequenceRegistry(
+        inputs.nd, [(NAME, EXT), (NAME, "tmp"), ("other", EXT)]
+    )
+    listing = inputs.listing
+    return (lambda: registry.classify(listing)), len(listing)
+
+
+@benchmark
+def bench_scan_dir(inputs: Inputs) -> Optional[Case]:
+    if inputs.size > SCAN_DIR_MAX:
+        return None
+    directory = tempfile.mkdtemp(prefix="bench-scan-")
+    # Se borra al pasar al siguiente tamaño
+    _TEMPORARY.append(directory)
+    # Los ajenos se repiten en el listado, en disco cada uno es un fichero
+    itemnames = set(inputs.listing)
+    for itemname in itemnames:
+        open(os.path.join(directory, itemname), "w").close()
+    nd = inputs.nd
+    return (lambda: nd.scan_dir(directory)), len(itemnames)
+
+
+@benchmark
+def bench_index_file(inputs: Inputs) -> Case:
+    directory = tempfile.mkdtemp(prefix="bench-index-")
+    _TEMPORARY.append(directory)
+    path = os.path.join(directory, "listing.txt")
+    with open(path, "w") as stream:
+        stream.write("\n".join(inputs.listing))
+    nd = inputs.nd
+    return (lambda: nd.index_file(path)), len(inputs.listing)
+
+
+@benchmark
+def bench_analyze(inputs: Inputs) -> Case:
+    duplicated = inputs.duplicated
+    return (lambda: NameNumerator.analyze(duplicated)), len(duplicated)
+
+
+@benchmark
+def bench_get_missings(inputs: Inputs) -> Case:
+    broken = inputs.broken
+    return (lambda: NameNumerator.get_missings(broken)), len(broken)
+
+
+@benchmark
+def bench_get_missings_set(inputs: Inputs) -> Case:
+    broken_set = inputs.broken_set
+    return (lambda: NameNumerator.get_missings(broken_set)), len(broken_set)
+
+
+@benchmark
+def bench_get_duplicates(inputs: Inputs) -> Case:
+    duplicated = inputs.duplicated
+    return (lambda: NameNumerator.get_duplicates(duplicated)), len(duplicated)
+
+
+@benchmark
+def bench_any_duplicated(inputs: Inputs) -> Case:
+    duplicated = inputs.duplicated
+    return (lambda: NameNumerator.any_duplicated(duplicated)), len(duplicated)
+
+
+@benchmark
+def bench_adjust_broken(inputs: Inputs) -> Case:
+    broken = inputs.broken
+    return (lambda: NameNumerator.adjust_broken(broken)), len(broken)
+
+
+@benchmark
+def bench_plan_rotate(inputs: Inputs) -> Case:
+    broken, keep = inputs.broken, inputs.size // 2
+    return (lambda: NameNumerator.plan_rotate(broken, keep)), len(broken)
+
+
+@benchmark
+def bench_plan_compact(inputs: Inputs) -> Case:
+    broken = inputs.broken
+    return (lambda: NameNumerator.plan_compact(broken)), len(broken)
+
+
+#  CAT: Runner
+def run(
+    sizes: Tuple[int, ...], settings: List[str], pattern: str, repeat: int
+) -> List[dict]:
+    selected = [name for name in BENCHMARKS if re.search(pattern, name)]
+    results = []
+    for size in sizes:
+        for label in settings:
+            inputs = Inputs(SETTINGS[label], size)
+            for name in selected:
+                case = BENCHMARKS[name](inputs)
+                if case is None:
+                    continue
+                func, items = case
+                # Con entradas grandes una repetición ya tarda segundos
+                runs = max(1, min(repeat, 10**6 // size))
+                seconds = _measure(func, runs)
+                results.append(
+                    {
+                        "benchmark": name,
+                        "settings": label,
+                        "size": size,
+                        "seconds": min(seconds),
+                        "runs": seconds,
+                        "items": items,
+                        "ns_per_item": min(seconds) / max(items, 1) * 1e9,
+                    }
+                )
+                print(
+                    f"{name:<24} {label:<16} {size:>9}"
+                    f" {min(seconds) * 1e3:11.3f} ms"
+                    f" {min(seconds) / max(items, 1) * 1e9:9.1f} ns/elem",
+                    flush=True,
+                )
+            del inputs
+            for directory in _TEMPORARY:
+                shutil.rmtree(directory, ignore_errors=True)
+            _TEMPORARY.clear()
+    return results
+
+
+def _measure(func: Callable[[], object], runs: int) -> List[float]:
+    """Tiempos de cada repetición, con el recolector de basura parado como
+    hace timeit."""
+    times = []
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    finally:
+        if enabled:
+            gc.enable()
+    return times
+
+
+def compare(results: List[dict], base_path: str, threshold: float) -> bool:
+    """Muestra nuevo/base de cada medida común. Retorna True si alguna empeora
+    más que threshold."""
+    with open(base_path, encoding="utf-8") as base_file:
+        base = json.load(base_file)
+    previous = {
+        (item["benchmark"], item["settings"], item["size"]): item["seconds"]
+        for item in base["results"]
+    }
+
+    regressed = False
+    print(f"\nComparación con {base_path} ({base['meta'].get('commit')}):")
+    for item in results:
+        key = (item["benchmark"], item["settings"], item["size"])
+        if key not in previous or not previous[key]:
+            continue
+        ratio = item["seconds"] / previous[key]
+        mark = ""
+        if ratio > 1 + threshold:
+            mark = "  <-- más lento"
+            regressed = True
+        print(f"{key[0]:<24} {key[1]:<16} {key[2]:>9} {ratio:7.2f}x{mark}")
+    return regressed
+
+
+def _metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in SIZES),
+        help="tamaños separados por comas (por defecto 10^3..10^7)",
+    )
+    parser.add_argument(
+        "--settings",
+        default=",".join(SETTINGS),
+        help=f"combinaciones a medir, de: {', '.join(SETTINGS)}",
+    )
+    parser.add_argument("--filter", default="", help="regex sobre el benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="fichero JSON de resultados")
+    parser.add_argument("--compare", metavar="BASE", help="JSON con el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    sizes = tuple(int(float(size)) for size in args.sizes.split(","))
+    settings = args.settings.split(",")
+    unknown = [label for label in settings if label not in SETTINGS]
+    if unknown:
+        parser.error(f"settings desconocidas: {', '.join(unknown)}")
+
+    results = run(sizes, settings, args.filter, args.repeat)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump({"meta": _metadata(), "results": results}, output, indent=1)
+        print(f"\nResultados guardados en {args.output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+from .namenumerator import (
+    NameNumerator,
+    NameNumeratorException,
+    NotPartOfSeq,
+    NumeratorSettings,
+    SeqIndexSet,
+    SeqMatcher,
+    SequenceRegistry,
+    SequenceReport,
+)
+
+#  INFO: Paquete namenumerator
+#
+# Solo se carga el núcleo. Los módulos con dependencias más pesadas (asyncio,
+# ctypes, hilos, json...) se importan la primera vez que se accede a alguno de
+# sus nombres, así que un "import namenumerator" en un script corto no paga
+# por ellos.
+
+# nombre -> submódulo que lo define
+_LAZY = {
+    "AsyncNameNumerator": "aionumerator",
+    "CacheInfo": "cache",
+    "CacheStats": "cache",
+    "ExecutionReport": "executor",
+    "RenameError": "executor",
+    "RenameExecutor": "executor",
+    "MethodStats": "instrument",
+    "NumeratorStats": "instrument",
+    "MigrationError": "migration",
+    "RetentionPlan": "retention",
+    "RetentionPolicy": "retention",
+    "SequenceTracker": "tracker",
+    "MembershipChange": "watcher",
+    "SequenceWatcher": "watcher",
+}
+
+__all__ = [
+    "NameNumerator",
+    "NameNumeratorException",
+    "NotPartOfSeq",
+    "NumeratorSettings",
+    "SeqIndexSet",
+    "SeqMatcher",
+    "SequenceRegistry",
+    "SequenceReport",
+    *_LAZY,
+]
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,241 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import (
+    AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
+)
+from .namenumerator import NameNumerator, _raise_invalid_type, _raise_min
+from .executor import ExecutionReport
+import asyncio
+import functools
+import os
+
+#  INFO: API asyncio
+#
+# AsyncNameNumerator envuelve un NameNumerator para usarlo desde asyncio sin
+# bloquear el bucle: todo lo que toca el sistema de ficheros (listados,
+# renombrados, reservas) se ejecuta en un ThreadPoolExecutor acotado, y el
+# número de operaciones simultáneas sobre directorios se limita con un
+# semáforo.
+
+T = TypeVar("T")
+PathType = Union[str, "os.PathLike[str]"]
+
+
+class AsyncNameNumerator:
+    """Fachada asyncio de un NameNumerator.
+
+    max_workers: hilos del executor donde se hace la E/S.
+    concurrency: máximo de operaciones de directorio en curso a la vez (un
+      scan_many/rotate_many de cientos de directorios no satura el NFS).
+
+    Los métodos que no hacen E/S (get_seqname, plan_rotate, ...) se usan
+    directamente en `numerator`.
+
+    Ejemplo:
+        async with AsyncNameNumerator(nd, concurrency=16) as anum:
+            reports = await anum.rotate_many(directorios, keep=10)
+    """
+
+    def __init__(
+        self,
+        numerator: NameNumerator,
+        *,
+        max_workers: int = 8,
+        concurrency: int = 32,
+    ):
+        _raise_invalid_type("numerator", numerator, (NameNumerator,))
+        _raise_invalid_type("max_workers", max_workers, (int,))
+        _raise_min("max_workers", max_workers, 1)
+        _raise_invalid_type("concurrency", concurrency, (int,))
+        _raise_min("concurrency", concurrency, 1)
+        self._numerator = numerator
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="AsyncNameNumerator"
+        )
+        self._concurrency = concurrency
+        # El semáforo se crea en el primer uso, dentro del bucle que lo usa
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    #  CAT: Listing
+    async def scan_dir(
+        self,
+        path: PathType,
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        kind: str = "any",
+    ) -> Tuple[List[int], List[os.DirEntry]]:
+        """NameNumerator.scan_dir() sin bloquear el bucle."""
+        return await self._run(
+            self._numerator.scan_dir, path, name=name, ext=ext, kind=kind
+        )
+
+    async def iter_seqindexes(
+        self,
+        path: PathType,
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        chunk_size: int = 1024,
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """Recorre el directorio path y va entregando (index, name) de los
+        miembros de la secuencia según se listan, en bloques de chunk_size
+        entradas leídas en el executor. El orden es el del directorio."""
+        _raise_invalid_type("chunk_size", chunk_size, (int,))
+        _raise_min("chunk_size", chunk_size, 1)
+        index_of = self._numerator.matcher(name, ext).index_of
+
+        # El hueco del semáforo se ocupa mientras el directorio esté abierto
+        async with self._slot():
+            entries = await self._call(_ScandirReader, os.fspath(path))
+            try:
+                while True:
+                    chunk = await self._call(entries.read, chunk_size, index_of)
+                    if chunk is None:
+                        return
+                    for pair in chunk:
+                        yield pair
+            finally:
+                await self._call(entries.close)
+
+    async def scan_many(
+        self,
+        paths: Iterable[PathType],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        kind: str = "any",
+    ) -> Dict[str, List[int]]:
+        """Lista varios directorios a la vez (como mucho `concurrency`) y
+        retorna {directorio: indices ordenados}."""
+        paths = [os.fspath(path) for path in paths]
+        results = await asyncio.gather(
+            *(self.scan_dir(path, name=name, ext=ext, kind=kind) for path in paths)
+        )
+        return {path: seqindexes for path, (seqindexes, _) in zip(paths, results)}
+
+    #  CAT: Operations
+    async def apply_plan(
+        self,
+        path: PathType,
+        plan: List[Tuple[int, Optional[int]]],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        workers: int = 4,
+    ) -> ExecutionReport:
+        """NameNumerator.apply_plan() sin bloquear el bucle."""
+        return await self._run(
+            self._numerator.apply_plan, path, plan, name=name, ext=ext, workers=workers
+        )
+
+    async def rotate(
+        self,
+        path: PathType,
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        keep: Optional[int] = None,
+        workers: int = 4,
+    ) -> ExecutionReport:
+        """Lista el directorio, calcula plan_rotate() y lo aplica, dejando libre
+        el indice 0 de la secuencia."""
+        numerator = self._numerator
+        async with self._slot():
+            seqindexes, _ = await self._call(
+                numerator.scan_dir, path, name=name, ext=ext
+            )
+            plan = numerator.plan_rotate(seqindexes, keep)
+            return await self._call(
+                numerator.apply_plan, path, plan, name=name, ext=ext, workers=workers
+            )
+
+    async def rotate_many(
+        self,
+        paths: Iterable[PathType],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        keep: Optional[int] = None,
+        workers: int = 4,
+    ) -> Dict[str, ExecutionReport]:
+        """rotate() sobre varios directorios a la vez (como mucho
+        `concurrency`). Retorna {directorio: ExecutionReport}."""
+        paths = [os.fspath(path) for path in paths]
+        reports = await asyncio.gather(
+            *(
+                self.rotate(path, name=name, ext=ext, keep=keep, workers=workers)
+                for path in paths
+            )
+        )
+        return dict(zip(paths, reports))
+
+    async def reserve(
+        self,
+        path: PathType,
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        kind: str = "file",
+    ) -> Tuple[int, str]:
+        """NameNumerator.reserve() sin bloquear el bucle."""
+        return await self._run(
+            self._numerator.reserve, path, name=name, ext=ext, kind=kind
+        )
+
+    #  CAT: Lifecycle
+    def close(self):
+        """Cierra el executor, espera a lo que esté en curso."""
+        self._pool.shutdown(wait=True)
+
+    async def __aenter__(self) -> "AsyncNameNumerator":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    @property
+    def numerator(self) -> NameNumerator:
+        return self._numerator
+
+    #  CAT: Private Methods
+    def _slot(self) -> asyncio.Semaphore:
+        """Semáforo que limita las operaciones de directorio simultáneas."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        return self._semaphore
+
+    async def _call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Ejecuta func en el executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, functools.partial(func, *args, **kwargs)
+        )
+
+    async def _run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """_call() ocupando un hueco del semáforo."""
+        async with self._slot():
+            return await self._call(func, *args, **kwargs)
+
+
+class _ScandirReader:
+    """os.scandir leído por bloques desde el executor."""
+
+    def __init__(self, path: str):
+        self._entries = os.scandir(path)
+
+    def read(
+        self, size: int, index_of: Callable[[str], Optional[int]]
+    ) -> Optional[List[Tuple[int, str]]]:
+        """Lee hasta size entradas y retorna los miembros, o None al final."""
+        found = []
+        read = 0
+        for entry in islice(self._entries, size):
+            read += 1
+            index = index_of(entry.name)
+            if index is not None:
+                found.append((index, entry.name))
+        return found if read else None
+
+    def close(self):
+        self._entries.close()
@@ -0,0 +1,182 @@
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+from .namenumerator import NameNumerator, _raise_invalid_type, _raise_min
+
+#  INFO: Caches opcionales de nombres
+#
+# NameNumerator.enable_cache() sustituye en la instancia get_seqname,
+# seqname_to_index e is_seqname por versiones que guardan los últimos
+# resultados en dos caches LRU acotadas: la directa (indice -> nombre) y la
+# inversa (nombre -> indice). Las claves son los argumentos tal y como se
+# reciben (name/ext None significa el valor por defecto), por eso el cambio de
+# def_name o def_ext vacía las caches. Los argumentos que no se pueden usar
+# como clave van directos al método original, que da el error de siempre.
+
+# Métodos que se sustituyen
+METHODS = ("get_seqname", "seqname_to_index", "is_seqname")
+
+
+class CacheInfo(NamedTuple):
+    """Aciertos, fallos y ocupación de una de las caches."""
+
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Proporción de aciertos (0.0 si no se ha consultado)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CacheStats(NamedTuple):
+    """Resultado de NameNumerator.cache_info().
+
+    forward: get_seqname (indice -> nombre).
+    reverse: seqname_to_index e is_seqname (nombre -> indice).
+    """
+
+    enabled: bool
+    forward: CacheInfo
+    reverse: CacheInfo
+
+
+class _LRU:
+    """OrderedDict acotado con sus contadores."""
+
+    __slots__ = ("data", "maxsize", "hits", "misses")
+
+    def __init__(self, maxsize: int):
+        self.data: OrderedDict = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, len(self.data), self.maxsize)
+
+
+class _Caches:
+    """Caches de una instancia, NameNumerator las guarda en _caches."""
+
+    __slots__ = ("forward", "reverse")
+
+    def __init__(self, maxsize: int):
+        self.forward = _LRU(maxsize)
+        self.reverse = _LRU(maxsize)
+
+    def clear(self):
+        """Vacía las caches conservando los contadores."""
+        self.forward.data.clear()
+        self.reverse.data.clear()
+
+
+def enable(numerator: NameNumerator, maxsize: int):
+    """Activa las caches. Si ya lo estaban se vacían y se ponen a cero."""
+    _raise_invalid_type("maxsize", maxsize, (int,), stack=2)
+    _raise_min("maxsize", maxsize, 1, stack=2)
+    numerator._caches = _Caches(maxsize)
+    numerator._install_wrappers()
+
+
+def disable(numerator: NameNumerator):
+    """Vuelve a los métodos de la clase y libera las caches."""
+    numerator._caches = None
+    numerator._install_wrappers()
+
+
+def snapshot(numerator: NameNumerator) -> CacheStats:
+    caches = numerator._caches
+    if caches is None:
+        empty = CacheInfo(0, 0, 0, 0)
+        return CacheStats(False, empty, empty)
+    return CacheStats(True, caches.forward.info(), caches.reverse.info())
+
+
+def install(numerator: NameNumerator):
+    """Monta los envoltorios sobre los métodos actuales de la instancia, lo
+    llama NameNumerator._install_wrappers()."""
+    caches = numerator._caches
+    numerator.get_seqname = _forward(numerator.get_seqname, caches.forward)
+    seqname_to_index, is_seqname = _reverse(numerator, caches.reverse)
+    numerator.seqname_to_index = seqname_to_index
+    numerator.is_seqname = is_seqname
+
+
+def _forward(method: Callable, lru: _LRU) -> Callable:
+    data = lru.data
+    maxsize = lru.maxsize
+
+    def get_seqname(index, name=None, ext=None):
+        # El tipo forma parte de la clave: 1.0 == 1 pero 1.0 no es válido
+        key = (index.__class__, index, name, ext)
+        try:
+            seqname = data[key]
+        except KeyError:
+            pass
+        except TypeError:
+            return method(index, name, ext)
+        else:
+            lru.hits += 1
+            data.move_to_end(key)
+            return seqname
+
+        seqname = data[key] = method(index, name, ext)
+        lru.misses += 1
+        if len(data) > maxsize:
+            data.popitem(last=False)
+        return seqname
+
+    get_seqname.__doc__ = method.__doc__
+    get_seqname.__wrapped__ = method
+    return get_seqname
+
+
+def _reverse(numerator: NameNumerator, lru: _LRU) -> tuple:
+    """seqname_to_index e is_seqname comparten la cache: las dos guardan el
+    indice (o None) de cada nombre."""
+    data = lru.data
+    maxsize = lru.maxsize
+    method_to_index = numerator.seqname_to_index
+    method_is = numerator.is_seqname
+
+    def store(key: tuple, index: Optional[int]):
+        lru.misses += 1
+        data[key] = index
+        if len(data) > maxsize:
+            data.popitem(last=False)
+
+    def seqname_to_index(seqname, *, name=None, ext=None):
+        key = (seqname, name, ext)
+        try:
+            index = data[key]
+        except (KeyError, TypeError):
+            index = method_to_index(seqname, name=name, ext=ext)
+            store(key, index)
+            return index
+        lru.hits += 1
+        data.move_to_end(key)
+        return index
+
+    def is_seqname(seqname, *, name=None, ext=None):
+        key = (seqname, name, ext)
+        try:
+            index = data[key]
+        except (KeyError, TypeError):
+            # El método original valida y da los errores con su nombre
+            if not method_is(seqname, name=name, ext=ext):
+                store(key, None)
+                return False
+            store(key, numerator._matcher(name, ext).index_of(seqname))
+            return True
+        lru.hits += 1
+        data.move_to_end(key)
+        return index is not None
+
+    seqname_to_index.__doc__ = method_to_index.__doc__
+    seqname_to_index.__wrapped__ = method_to_index
+    is_seqname.__doc__ = method_is.__doc__
+    is_seqname.__wrapped__ = method_is
+    return seqname_to_index, is_seqname
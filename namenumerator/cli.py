@@ -0,0 +1,266 @@
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence
+from .namenumerator import NameNumerator, NameNumeratorException, SeqIndexSet
+import argparse
+import os
+import sys
+
+#  INFO: Línea de comandos
+#
+# python -m namenumerator <subcomando> --name NAME [--ext EXT] [-0] < nombres
+#
+# Los nombres se leen de stdin en bloques grandes, separados por salto de línea
+# o por NUL con -0 (para usarlo tras find -print0), y la salida se escribe por
+# lotes con el mismo separador. Ningún subcomando guarda la lista de nombres:
+# index y names trabajan en streaming y el resto solo guardan los indices en un
+# SeqIndexSet (un bit por indice, o tramos si están dispersos), así que la
+# memoria no depende del número de nombres de la entrada ni de lo alto que sea
+# un indice suelto. Las rutas (como las que escribe find) se comparan por su
+# último componente.
+
+CHUNK_SIZE = 1 << 20  # bytes leídos de stdin por bloque
+BATCH_SIZE = 4096  # registros acumulados antes de escribir
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Punto de entrada, retorna el código de salida."""
+    args = _build_parser().parse_args(argv)
+    try:
+        numerator = NameNumerator(
+            args.separator,
+            args.enumerate_first,
+            args.from_zero,
+            args.min_numlen,
+            def_name=args.name,
+            def_ext=args.ext,
+        )
+        args.command(numerator, args)
+        sys.stdout.flush()
+    except (ValueError, NameNumeratorException, OSError) as error:
+        if isinstance(error, BrokenPipeError):
+            # La salida se ha cerrado (| head), no es un error
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            return 0
+        print(error, file=sys.stderr)
+        return 1
+    return 0
+
+
+#  CAT: Commands
+def cmd_index(numerator: NameNumerator, args: argparse.Namespace):
+    """Escribe 'indice<TAB>nombre' por cada miembro, en el orden de entrada."""
+    index_of = numerator.matcher().index_of
+    sep = os.sep
+    with _Writer(args.delimiter) as writer:
+        for names in _read_names(sys.stdin.buffer, args.delimiter):
+            records = []
+            for itemname in names:
+                index = index_of(itemname[itemname.rfind(sep) + 1 :])
+                if index is not None:
+                    records.append(f"{index}\t{itemname}")
+            writer.extend(records)
+
+
+def cmd_gaps(numerator: NameNumerator, args: argparse.Namespace):
+    """Escribe los indices libres por debajo del más alto, en orden."""
+    indexset = _read_indexset(numerator, args.delimiter)
+    with _Writer(args.delimiter) as writer:
+        for start, stop in indexset.missing_ranges(indexset.max_index):
+            writer.extend(_format_range(numerator, start, stop, args))
+
+
+def cmd_dups(numerator: NameNumerator, args: argparse.Namespace):
+    """Escribe 'indice<TAB>veces' de los indices con más de un nombre."""
+    index_of = numerator.matcher().index_of
+    sep = os.sep
+    seen = SeqIndexSet()
+    counts = {}  # solo los duplicados
+    for names in _read_names(sys.stdin.buffer, args.delimiter):
+        for itemname in names:
+            index = index_of(itemname[itemname.rfind(sep) + 1 :])
+            if index is None:
+                continue
+            if index in seen:
+                counts[index] = counts.get(index, 1) + 1
+            else:
+                seen.add(index)
+
+    with _Writer(args.delimiter) as writer:
+        writer.extend(f"{index}\t{counts[index]}" for index in sorted(counts))
+
+
+def cmd_next(numerator: NameNumerator, args: argparse.Namespace):
+    """Escribe el siguiente nombre libre: tras el más alto o, con --fill-gaps,
+    el hueco más bajo."""
+    indexset = _read_indexset(numerator, args.delimiter)
+    if args.fill_gaps:
+        index = indexset.next_free()
+    else:
+        max_index = indexset.max_index
+        index = 0 if max_index is None else max_index + 1
+    with _Writer(args.delimiter) as writer:
+        writer.extend(_format_range(numerator, index, index + 1, args))
+
+
+def cmd_names(numerator: NameNumerator, args: argparse.Namespace):
+    """Escribe los nombres de los indices START..STOP-1, no lee stdin."""
+    seqnames = numerator.iter_seqnames(args.start, args.stop)
+    with _Writer(args.delimiter) as writer:
+        writer.extend(seqnames)
+
+
+def cmd_rotate(numerator: NameNumerator, args: argparse.Namespace):
+    """Escribe el plan de plan_rotate() como 'origen<TAB>destino' (destino
+    vacío significa eliminar). Con --apply DIR lista y rota ese directorio en
+    lugar de leer stdin."""
+    if args.apply is not None:
+        seqindexes, _ = numerator.scan_dir(args.apply)
+        plan = numerator.plan_rotate(seqindexes, args.keep)
+        report = numerator.apply_plan(args.apply, plan)
+        print(
+            f"{report.renamed} renombrados, {report.deleted} eliminados"
+            f" en {report.seconds:.3f}s",
+            file=sys.stderr,
+        )
+        return
+
+    indexset = _read_indexset(numerator, args.delimiter)
+    get_seqname = numerator.get_seqname
+    with _Writer(args.delimiter) as writer:
+        writer.extend(
+            f"{get_seqname(src)}\t{'' if dst is None else get_seqname(dst)}"
+            for src, dst in numerator.plan_rotate(indexset, args.keep)
+        )
+
+
+#  CAT: Private Functions
+def _build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--name", required=True, help="nombre de la secuencia")
+    common.add_argument("--ext", help="extensión de la secuencia, sin el punto")
+    common.add_argument("--separator", default="_")
+    common.add_argument("--enumerate-first", action="store_true")
+    common.add_argument("--from-zero", action="store_true")
+    common.add_argument("--min-numlen", type=int, default=1)
+    common.add_argument(
+        "-0",
+        "--null",
+        dest="delimiter",
+        action="store_const",
+        const=b"\0",
+        default=b"\n",
+        help="nombres separados por NUL en la entrada y en la salida",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="python -m namenumerator",
+        description="Trabaja con secuencias de nombres numerados.",
+    )
+    subparsers = parser.add_subparsers(required=True, metavar="COMMAND")
+
+    def add(name: str, command, help: str) -> argparse.ArgumentParser:
+        subparser = subparsers.add_parser(name, parents=[common], help=help)
+        subparser.set_defaults(command=command)
+        return subparser
+
+    add("index", cmd_index, "indice de cada miembro de la entrada")
+    gaps = add("gaps", cmd_gaps, "indices libres por debajo del más alto")
+    add("dups", cmd_dups, "indices con más de un nombre")
+    next_ = add("next", cmd_next, "siguiente nombre libre")
+    names = add("names", cmd_names, "nombres de un rango de indices")
+    rotate = add("rotate", cmd_rotate, "plan para liberar el indice 0")
+
+    for subparser in (gaps, next_):
+        subparser.add_argument(
+            "--indexes", action="store_true", help="escribe indices, no nombres"
+        )
+    next_.add_argument(
+        "--fill-gaps", action="store_true", help="usa el hueco más bajo"
+    )
+    names.add_argument("start", type=int)
+    names.add_argument("stop", type=int)
+    rotate.add_argument("--keep", type=int, help="máximo de elementos a conservar")
+    rotate.add_argument(
+        "--apply", metavar="DIR", help="rota el directorio DIR en lugar de stdin"
+    )
+    return parser
+
+
+def _read_names(stream: BinaryIO, delimiter: bytes) -> Iterator[List[str]]:
+    """Lee stream por bloques de CHUNK_SIZE y retorna los nombres de cada
+    bloque. Cada bloque se decodifica de una vez (surrogateescape, como
+    os.fsdecode) cortando en el último separador, así que nunca se parte un
+    nombre ni un carácter multibyte. Los nombres vacíos se descartan."""
+    encoding = sys.getfilesystemencoding()
+    separator = delimiter.decode()
+    pending = b""
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        chunk = pending + chunk if pending else chunk
+        cut = chunk.rfind(delimiter)
+        if cut < 0:
+            pending = chunk
+            continue
+        pending = chunk[cut + 1 :]
+        text = chunk[:cut].decode(encoding, "surrogateescape")
+        yield [itemname for itemname in text.split(separator) if itemname]
+
+    if pending:
+        yield [pending.decode(encoding, "surrogateescape")]
+
+
+def _read_indexset(numerator: NameNumerator, delimiter: bytes) -> SeqIndexSet:
+    """Indices de los miembros de la entrada, sin duplicados."""
+    index_of = numerator.matcher().index_of
+    sep = os.sep
+    indexset = SeqIndexSet()
+    add = indexset.add
+    for names in _read_names(sys.stdin.buffer, delimiter):
+        for itemname in names:
+            index = index_of(itemname[itemname.rfind(sep) + 1 :])
+            if index is not None:
+                add(index)
+    return indexset
+
+
+def _format_range(
+    numerator: NameNumerator, start: int, stop: int, args: argparse.Namespace
+) -> Iterator[str]:
+    """Indices o nombres (según --indexes) de range(start, stop)."""
+    if args.indexes:
+        return map(str, range(start, stop))
+    return numerator.iter_seqnames(start, stop)
+
+
+class _Writer:
+    """Acumula registros y los escribe en stdout por lotes de BATCH_SIZE,
+    terminados en delimiter."""
+
+    def __init__(self, delimiter: bytes):
+        self._stream = sys.stdout.buffer
+        self._encoding = sys.getfilesystemencoding()
+        self._separator = delimiter.decode()
+        self._batch: List[str] = []
+
+    def extend(self, records: Iterable[str]):
+        batch = self._batch
+        for record in records:
+            batch.append(record)
+            if len(batch) >= BATCH_SIZE:
+                self.flush()
+
+    def flush(self):
+        if self._batch:
+            separator = self._separator
+            data = separator.join(self._batch) + separator
+            self._stream.write(data.encode(self._encoding, "surrogateescape"))
+            self._batch.clear()
+
+    def __enter__(self) -> "_Writer":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
@@ -0,0 +1,334 @@
+from array import array
+from itertools import chain
+from typing import Dict, Optional, Set, Tuple, Union
+from .namenumerator import NameNumerator, SeqIndexSet, SeqMatcher
+import os
+import struct
+import sys
+import tempfile
+import time
+
+#  INFO: Cache en disco de los listados
+#
+# NameNumerator.scan_dir_cached() guarda en cada directorio, dentro del
+# subdirectorio CACHE_DIRNAME, un fichero CACHE_FILENAME con el listado del
+# directorio y el SeqIndexSet de cada secuencia (settings, name, ext, kind) que
+# se ha pedido. Formato, todo little endian:
+#
+#   cabecera: MAGIC, inodo del directorio (Q), mtime del directorio en ns (q),
+#             número de entradas (I)
+#   entrada:  longitud de la clave (H), longitud del valor (I), clave, valor
+#   valor:    b"B" + bitmap o b"R" + los tramos (start, stop) como enteros de
+#             64 bits (q), según la representación del SeqIndexSet
+#
+# La entrada de clave vacía es el listado: cada nombre precedido de su tipo
+# (b"d", b"f" u b"o") y separados por NUL.
+#
+# La cache vale mientras el mtime del directorio coincida con el de la
+# cabecera. Como el fichero vive en un subdirectorio, reescribirlo no cambia el
+# mtime del directorio vigilado y se puede guardar el de antes de listar:
+#   1. stat del directorio y un único listado,
+#   2. otro stat: si el mtime no ha cambiado y es al menos un tick del reloj
+#      de mtime más antiguo que el listado (un cambio posterior dentro del
+#      mismo tick no lo cambiaría), se guarda; si no, se guarda 0 (nunca
+#      válido).
+# Con la cache obsoleta o sin validar se vuelve a listar una sola vez y se
+# aplica la diferencia con el listado guardado a cada secuencia: las altas se
+# añaden a su SeqIndexSet y, si alguna baja es miembro, esa secuencia se
+# recalcula con el listado nuevo, que ya está en memoria (otro nombre puede
+# seguir teniendo el mismo indice, img_1 e img_01). La escritura va a un
+# temporal que se renombra con os.replace, así que nunca se lee un fichero a
+# medias, y un fichero dañado o de otra versión se trata como si no existiera.
+
+CACHE_DIRNAME = ".namenumerator-cache"
+CACHE_FILENAME = "index"
+
+MAGIC = b"NNC\x04"
+_HEADER = struct.Struct("<4sQqI")
+_ENTRY = struct.Struct("<HI")
+
+_LISTING_KEY = b""
+_KIND_CODES = {"dir": "d", "file": "f", "other": "o"}
+_KIND_NAMES = {code: kind for kind, code in _KIND_CODES.items()}
+
+# Linux actualiza el mtime con un reloj de pocos ms y algunos sistemas de
+# ficheros (NFS, FAT, ...) solo guardan segundos enteros: un cambio dentro del
+# mismo tick no cambiaría el mtime
+_MTIME_TICK_NS = 20_000_000
+_COARSE_MTIME_TICK_NS = 1_000_000_000
+
+Entries = Dict[bytes, bytes]
+Listing = Set[Tuple[str, str]]
+
+
+def scan(
+    numerator: NameNumerator,
+    path: Union[str, "os.PathLike[str]"],
+    name: Optional[str],
+    ext: Optional[str],
+    kind: str,
+) -> SeqIndexSet:
+    """Implementación de NameNumerator.scan_dir_cached(), los argumentos ya
+    están validados."""
+    matcher = numerator._matcher(name, ext, stack=4)
+    settings = numerator.settings
+    key = "\0".join(
+        (
+            settings.separator,
+            str(int(settings.enumerate_first)),
+            str(int(settings.from_zero)),
+            matcher.name,
+            matcher.ext or "",
+            kind,
+        )
+    ).encode("utf-8", "surrogateescape")
+
+    directory = os.fspath(path)
+    cache_dir = os.path.join(directory, CACHE_DIRNAME)
+    cache_path = os.path.join(cache_dir, CACHE_FILENAME)
+    state = os.stat(directory)
+    stamp, entries = _load(cache_path, state.st_ino)
+    if stamp and stamp == state.st_mtime_ns:
+        indexset = _cached(entries, key)
+        if indexset is not None:
+            return indexset
+        listing = _decode_listing(entries.get(_LISTING_KEY))
+        if listing is not None:
+            # La cache vale, la secuencia nueva sale del listado guardado
+            indexset = _members(matcher, kind, listing)
+            _put(entries, key, indexset)
+            _store(cache_path, state.st_ino, stamp, entries)
+            return indexset
+
+    if _make_dir(cache_dir):
+        # Crear el subdirectorio cambia el mtime, se toma el de después
+        state = os.stat(directory)
+    started = time.time_ns()
+    listing = _listing(directory)
+
+    previous = _decode_listing(entries.pop(_LISTING_KEY, None))
+    if previous is None:
+        entries = {}
+    else:
+        _update(entries, previous, listing)
+    indexset = _cached(entries, key)
+    if indexset is None:
+        indexset = _members(matcher, kind, listing)
+        _put(entries, key, indexset)
+    entries[_LISTING_KEY] = _encode_listing(listing)
+
+    stamp = state.st_mtime_ns if _settled(directory, state, started) else 0
+    _store(cache_path, state.st_ino, stamp, entries)
+    return indexset
+
+
+def _members(matcher: SeqMatcher, kind: str, listing: Listing) -> SeqIndexSet:
+    """SeqIndexSet de los miembros de la secuencia en el listado."""
+    index_of = matcher.index_of
+    indexset = SeqIndexSet()
+    for itemname, entry_kind in listing:
+        index = index_of(itemname)
+        if index is None:
+            continue
+        if kind != "any" and kind != entry_kind:
+            continue
+        indexset._add(index)
+    return indexset
+
+
+def _update(entries: Entries, previous: Listing, listing: Listing):
+    """Aplica a cada secuencia guardada la diferencia entre el listado
+    anterior y el actual (ver la cabecera del módulo). Las entradas que no se
+    pueden interpretar se descartan."""
+    added = listing - previous
+    removed = previous - listing
+    for key in list(entries):
+        indexset = _cached(entries, key)
+        parsed = _parse_key(key)
+        if indexset is None or parsed is None:
+            del entries[key]
+            continue
+        matcher, kind = parsed
+        if _members(matcher, kind, removed):
+            indexset = _members(matcher, kind, listing)
+        else:
+            for index in _members(matcher, kind, added):
+                indexset._add(index)
+        _put(entries, key, indexset)
+
+
+def _parse_key(key: bytes) -> Optional[Tuple[SeqMatcher, str]]:
+    """(matcher, kind) de la clave de una secuencia o None si está dañada."""
+    fields = key.decode("utf-8", "surrogateescape").split("\0")
+    if len(fields) != 6:
+        return None
+    separator, enumerate_first, from_zero, name, ext, kind = fields
+    matcher = SeqMatcher(
+        name, ext or None, separator, enumerate_first == "1", from_zero == "1"
+    )
+    return matcher, kind
+
+
+def _cached(entries: Entries, key: bytes) -> Optional[SeqIndexSet]:
+    value = entries.get(key)
+    return None if value is None else _decode(value)
+
+
+def _put(entries: Entries, key: bytes, indexset: SeqIndexSet):
+    try:
+        entries[key] = _encode(indexset)
+    except OverflowError:
+        # Algún indice no cabe en 64 bits, esta secuencia no se guarda
+        entries.pop(key, None)
+
+
+def _encode(indexset: SeqIndexSet) -> bytes:
+    """Valor de la entrada de un SeqIndexSet. Lanza OverflowError si algún
+    tramo no cabe en 64 bits."""
+    if indexset._bits is not None:
+        return b"B" + bytes(indexset._bits)
+    runs = array("q", chain.from_iterable(zip(indexset._starts, indexset._stops)))
+    if sys.byteorder == "big":
+        runs.byteswap()
+    return b"R" + runs.tobytes()
+
+
+def _decode(value: bytes) -> Optional[SeqIndexSet]:
+    """SeqIndexSet de una entrada o None si está dañada."""
+    kind, data = value[:1], value[1:]
+    if kind == b"B":
+        return SeqIndexSet._from_bits(data)
+    if kind != b"R" or len(data) % 16:
+        return None
+    runs = array("q")
+    runs.frombytes(data)
+    if sys.byteorder == "big":
+        runs.byteswap()
+    try:
+        return SeqIndexSet.from_ranges(zip(runs[::2], runs[1::2]))
+    except ValueError:
+        # Un tramo negativo
+        return None
+
+
+def _encode_listing(listing: Listing) -> bytes:
+    return os.fsencode(
+        "\0".join(_KIND_CODES[kind] + itemname for itemname, kind in listing)
+    )
+
+
+def _decode_listing(value: Optional[bytes]) -> Optional[Listing]:
+    """Listado de la entrada de clave vacía o None si no está o está dañada."""
+    if value is None:
+        return None
+    if not value:
+        return set()
+    listing = set()
+    for record in os.fsdecode(value).split("\0"):
+        kind = _KIND_NAMES.get(record[:1])
+        if kind is None or len(record) < 2:
+            return None
+        listing.add((record[1:], kind))
+    return listing
+
+
+def _listing(directory: str) -> Listing:
+    """(nombre, "dir"/"file"/"other") de cada entrada, sin la cache. El tipo se
+    comprueba como en scan_dir(), con la información que ya trae os.scandir."""
+    with os.scandir(directory) as entries:
+        return {
+            (entry.name, _entry_kind(entry))
+            for entry in entries
+            if not entry.name.startswith(CACHE_DIRNAME)
+        }
+
+
+def _entry_kind(entry: os.DirEntry) -> str:
+    if entry.is_dir():
+        return "dir"
+    return "file" if entry.is_file() else "other"
+
+
+def _settled(directory: str, state: os.stat_result, started: int) -> bool:
+    """True si el mtime de state sigue siendo el del directorio y es al menos
+    un tick anterior al listado, así que cualquier cambio posterior lo habría
+    cambiado."""
+    mtime = state.st_mtime_ns
+    try:
+        if os.stat(directory).st_mtime_ns != mtime:
+            return False
+    except OSError:
+        return False
+    coarse = mtime % 1_000_000_000 == 0
+    return started - mtime >= (_COARSE_MTIME_TICK_NS if coarse else _MTIME_TICK_NS)
+
+
+def _make_dir(cache_dir: str) -> bool:
+    """Crea el subdirectorio de la cache si no existe (sustituyendo el fichero
+    de las versiones anteriores). Retorna True si lo ha creado."""
+    try:
+        os.mkdir(cache_dir)
+        return True
+    except FileExistsError:
+        if os.path.isdir(cache_dir):
+            return False
+    except OSError:
+        return False
+    try:
+        os.remove(cache_dir)
+        os.mkdir(cache_dir)
+        return True
+    except OSError:
+        return False
+
+
+def _load(cache_path: str, inode: int) -> Tuple[int, Entries]:
+    """(mtime de la cabecera, entradas) si la cache es del directorio, si no
+    (0, {})."""
+    try:
+        with open(cache_path, "rb") as stream:
+            data = stream.read()
+    except OSError:
+        return 0, {}
+
+    try:
+        magic, cached_inode, mtime, count = _HEADER.unpack_from(data)
+        if magic != MAGIC or cached_inode != inode:
+            return 0, {}
+        entries = {}
+        position = _HEADER.size
+        for _ in range(count):
+            key_size, value_size = _ENTRY.unpack_from(data, position)
+            position += _ENTRY.size
+            key = data[position : position + key_size]
+            position += key_size
+            entries[key] = data[position : position + value_size]
+            position += value_size
+    except struct.error:
+        return 0, {}
+    # Un fichero truncado o con basura al final no vale
+    return (mtime, entries) if position == len(data) else (0, {})
+
+
+def _store(cache_path: str, inode: int, mtime: int, entries: Entries):
+    """Escribe la cache de forma atómica. Es solo una cache: si no se puede
+    escribir (sin permisos, disco lleno, ...) se deja como estaba."""
+    data = [_HEADER.pack(MAGIC, inode, mtime, len(entries))]
+    for key, value in entries.items():
+        data += (_ENTRY.pack(len(key), len(value)), key, value)
+
+    try:
+        descriptor, tmp_path = tempfile.mkstemp(
+            prefix=f"{CACHE_FILENAME}.", suffix=".tmp", dir=os.path.dirname(cache_path)
+        )
+    except OSError:
+        return
+    try:
+        with os.fdopen(descriptor, "wb") as stream:
+            stream.write(b"".join(data))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
@@ -0,0 +1,96 @@
+from .colors import BGRAY, BYELLOW, END
+from .namenumerator import NameNumerator
+
+#  INFO: Ejemplo de uso real
+
+# Estoy haciendo un programa de backups que permite establecer categorías, ejemplo light para todo aquello que no sea muy pesado, y como no es muy pesado pues el usuario decide que quiere conservar hasta 10 backups de lo mismo. Para guardar las backups, he decidido que se almacenen en las siguientes carpetas:
+
+# light.bak light_1.bak light_2.bak light_3.bak ...
+
+# Se ejecuta con: python -m namenumerator.examples
+if __name__ == "__main__":
+    # Por lo que voy a crear un NameDecorator que haga este trabajo por mi:
+    nd = NameNumerator(
+        def_name="light",
+        def_ext="bak",
+    )
+
+    # ¿Qué nombre de carpeta le correspondería a 0?
+    print(f"A 0 le corresponde {nd.get_seqname(0, 'light', 'bak')}")
+
+    # Pero como tenemos settings por defecto para name y ext no hace falta que
+    # indiquemos esos valores en ninguna función, se usarán si no los especificamos
+
+    nombres_validos = nd.get_seqnames(0, 10)
+    print("Nombres válidos: ", nombres_validos)
+
+    # Vale, ya se como voy a poner de nombre a mis carpetas, pero digamos que yo
+    # quiero saber si hay alguna ya creada, le pasamos todos los nombres que hay
+    # en la carpeta para que nos diga cuales hay
+    nombres_en_la_carpeta = [
+        "videoPrivado.mp4",
+        "light_1.bak",
+        "light.bak",
+        "light_2.bak",
+    ]
+
+    usados = nd.get_seqindexes(nombres_en_la_carpeta)
+    usados_list = [nd.get_seqname(i) for i in usados]
+    print(f"Se han usado estos nombres: {usados_list}")
+
+    # Tenemos los indices y como puedes ver hemos obtenido los nombres a traves de
+    # ellos. Digamos que quiero hacer una backup más, lo haríamos así.
+    if len(usados) < 10:
+        print(
+            f"{nd.get_seqname(len(usados))} está disponible para usar como carpeta de"
+            f" backups"
+        )
+
+        # Creariamos la backup en tmp_light, y ahora vamos a asignarle el nombre que
+        # le corresponde, pero para ello vamos a renombrar todos los demas, en el
+        # orden que nos indica plan_rotate para no pisar ninguna carpeta:
+        for old_index, new_index in nd.plan_rotate(usados, keep=10):
+            old_name = nd.get_seqname(old_index)
+            new_name = nd.get_seqname(new_index)
+            print(f"renombrando {old_name} a {new_name} ... ")
+
+        print(f"renombrando tmp_light a {nd.get_seqname(0)}")
+
+    # Y listo, ese sería el funcionamiento en un mundo maravilloso en el que no ocurren
+    # cosas malas. Ahora vamos a suponer que el usuario se come una carpeta.
+    nombres_en_la_carpeta = [
+        "videoPrivado.mp4",
+        "light_1.bak",
+        "light_2.bak",
+    ]
+    usados = nd.get_seqindexes(nombres_en_la_carpeta)
+    print(f"Veremos que algo no esta bien: {usados}")
+
+    missings = nd.get_missings(usados)
+    if missings:
+        # Obtenemos los nombres faltantes y los imprimimos
+        misings_str = f"{END},{BGRAY} ".join(nd.get_seqname(i) for i in missings)
+        print(
+            f"\n{BYELLOW}[!] Aviso{END}: Las siguientes carpetas deberían estar y no"
+            f" están: '{BGRAY}{misings_str}{END}'"
+        )
+        print(f"\n Vamos a reordenar las carpetas primero ...")
+
+        # Vamos a ayudarnos de NameDecorator para que nos ayude a ajustar los nombres
+        solucion_propuesta = nd.plan_compact(usados)
+        for indice, nuevo_indice in solucion_propuesta:
+            nombre = nd.get_seqname(indice)
+            nuevo_nombre = nd.get_seqname(nuevo_indice)
+
+            print(f" Renombrando carpeta {nombre} a {nuevo_nombre} ... ")
+
+        # usados = solucion_propuesta.values()
+        usados = range(len(usados))
+        usados_list = [nd.get_seqname(i) for i in usados]
+
+    print(f"\nSe nos ha quedado así: {usados_list}")
+
+    # Y eso sería todo en cuanto al uso principal que yo voy a usar, adicionalmente
+    # hay funciones que son útiles para ciertas situaciones como cuando se permite
+    # que haya duplicados y se le pasan nombres duplicados, pero ahora que entiendes
+    # el proposito de la clase te dejo que lo investigues tu Zetaky.
@@ -0,0 +1,346 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+from .namenumerator import (
+    NameNumeratorException,
+    _func_emsg,
+    _hl,
+    _raise_invalid_type,
+    _raise_min,
+)
+import json
+import os
+import shutil
+import threading
+import time
+
+#  INFO: Ejecutor de planes de renombrado
+#
+# Aplica listas de renombrados (src, dst) sobre un directorio. Los renombrados
+# que no dependen entre sí se agrupan en cadenas independientes que se
+# ejecutan en paralelo, y todo queda anotado en un journal para poder
+# continuar o deshacer una ejecución que se haya interrumpido.
+
+JOURNAL_NAME = ".namenumerator-journal"
+
+Rename = Tuple[str, Optional[str]]
+
+
+class RenameError(NameNumeratorException):
+    """Uno o varios renombrados han fallado. El journal se conserva para poder
+    usar resume() o rollback()."""
+
+    def __init__(self, message: str, errors: List[Tuple[Rename, BaseException]]):
+        super().__init__(message)
+        self.errors = errors
+
+
+class ExecutionReport(NamedTuple):
+    """Resultado de RenameExecutor.run()/resume()."""
+
+    renamed: int
+    deleted: int
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        """Operaciones por segundo."""
+        total = self.renamed + self.deleted
+        return total / self.seconds if self.seconds > 0 else float(total)
+
+
+class RenameExecutor:
+    """Ejecuta planes de renombrado dentro de un directorio.
+
+    El plan es una lista de (src, dst) con nombres del directorio, dst None
+    significa eliminar src. No hace falta que venga ordenado: antes de nada
+    se agrupa en cadenas (un renombrado tiene que esperar a que se libere su
+    destino) y los ciclos se rompen con un nombre temporal. Cada cadena se
+    ejecuta en orden y las cadenas en paralelo con hasta `workers` hilos, que
+    en sistemas de ficheros en red es donde está la ganancia.
+
+    Antes de empezar se escribe el plan en JOURNAL_NAME, y cada operación
+    completada se añade al final. Si el proceso muere a medias, la siguiente
+    vez se puede llamar a resume() para terminar o a rollback() para volver
+    al estado inicial (las eliminaciones no se pueden deshacer).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        workers: int = 8,
+    ):
+        _raise_invalid_type("path", path, (str, os.PathLike))
+        _raise_invalid_type("workers", workers, (int,))
+        _raise_min("workers", workers, 1)
+        self._path = os.fspath(path)
+        self._workers = workers
+        self._lock = threading.Lock()
+
+    #  CAT: Public
+    def run(self, plan: List[Rename]) -> ExecutionReport:
+        """Ejecuta el plan y retorna cuántas operaciones se han hecho y a qué
+        velocidad. Si queda un journal de una ejecución anterior hay que
+        resolverlo antes con resume() o rollback()."""
+        _raise_invalid_type("plan", plan, (list,))
+        if self.pending():
+            perr = _func_emsg(stack=1)
+            raise RenameError(
+                f"{perr} hay una ejecución interrumpida en"
+                f" '{_hl(self._path)}', usa resume() o rollback().",
+                [],
+            )
+
+        chains = _plan_chains(plan)
+        self._write_journal(chains)
+        return self._execute(chains)
+
+    def pending(self) -> bool:
+        """Retorna True si hay un journal de una ejecución sin terminar."""
+        return os.path.exists(self.journal_path)
+
+    def resume(self) -> ExecutionReport:
+        """Termina la ejecución interrumpida: repite solo las operaciones que no
+        constan como hechas (ni lo están en disco)."""
+        chains, done = self._read_journal(stack=2)
+        completed = set(done)
+        remaining = [
+            [step for step in chain if step not in completed] for chain in chains
+        ]
+        return self._execute([chain for chain in remaining if chain])
+
+    def rollback(self) -> ExecutionReport:
+        """Deshace los renombrados completados de la ejecución interrumpida, en
+        orden inverso, y elimina el journal cuando todo ha vuelto a su sitio. Si
+        algún paso no se puede deshacer lanza RenameError y el journal se
+        conserva para poder repetir rollback()."""
+        chains, done = self._read_journal(stack=2)
+        completed = set(done)
+        start = time.perf_counter()
+        renamed = 0
+        errors: List[Tuple[Rename, BaseException]] = []
+        for chain in chains:
+            for step in reversed(self._applied(chain, completed)):
+                src, dst = step
+                if dst is None or self._exists(src):
+                    continue
+                try:
+                    if not self._exists(dst):
+                        raise FileNotFoundError(self._join(dst))
+                    os.rename(self._join(dst), self._join(src))
+                except OSError as error:
+                    errors.append((step, error))
+                    break
+                renamed += 1
+
+        if errors:
+            perr = _func_emsg(stack=1)
+            raise RenameError(
+                f"{perr} no se han podido deshacer {len(errors)} cadenas de"
+                f" renombrados, el journal '{_hl(self.journal_path)}' se conserva.",
+                errors,
+            )
+        os.remove(self.journal_path)
+        return ExecutionReport(renamed, 0, time.perf_counter() - start)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def journal_path(self) -> str:
+        return self._join(JOURNAL_NAME)
+
+    #  CAT: Private Methods
+    def _execute(self, chains: List[List[Rename]]) -> ExecutionReport:
+        """Ejecuta las cadenas y elimina el journal si todo va bien."""
+        start = time.perf_counter()
+        counters = {"renamed": 0, "deleted": 0}
+        errors: List[Tuple[Rename, BaseException]] = []
+
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            with ThreadPoolExecutor(max_workers=self._workers) as pool:
+                futures = [
+                    pool.submit(self._run_chain, chain, journal, counters)
+                    for chain in chains
+                ]
+                for future in futures:
+                    error = future.result()
+                    if error is not None:
+                        errors.append(error)
+
+        if errors:
+            perr = _func_emsg(stack=2)
+            raise RenameError(
+                f"{perr} han fallado {len(errors)} cadenas de renombrados,"
+                f" el journal '{_hl(self.journal_path)}' se conserva.",
+                errors,
+            )
+
+        os.remove(self.journal_path)
+        seconds = time.perf_counter() - start
+        return ExecutionReport(counters["renamed"], counters["deleted"], seconds)
+
+    def _run_chain(
+        self, chain: List[Rename], journal, counters: Dict[str, int]
+    ) -> Optional[Tuple[Rename, BaseException]]:
+        """Ejecuta una cadena en orden, se detiene en el primer error."""
+        for step in chain:
+            src, dst = step
+            try:
+                done = self._apply(src, dst)
+            except OSError as error:
+                return step, error
+
+            with self._lock:
+                journal.write(json.dumps(["D", src, dst]) + "\n")
+                journal.flush()
+                if done:
+                    counters["deleted" if dst is None else "renamed"] += 1
+        return None
+
+    def _applied(self, chain: List[Rename], completed) -> List[Rename]:
+        """Retorna los pasos de la cadena que se llegaron a aplicar. Una cadena
+        se ejecuta en orden, así que son los anotados en el journal más, como
+        mucho, el siguiente si el proceso murió entre el renombrado y su
+        anotación (el origen ya no está y el destino sí, como en _apply())."""
+        count = 0
+        while count < len(chain) and chain[count] in completed:
+            count += 1
+        if count < len(chain):
+            src, dst = chain[count]
+            if not self._exists(src) and (dst is None or self._exists(dst)):
+                count += 1
+        return chain[:count]
+
+    def _apply(self, src: str, dst: Optional[str]) -> bool:
+        """Aplica un paso. Retorna False si ya estaba aplicado (al continuar
+        una ejecución que murió entre el renombrado y su anotación)."""
+        if not self._exists(src):
+            if dst is None or self._exists(dst):
+                return False
+            raise FileNotFoundError(self._join(src))
+
+        if dst is None:
+            target = self._join(src)
+            if os.path.isdir(target) and not os.path.islink(target):
+                shutil.rmtree(target)
+            else:
+                os.remove(target)
+            return True
+
+        # os.rename sobrescribe ficheros en POSIX, aquí nunca queremos eso
+        if self._exists(dst):
+            raise FileExistsError(self._join(dst))
+        os.rename(self._join(src), self._join(dst))
+        return True
+
+    def _write_journal(self, chains: List[List[Rename]]):
+        """Escribe el plan completo, cadena a cadena, antes de tocar nada."""
+        with open(self.journal_path, "x", encoding="utf-8") as journal:
+            for number, chain in enumerate(chains):
+                for src, dst in chain:
+                    journal.write(json.dumps(["P", number, src, dst]) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def _read_journal(
+        self, *, stack=2
+    ) -> Tuple[List[List[Rename]], List[Rename]]:
+        """Retorna las cadenas del plan y los pasos hechos en el orden en que se
+        completaron. Una última línea a medio escribir se ignora. stack apunta
+        a la función pública que la invoca para los mensajes de error."""
+        chains: Dict[int, List[Rename]] = {}
+        done: List[Rename] = []
+        try:
+            journal = open(self.journal_path, encoding="utf-8")
+        except FileNotFoundError:
+            perr = _func_emsg(stack=stack)
+            raise RenameError(
+                f"{perr} no hay ninguna ejecución interrumpida en"
+                f" '{_hl(self._path)}'.",
+                [],
+            ) from None
+        with journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record[0] == "P":
+                    chains.setdefault(record[1], []).append((record[2], record[3]))
+                else:
+                    done.append((record[1], record[2]))
+        return list(chains.values()), done
+
+    def _join(self, filename: str) -> str:
+        return os.path.join(self._path, filename)
+
+    def _exists(self, filename: str) -> bool:
+        return os.path.lexists(self._join(filename))
+
+
+def _plan_chains(plan: List[Rename]) -> List[List[Rename]]:
+    """Valida el plan y lo agrupa en cadenas independientes: un paso va después
+    del que libera su destino (el paso cuyo origen es ese destino). Cada ciclo
+    a -> b -> ... -> a se rompe moviendo a a un nombre temporal."""
+    sources: Dict[str, Optional[str]] = {}
+    targets = set()
+    for position, step in enumerate(plan):
+        vname = f"plan (element: {position})"
+        _raise_invalid_type(vname, step, (tuple, list), stack=2)
+        src, dst = step
+        _raise_invalid_type(vname, src, (str,), stack=2)
+        if dst is not None:
+            _raise_invalid_type(vname, dst, (str,), stack=2)
+        if src in sources or (dst is not None and dst in targets) or src == dst:
+            perr = _func_emsg(stack=2)
+            raise ValueError(
+                f"{perr} '{_hl(vname)}' repite el origen o el destino"
+                f" de otro renombrado."
+            )
+        sources[src] = dst
+        if dst is not None:
+            targets.add(dst)
+    return _chains(sources)
+
+
+def _chains(sources: Dict[str, Optional[str]]) -> List[List[Rename]]:
+    """Agrupa en cadenas un plan ya validado {src: dst}, ver _plan_chains()."""
+    # El paso que tiene que esperar a que se libere cada origen
+    waiting: Dict[str, Rename] = {
+        dst: (src, dst) for src, dst in sources.items() if dst in sources
+    }
+
+    chains = []
+    used = set()
+    for src, dst in sources.items():
+        # Las cabezas son los pasos cuyo destino está libre desde el principio
+        if dst is not None and dst in sources:
+            continue
+        chain = [(src, dst)]
+        used.add(src)
+        while src in waiting:
+            step = waiting[src]
+            chain.append(step)
+            src = step[0]
+            used.add(src)
+        chains.append(chain)
+
+    # Lo que no cuelga de ninguna cabeza son ciclos
+    for src in sources:
+        if src in used:
+            continue
+        temporary = f".{src}.namenumerator-tmp"
+        chain = [(src, temporary)]
+        node = src
+        while True:
+            step = waiting[node]
+            if step[0] == src:
+                chain.append((temporary, step[1]))
+                break
+            chain.append(step)
+            node = step[0]
+        used.update(step[0] for step in chain)
+        chains.append(chain)
+    return chains
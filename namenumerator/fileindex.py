@@ -0,0 +1,75 @@
+from typing import List, Optional, Pattern, Union
+from .namenumerator import NameNumerator, SeqIndexSet, SeqMatcher, _index_offset
+import mmap
+import os
+import re
+
+#  INFO: Indices de un listado en fichero
+#
+# NameNumerator.index_file() proyecta el fichero en memoria con mmap y busca
+# los miembros de la secuencia directamente sobre los bytes con un patrón que
+# empieza por el nombre literal, así el motor de re salta entre apariciones del
+# nombre sin mirar el resto. Las líneas ajenas nunca se convierten en objetos
+# de python: de cada coincidencia solo se convierte la parte numérica.
+
+
+def index_file(
+    numerator: NameNumerator,
+    path: Union[str, "os.PathLike[str]"],
+    name: Optional[str],
+    ext: Optional[str],
+    delimiter: bytes,
+    as_set: bool,
+) -> Union[List[int], SeqIndexSet]:
+    """Implementación de NameNumerator.index_file(), los argumentos ya están
+    validados."""
+    matcher = numerator._matcher(name, ext, stack=4)
+    settings = numerator.settings
+    finditer = _pattern(matcher, settings.enumerate_first, delimiter).finditer
+    offset = _index_offset(settings.enumerate_first, settings.from_zero)
+    min_index = 0 if settings.enumerate_first else 1
+    boundaries = (delimiter[0], os.fsencode(os.sep)[0])
+
+    indexset = SeqIndexSet() if as_set else None
+    indexes = []
+    with open(path, "rb") as stream:
+        if os.fstat(stream.fileno()).st_size == 0:
+            # mmap no admite ficheros vacíos
+            return indexset if as_set else indexes
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for match in finditer(data):
+                # El nombre tiene que ser el último componente de la línea
+                start = match.start()
+                if start and data[start - 1] not in boundaries:
+                    continue
+                number = match.group(1)
+                if number is None:
+                    index = 0
+                else:
+                    index = int(number) + offset
+                    if index < min_index:
+                        continue
+                if as_set:
+                    indexset._add(index)
+                else:
+                    indexes.append(index)
+
+    if as_set:
+        return indexset
+    indexes.sort()
+    return indexes
+
+
+def _pattern(
+    matcher: SeqMatcher, enumerate_first: bool, delimiter: bytes
+) -> Pattern[bytes]:
+    """Patrón de bytes de los nombres de la secuencia seguidos del delimitador
+    o del final del fichero. El grupo 1 es el número, o None para el primer
+    nombre sin numerar."""
+    name = re.escape(os.fsencode(matcher.name))
+    number = re.escape(os.fsencode(matcher.separator)) + rb"([0-9]+)"
+    if not enumerate_first:
+        number = rb"(?:" + number + rb")?"
+    suffix = re.escape(os.fsencode(matcher.suffix))
+    end = rb"(?=" + re.escape(delimiter) + rb"|\Z)"
+    return re.compile(name + number + suffix + end)
@@ -0,0 +1,226 @@
+from collections import abc
+from typing import Callable, ContextManager, Dict, NamedTuple, Optional
+from .namenumerator import (
+    NameNumerator,
+    SeqMatcher,
+    _TRANSPARENT_CODES,
+    _raise_invalid_type,
+)
+import time
+
+#  INFO: Instrumentación opcional
+#
+# NameNumerator.enable_stats() sustituye en la instancia los métodos medidos
+# por envoltorios que cuentan llamadas y tiempo, y hace que los matchers nuevos
+# sean _TracedSeqMatcher, que además cuenta cómo se resuelve cada nombre. Con
+# las estadísticas desactivadas la instancia usa los métodos de la clase tal
+# cual: no hay ningún flag que comprobar en cada llamada.
+
+# Métodos públicos que se miden
+PUBLIC_METHODS = (
+    "get_seqname",
+    "get_seqnames",
+    "iter_seqnames",
+    "seqname_to_index",
+    "seqname_next",
+    "is_seqname",
+    "matcher",
+    "extract_seqname_parts",
+    "number_to_index",
+    "get_seqindexes",
+    "iter_seqindexes",
+    "classify_parallel",
+    "index_file",
+    "scan_dir",
+    "scan_dir_cached",
+    "reserve",
+    "watch",
+    "analyze",
+    "get_missings",
+    "get_duplicates",
+    "any_duplicated",
+    "adjust_broken",
+    "plan_rotate",
+    "plan_compact",
+    "apply_plan",
+    "migrate_plan",
+)
+
+# Validación y obtención de matchers, para comparar con el resto del tiempo
+PRIVATE_METHODS = ("_validate_index", "_get_name", "_get_ext", "_matcher")
+
+Tracer = Callable[[str], Optional[ContextManager]]
+
+
+class MethodStats(NamedTuple):
+    """Llamadas a un método y segundos acumulados (incluye lo que tarden los
+    métodos medidos a los que llama; en iter_* solo la creación del iterador)."""
+
+    calls: int
+    seconds: float
+
+
+class NumeratorStats(NamedTuple):
+    """Resultado de NameNumerator.stats().
+
+    Los contadores de nombres vienen de SeqMatcher.index_of() (y por tanto de
+    seqname_to_index, is_seqname, get_seqindexes, scan_dir, ...):
+      first_name_hits: nombres que eran el primero sin numerar.
+      fast_reject_hits: descartados por prefijo/sufijo sin llegar al regex.
+      fast_reject_misses: pasan el prefijo/sufijo y llegan al regex.
+      regex_failures: de esos, los que el regex rechaza.
+    """
+
+    enabled: bool
+    methods: Dict[str, MethodStats]
+    first_name_hits: int
+    fast_reject_hits: int
+    fast_reject_misses: int
+    regex_failures: int
+
+    @property
+    def parsed(self) -> int:
+        """Nombres analizados en total."""
+        return self.first_name_hits + self.fast_reject_hits + self.fast_reject_misses
+
+
+class _Recorder:
+    """Contadores de una instancia instrumentada."""
+
+    __slots__ = ("enabled", "calls", "seconds", "names", "tracer")
+
+    def __init__(self, tracer: Optional[Tracer]):
+        self.enabled = False
+        self.calls: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        self.names = {"first": 0, "reject": 0, "regex": 0, "regex_fail": 0}
+        self.tracer = tracer
+
+    def reset(self):
+        for name in self.calls:
+            self.calls[name] = 0
+            self.seconds[name] = 0.0
+        for key in self.names:
+            self.names[key] = 0
+
+
+class _TracedSeqMatcher(SeqMatcher):
+    """SeqMatcher que cuenta cómo se resuelve cada nombre. Es una copia de
+    SeqMatcher.index_of() con los contadores, para no tocar la original."""
+
+    __slots__ = ("_names",)
+
+    def __init__(self, names: Dict[str, int], *args):
+        super().__init__(*args)
+        object.__setattr__(self, "_names", names)
+
+    def index_of(self, seqname: str) -> Optional[int]:
+        names = self._names
+        if seqname == self._first:
+            names["first"] += 1
+            return 0
+        if not (seqname.startswith(self._prefix) and seqname.endswith(self._suffix)):
+            names["reject"] += 1
+            return None
+
+        names["regex"] += 1
+        match = self._fullmatch(seqname)
+        if match is None:
+            names["regex_fail"] += 1
+            return None
+
+        index = int(match.group(1)) + self._offset
+        return index if index >= self._min_index else None
+
+
+def enable(numerator: NameNumerator, tracer: Optional[Tracer] = None):
+    """Instrumenta la instancia. Si ya lo estaba conserva los contadores y
+    cambia el tracer."""
+    if tracer is not None:
+        _raise_invalid_type("tracer", tracer, (abc.Callable,), stack=2)
+
+    recorder = numerator._recorder
+    if recorder is None:
+        recorder = numerator._recorder = _Recorder(tracer)
+    recorder.tracer = tracer
+    recorder.enabled = True
+    numerator._install_wrappers()
+
+
+def disable(numerator: NameNumerator):
+    """Vuelve a los métodos de la clase. Los contadores se conservan."""
+    if numerator._recorder is not None:
+        numerator._recorder.enabled = False
+        numerator._install_wrappers()
+
+
+def install(numerator: NameNumerator):
+    """Envuelve los métodos actuales de la instancia, que pueden ser los de
+    enable_cache(). Lo llama NameNumerator._install_wrappers()."""
+    recorder = numerator._recorder
+    for name in PUBLIC_METHODS + PRIVATE_METHODS:
+        recorder.calls.setdefault(name, 0)
+        recorder.seconds.setdefault(name, 0.0)
+        method = getattr(numerator, name)
+        setattr(numerator, name, _wrap(name, method, recorder))
+
+    names = recorder.names
+    numerator._matcher_factory = lambda *args: _TracedSeqMatcher(names, *args)
+
+
+def snapshot(numerator: NameNumerator) -> NumeratorStats:
+    recorder = numerator._recorder
+    if recorder is None:
+        return NumeratorStats(False, {}, 0, 0, 0, 0)
+
+    names = recorder.names
+    return NumeratorStats(
+        enabled=recorder.enabled,
+        methods={
+            name: MethodStats(calls, recorder.seconds[name])
+            for name, calls in recorder.calls.items()
+            if calls
+        },
+        first_name_hits=names["first"],
+        fast_reject_hits=names["reject"],
+        fast_reject_misses=names["regex"],
+        regex_failures=names["regex_fail"],
+    )
+
+
+def _wrap(name: str, method: Callable, recorder: _Recorder) -> Callable:
+    calls = recorder.calls
+    seconds = recorder.seconds
+    tracer = recorder.tracer
+    clock = time.perf_counter
+
+    if tracer is None:
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds[name] += clock() - start
+                calls[name] += 1
+
+    else:
+
+        def wrapper(*args, **kwargs):
+            span = tracer(name)
+            start = clock()
+            try:
+                if span is None:
+                    return method(*args, **kwargs)
+                with span:
+                    return method(*args, **kwargs)
+            finally:
+                seconds[name] += clock() - start
+                calls[name] += 1
+
+    # Los mensajes de error cuentan marcos de la pila, este no debe contar
+    _TRANSPARENT_CODES.add(wrapper.__code__)
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    wrapper.__wrapped__ = method
+    return wrapper
@@ -0,0 +1,125 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from .namenumerator import (
+    NameNumerator,
+    NameNumeratorException,
+    NumeratorSettings,
+    SeqMatcher,
+    _entry_name,
+    _func_emsg,
+    _hl,
+    _index_offset,
+    _raise_invalid_type,
+)
+from .executor import _chains
+import os
+
+#  INFO: Migración entre configuraciones
+#
+# NameNumerator.migrate_plan() calcula los renombrados para pasar todos los
+# miembros de una secuencia a los nombres que les da otro NameNumerator (otro
+# separador, relleno de ceros, enumerate_first, ...). El listado se recorre
+# una sola vez y solo se guardan los miembros de las dos secuencias, nunca el
+# listado completo. El plan sale agrupado en cadenas por executor._chains():
+# cada renombrado va detrás del que libera su destino y los ciclos se rompen
+# con un nombre temporal.
+
+
+class MigrationError(NameNumeratorException):
+    """Algunos destinos de la migración están ocupados: por un nombre que no
+    se va a mover o porque dos nombres tienen el mismo indice (img_1 e
+    img_01). collisions tiene los (origen, destino) afectados."""
+
+    def __init__(self, message: str, collisions: List[Tuple[str, str]]):
+        super().__init__(message)
+        self.collisions = collisions
+
+
+def plan(
+    numerator: NameNumerator,
+    other: NameNumerator,
+    names: Iterable[Any],
+    name: Optional[str],
+    ext: Optional[str],
+    to_name: Optional[str],
+    to_ext: Optional[str],
+) -> List[Tuple[str, str]]:
+    """Implementación de NameNumerator.migrate_plan(), los argumentos ya están
+    validados."""
+    source = numerator._matcher(name, ext, stack=4)
+    # El destino usa los valores por defecto de other y si no tiene, los mismos
+    # name/ext que el origen
+    if to_name is None and other.def_name is None:
+        to_name = source.name
+    if to_ext is None and other.def_ext is None:
+        to_ext = source.ext
+    target = other._matcher(to_name, to_ext, stack=4)
+
+    index_of = source.index_of
+    target_index_of = target.index_of
+    seqname = _formatter(other.settings, target)
+
+    renames: Dict[str, str] = {}
+    claimed: Dict[str, str] = {}  # destino -> origen
+    occupied = set()  # nombres del listado que ya son de la secuencia destino
+    collisions: List[Tuple[str, str]] = []
+    for position, item in enumerate(names):
+        # str es lo habitual así que se comprueba primero y sin llamadas
+        itemname = item if type(item) is str else _entry_name(item)
+        if itemname is None:
+            _raise_invalid_type(
+                f"names (element: {position})", item, (str, os.PathLike), stack=2
+            )
+
+        if target_index_of(itemname) is not None:
+            occupied.add(itemname)
+        index = index_of(itemname)
+        if index is None:
+            continue
+
+        dst = seqname(index)
+        if dst in claimed:
+            collisions.append((itemname, dst))
+            continue
+        claimed[dst] = itemname
+        if dst != itemname:
+            renames[itemname] = dst
+
+    # Un destino ocupado solo vale si el que lo ocupa también se mueve
+    collisions += (
+        (src, dst)
+        for dst, src in claimed.items()
+        if dst in occupied and dst != src and dst not in renames
+    )
+    if collisions:
+        src, dst = collisions[0]
+        perr = _func_emsg(stack=2)
+        raise MigrationError(
+            f"{perr} {len(collisions)} destinos están ocupados, por ejemplo"
+            f" '{_hl(dst)}' (para '{_hl(src)}').",
+            collisions,
+        )
+
+    # Los orígenes y destinos ya son únicos, no hace falta _plan_chains()
+    chains = _chains(renames)
+    return [step for chain in chains for step in chain]
+
+
+def _formatter(
+    settings: NumeratorSettings, matcher: SeqMatcher
+) -> Callable[[int], str]:
+    """get_seqname() de la secuencia de matcher sin validación: una plantilla
+    %-format como la de iter_seqnames()."""
+    template = (
+        matcher.prefix.replace("%", "%%")
+        + f"%0{settings.min_numlen}d"
+        + matcher.suffix.replace("%", "%%")
+    )
+    shift = -_index_offset(settings.enumerate_first, settings.from_zero)
+    first = None if settings.enumerate_first else f"{matcher.name}{matcher.suffix}"
+
+    def seqname(index: int) -> str:
+        if index == 0 and first is not None:
+            return first
+        return template % (index + shift)
+
+    return seqname
@@ -1,8 +1,14 @@
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
-# from kcolors.refs import * # pyright: ignore[]
-from colors import * # no dinámicas pero así no tienes que instalar nada
-import inspect
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict, abc
+from itertools import chain
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional,
+    Tuple, Type, Union,
+)
+import os
 import re
+import sys
+import weakref
 
 #  TODO:
 #  - Traducir las explicaciones
@@ -13,8 +19,8 @@ def _raise_contains_points(vname: str, varval: str, *, stack=1):
     if "." in varval:
         perr = _func_emsg(stack=stack + 1)
         raise ValueError(
-            f"{perr} '{BGRAY}{vname}{END}' no puede contener puntos"
-            f" '{BGRAY}.{END}'"
+            f"{perr} '{_hl(vname)}' no puede contener puntos"
+            f" '{_hl('.')}'"
         )
 
 
@@ -27,8 +33,20 @@ def _raise_invalid_type(
         rtypes_str = ", ".join([tp.__name__ for tp in requiredtypes])
 
         raise ValueError(
-            f"{perr} el tipo de '{BGRAY}{vname}{END}' debe ser"
-            f" '{BGRAY}{rtypes_str}{END}'."
+            f"{perr} el tipo de '{_hl(vname)}' debe ser"
+            f" '{_hl(rtypes_str)}'."
+        )
+
+
+def _raise_invalid_names(vname: str, varval: Any, *, stack=1):
+    """Lanza excepción si no es un iterable de nombres. str y bytes también son
+    iterables pero nunca son un listado: se recorrerían carácter a carácter."""
+    if isinstance(varval, (str, bytes)) or not isinstance(varval, abc.Iterable):
+        perr = _func_emsg(stack=stack + 1)
+        raise ValueError(
+            f"{perr} el tipo de '{_hl(vname)}' debe ser un iterable de nombres"
+            f" ('{_hl('list')}', '{_hl('os.scandir')}', ...), no"
+            f" '{_hl(type(varval).__name__)}'."
         )
 
 
@@ -84,9 +102,9 @@ def _raise_contains_duplicates(
             previous_index = seen[element]
             perr = _func_emsg(stack=stack + 1)
             msg = (
-                f"{perr} el elemento '{BGRAY}{element}{END}' de {BGRAY}{vname}{END} "
+                f"{perr} el elemento '{_hl(element)}' de {_hl(vname)} "
                 "está duplicado en las posiciones "
-                f"'{BGRAY}{previous_index}{END}' y '{BGRAY}{index}{END}'."
+                f"'{_hl(previous_index)}' y '{_hl(index)}'."
             )
             raise ValueError(msg)
         seen[element] = index
@@ -96,23 +114,23 @@ def _raise_requires_one_char(vname: str, varval: str, *, stack=1):
     if not len(varval):
         perr = _func_emsg(stack=stack + 1)
         raise ValueError(
-            f"{perr} '{BGRAY}{vname}{END}' debe tener al menos un carácter."
+            f"{perr} '{_hl(vname)}' debe tener al menos un carácter."
         )
 
 
 def _raise_contains_digits(vname: str, varval: str, *, stack=1):
     """Lanza excepción si la string contiene digitos"""
-    perr = _func_emsg(stack=stack + 1)
     if any(char.isdigit() for char in varval):
-        raise ValueError(f"{perr} '{BGRAY}{vname}{END}' no debe contener dígitos.")
+        perr = _func_emsg(stack=stack + 1)
+        raise ValueError(f"{perr} '{_hl(vname)}' no debe contener dígitos.")
 
 
 def _raise_min(vname: str, varval: int, min: int, *, stack=1):
     """Lanza excepción si no llegamos a un mínimo"""
-    perr = _func_emsg(stack=stack + 1)
     if varval < min:
+        perr = _func_emsg(stack=stack + 1)
         raise ValueError(
-            f"{perr} '{BGRAY}{vname}{END}' debe ser al menos '{min}'."
+            f"{perr} '{_hl(vname)}' debe ser al menos '{min}'."
         )
 
 
@@ -121,24 +139,88 @@ def _raise_required_def(vname: str, varval: Any, defval: Any, *, stack=1):
     if varval is None and defval is None:
         perr = _func_emsg(stack=stack + 1)
         raise ValueError(
-            f"{perr} se necesita un {BGRAY}{vname}{END} pero no se ha"
+            f"{perr} se necesita un {_hl(vname)} pero no se ha"
             f" proporcionado ni tiene un valor por defecto."
         )
 
 
+def _raise_not_in(vname: str, varval: Any, options: Tuple[Any, ...], *, stack=1):
+    """Lanza excepción si el valor no es una de las opciones"""
+    if varval not in options:
+        perr = _func_emsg(stack=stack + 1)
+        options_str = ", ".join(repr(option) for option in options)
+        raise ValueError(
+            f"{perr} '{_hl(vname)}' debe ser uno de"
+            f" '{_hl(options_str)}'."
+        )
+
+
 def _func_emsg(*, stack: int = 1):
     """Función auxiliar que retorna una string con información de la función
-    en la cual se va a producir un error."""
+    en la cual se va a producir un error.
+
+    Solo debe llamarse justo antes de lanzar la excepción: usa sys._getframe,
+    que no recorre toda la pila ni lee el código fuente como inspect.stack()."""
+
+    try:
+        frame = sys._getframe(1)
+        for _ in range(stack - 1):
+            frame = frame.f_back
+            # Los envoltorios de instrument.py no cuentan
+            while frame.f_code in _TRANSPARENT_CODES:
+                frame = frame.f_back
+        caller_name = frame.f_code.co_name
+    except (ValueError, AttributeError):
+        # La pila es menos profunda de lo esperado
+        caller_name = "?"
+    colors = _colors()
+    if colors is None:
+        return f"[!] Error en {caller_name}():"
+    return f"{colors.BRED}[!] Error en {caller_name}():{colors.END}"
+
+
+# Valor por defecto de los argumentos en los que None significa "quitar"
+_UNCHANGED: Any = object()
+
+
+# Código de las funciones que _func_emsg salta al contar marcos de la pila
+_TRANSPARENT_CODES: set = set()
+
+
+# Módulo colors una vez cargado, False si los colores están desactivados
+_COLORS: Any = None
 
-    caller_name = inspect.stack()[stack].function
-    return f"{BRED}[!] Error en {caller_name}():{END}"
+
+def _colors():
+    """Retorna el módulo colors, que solo se importa la primera vez que se
+    formatea un mensaje de error, o None si stderr no es una terminal o existe
+    la variable de entorno NO_COLOR."""
+    global _COLORS
+    if _COLORS is None:
+        stream = sys.stderr
+        if stream is not None and stream.isatty() and "NO_COLOR" not in os.environ:
+            from . import colors
+
+            _COLORS = colors
+        else:
+            _COLORS = False
+    return _COLORS or None
+
+
+def _hl(value: Any) -> str:
+    """Resalta un valor dentro de un mensaje de error."""
+    colors = _colors()
+    if colors is None:
+        return str(value)
+    return f"{colors.BGRAY}{value}{colors.END}"
+
+
+_NAME_EXT_PATTERN = re.compile(r"^.*?[.](.*)$")
 
 
 def _extract_name_ext(seqname: str) -> Optional[str]:
     """Extrae la extensión de un nombre, si es que la tiene"""
-    pattern = r"^.*?[.](.*)$"
-
-    match = re.match(pattern, seqname)
+    match = _NAME_EXT_PATTERN.match(seqname)
     if match:
         ext = match.group(1)
         return ext
@@ -146,6 +228,27 @@ def _extract_name_ext(seqname: str) -> Optional[str]:
     return None
 
 
+def _index_offset(enumerate_first: bool, from_zero: bool) -> int:
+    """Retorna el desplazamiento entre la parte numérica y el indice según las
+    settings: index = number + offset (el mismo cálculo que number_to_index)."""
+    if enumerate_first:
+        return 0 if from_zero else -1
+    return 1 if from_zero else 0
+
+
+def _entry_name(item: Any) -> Optional[str]:
+    """Obtiene el nombre de un elemento de un listado: la propia str, el .name
+    de un os.DirEntry o el basename de un os.PathLike. Retorna None si el tipo
+    no es ninguno de ellos."""
+    if isinstance(item, str):
+        return item
+    if isinstance(item, os.DirEntry):
+        return item.name
+    if isinstance(item, os.PathLike):
+        return os.path.basename(os.fsdecode(item))
+    return None
+
+
 class NameNumeratorException(Exception):
     def __init__(self, message: str = ""):
         super().__init__(message)
@@ -167,7 +270,520 @@ class NotPartOfSeq(NameNumeratorException):
         # return f"{self.args[0]}"
 
 
+class SequenceReport(NamedTuple):
+    """Resultado de NameNumerator.analyze():
+    count: número de indices analizados (incluidos duplicados).
+    max_index: indice más alto o None si no había ninguno.
+    missing: indices de 0 a count-1 que no aparecen (ver get_missings).
+    duplicates: {indice: apariciones} de los repetidos (ver get_duplicates).
+    contiguous: True si los indices son exactamente 0..count-1.
+    adjust: reordenación propuesta por adjust_broken o None si hay duplicados.
+      Si se analiza un SeqIndexSet es una vista de solo lectura, no un dict.
+    """
+
+    count: int
+    max_index: Optional[int]
+    missing: Union[List[int], "SeqIndexSet"]
+    duplicates: Dict[int, int]
+    contiguous: bool
+    adjust: Optional[Mapping[int, int]]
+
+
+# Primer byte que no es 0x00 / 0xff, para saltar bloques enteros en C
+_NONZERO_BYTE = re.compile(rb"[^\x00]")
+_NONFULL_BYTE = re.compile(rb"[^\xff]")
+
+# Cuándo cambia SeqIndexSet de representación. El bitmap pasa a tramos si para
+# crecer necesitaría más de _SPARSE_BYTES_PER_INDEX bytes por tramo posible (y
+# al menos _SPARSE_MIN_BYTES): un indice suelto muy alto no reserva gigas. Los
+# tramos vuelven a bitmap cuando este ocuparía como mucho _DENSE_BYTES_PER_RUN
+# bytes por tramo, que en listas de Python cuestan bastante más.
+_SPARSE_MIN_BYTES = 4096
+_SPARSE_BYTES_PER_INDEX = 32
+_DENSE_BYTES_PER_RUN = 16
+
+
+class SeqIndexSet:
+    """Conjunto compacto de indices no negativos, pensado para secuencias muy
+    grandes. Tiene dos representaciones y cambia sola entre ellas:
+
+    - bitmap: un bit por indice en un bytearray, para secuencias densas. 10M
+      de posiciones ocupan ~1.2MB frente a los ~360MB de una list[int].
+    - tramos: listas ordenadas de tramos (start, stop) ocupados, para las
+      dispersas o con huecos enormes. Ocupa según el número de tramos, no
+      según el indice más alto: img_99999999999999 no reserva un bitmap de
+      terabytes.
+
+    Con bitmap, pertenencia, add/discard y len() son O(1); con tramos son
+    O(log t) (add/discard O(t) en el peor caso, al insertar un tramo). Los
+    huecos y los tramos ocupados se recorren como rangos (start, stop)
+    saltando bytes completos vacíos o llenos, por lo que las secuencias con
+    grandes huecos también se recorren rápido. Como es un conjunto no puede
+    representar duplicados.
+    """
+
+    # _bits es None cuando se usan los tramos _starts/_stops y viceversa
+    __slots__ = ("_bits", "_starts", "_stops", "_count")
+
+    def __init__(self, indexes: Iterable[int] = ()):
+        self._bits: Optional[bytearray] = bytearray()
+        self._starts: Optional[List[int]] = None
+        self._stops: Optional[List[int]] = None
+        self._count = 0
+        for position, index in enumerate(indexes):
+            if type(index) is not int or index < 0:
+                vname = f"indexes (element: {position})"
+                _raise_invalid_type(vname, index, (int,))
+                _raise_min(vname, index, 0)
+            self._add(index)
+
+    @classmethod
+    def from_ranges(cls, ranges: Iterable[Tuple[int, int]]) -> "SeqIndexSet":
+        """Crea el conjunto a partir de tramos (start, stop) ocupados, como los
+        que retorna ranges(). Los bytes completos se rellenan de golpe."""
+        indexset = cls()
+        for start, stop in ranges:
+            indexset._add_range(start, stop)
+        return indexset
+
+    @classmethod
+    def _from_bits(cls, bits: Union[bytes, bytearray]) -> "SeqIndexSet":
+        """Crea el conjunto directamente a partir de un bitmap, sin validar."""
+        indexset = cls()
+        indexset._bits = bytearray(bits)
+        indexset._count = int.from_bytes(bits, "little").bit_count()
+        return indexset
+
+    #  CAT: Set
+    def add(self, index: int):
+        """Añade el indice al conjunto."""
+        _raise_invalid_type("index", index, (int,))
+        _raise_min("index", index, 0)
+        self._add(index)
+
+    def discard(self, index: int):
+        """Elimina el indice del conjunto si está."""
+        if index not in self:
+            return
+        self._count -= 1
+        if self._bits is not None:
+            self._bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+            return
+
+        starts, stops = self._starts, self._stops
+        run = bisect_right(starts, index) - 1
+        start, stop = starts[run], stops[run]
+        if stop - start == 1:
+            del starts[run], stops[run]
+        elif index == start:
+            starts[run] = index + 1
+        elif index == stop - 1:
+            stops[run] = index
+        else:
+            # Parte el tramo en dos
+            stops[run] = index
+            starts.insert(run + 1, index + 1)
+            stops.insert(run + 1, stop)
+
+    def __contains__(self, index: object) -> bool:
+        if type(index) is not int or index < 0:
+            return False
+        bits = self._bits
+        if bits is None:
+            run = bisect_right(self._starts, index) - 1
+            return run >= 0 and index < self._stops[run]
+        byte = index >> 3
+        return byte < len(bits) and bool(bits[byte] & (1 << (index & 7)))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[int]:
+        """Recorre los indices en orden ascendente."""
+        for start, stop in self.ranges():
+            yield from range(start, stop)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SeqIndexSet):
+            return NotImplemented
+        return self._count == other._count and list(self.ranges()) == list(
+            other.ranges()
+        )
+
+    def __repr__(self) -> str:
+        ranges = ", ".join(f"({start}, {stop})" for start, stop in self.ranges())
+        return f"SeqIndexSet.from_ranges([{ranges}])"
+
+    #  CAT: Queries
+    @property
+    def max_index(self) -> Optional[int]:
+        """Indice más alto del conjunto o None si está vacío."""
+        bits = self._bits
+        if bits is None:
+            return self._stops[-1] - 1 if self._stops else None
+        for byte in range(len(bits) - 1, -1, -1):
+            if bits[byte]:
+                return byte * 8 + bits[byte].bit_length() - 1
+        return None
+
+    def popcount(self) -> int:
+        """Cuenta los indices recorriendo el bitmap o los tramos completos
+        (len() usa el contador que se mantiene al añadir/eliminar)."""
+        if self._bits is None:
+            return sum(map(int.__sub__, self._stops, self._starts))
+        return int.from_bytes(self._bits, "little").bit_count()
+
+    def next_free(self, start: int = 0) -> int:
+        """Retorna el primer indice >= start que no está en el conjunto."""
+        _raise_invalid_type("start", start, (int,))
+        _raise_min("start", start, 0)
+        return self._next_clear(start)
+
+    def ranges(self) -> Iterator[Tuple[int, int]]:
+        """Recorre los tramos ocupados como (start, stop), en orden."""
+        if self._bits is None:
+            yield from zip(list(self._starts), list(self._stops))
+            return
+        position = 0
+        while True:
+            start = self._next_set(position)
+            if start is None:
+                return
+            position = self._next_clear(start)
+            yield start, position
+
+    def missing_ranges(self, stop: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """Recorre los huecos de [0, stop) como (start, stop), en orden. Si no se
+        indica stop se usa max_index + 1, es decir, solo los huecos internos."""
+        if stop is None:
+            max_index = self.max_index
+            stop = 0 if max_index is None else max_index + 1
+        _raise_invalid_type("stop", stop, (int,))
+
+        position = 0
+        while position < stop:
+            start = self._next_clear(position)
+            if start >= stop:
+                return
+            position = self._next_set(start)
+            position = stop if position is None else min(position, stop)
+            yield start, position
+
+    def rank(self, index: int) -> int:
+        """Retorna cuántos indices del conjunto son menores que index, es decir,
+        la posición que ocuparía index si la secuencia no tuviera huecos."""
+        _raise_invalid_type("index", index, (int,))
+        _raise_min("index", index, 0)
+        if self._bits is None:
+            runs = bisect_right(self._starts, index)
+            below = sum(
+                map(int.__sub__, self._stops[:runs], self._starts[:runs])
+            )
+            if runs and index < self._stops[runs - 1]:
+                below -= self._stops[runs - 1] - index
+            return below
+
+        byte = index >> 3
+        below = int.from_bytes(self._bits[:byte], "little").bit_count()
+        if byte < len(self._bits):
+            below += (self._bits[byte] & ((1 << (index & 7)) - 1)).bit_count()
+        return below
+
+    def to_list(self) -> List[int]:
+        """Retorna los indices como una lista ordenada."""
+        return list(self)
+
+    #  CAT: Private Methods
+    def _add(self, index: int):
+        """add() sin validación, index debe ser un int >= 0."""
+        bits = self._bits
+        if bits is None:
+            self._add_range(index, index + 1)
+            return
+
+        byte, bit = index >> 3, 1 << (index & 7)
+        if byte >= len(bits):
+            if self._too_sparse(byte + 1):
+                self._to_runs()
+                self._add_range(index, index + 1)
+                return
+            # Crece al menos al doble para que añadir en orden sea O(1)
+            bits.extend(bytes(max(byte + 1, 2 * len(bits)) - len(bits)))
+        if not bits[byte] & bit:
+            bits[byte] |= bit
+            self._count += 1
+
+    def _add_range(self, start: int, stop: int):
+        """Añade range(start, stop) rellenando los bytes completos de golpe (o
+        fundiendo los tramos que toca)."""
+        _raise_invalid_type("start", start, (int,), stack=2)
+        _raise_min("start", start, 0, stack=2)
+        _raise_invalid_type("stop", stop, (int,), stack=2)
+        if stop <= start:
+            return
+
+        bits = self._bits
+        if bits is not None:
+            size = (stop + 7) >> 3
+            if size > len(bits) and self._too_sparse(size):
+                self._to_runs()
+                bits = None
+        if bits is None:
+            self._merge_run(start, stop)
+            return
+
+        if (stop + 7) >> 3 > len(bits):
+            bits.extend(bytes(((stop + 7) >> 3) - len(bits)))
+
+        # Solo cambian los bytes de [start, stop), se cuentan antes y después
+        span = slice(start >> 3, (stop + 7) >> 3)
+        before = int.from_bytes(bits[span], "little").bit_count()
+
+        # Bits sueltos al principio y al final, bytes completos en medio
+        head = min(stop, (start + 7) & ~7)
+        tail = max(head, stop & ~7)
+        for index in chain(range(start, head), range(tail, stop)):
+            bits[index >> 3] |= 1 << (index & 7)
+        bits[head >> 3 : tail >> 3] = b"\xff" * ((tail - head) >> 3)
+        self._count += int.from_bytes(bits[span], "little").bit_count() - before
+
+    def _merge_run(self, start: int, stop: int):
+        """Añade [start, stop) a los tramos, fundiéndolo con los que solapa o
+        toca, y vuelve al bitmap si ya sale más barato."""
+        starts, stops = self._starts, self._stops
+        # Tramos [first, last) que solapan o tocan [start, stop)
+        first = bisect_left(stops, start)
+        last = bisect_right(starts, stop)
+        if first < last:
+            covered = sum(map(int.__sub__, stops[first:last], starts[first:last]))
+            start = min(start, starts[first])
+            stop = max(stop, stops[last - 1])
+        else:
+            covered = 0
+        starts[first:last] = (start,)
+        stops[first:last] = (stop,)
+        self._count += stop - start - covered
+
+        if last == first and ((stops[-1] + 7) >> 3) <= _DENSE_BYTES_PER_RUN * len(
+            starts
+        ):
+            self._to_bits()
+
+    def _too_sparse(self, size: int) -> bool:
+        """True si un bitmap de size bytes sería demasiado grande. Se compara
+        con lo que ocuparían como mucho los tramos: uno por indice actual más
+        el que se va a añadir, por largo que sea."""
+        return (
+            size > _SPARSE_MIN_BYTES
+            and size > _SPARSE_BYTES_PER_INDEX * (self._count + 1)
+        )
+
+    def _to_runs(self):
+        ranges = list(self.ranges())
+        self._starts = [start for start, _ in ranges]
+        self._stops = [stop for _, stop in ranges]
+        self._bits = None
+
+    def _to_bits(self):
+        ranges = list(self.ranges())
+        # Ya con el tamaño final, para que no vuelva a decidir a mitad
+        self._bits = bytearray((ranges[-1][1] + 7) >> 3 if ranges else 0)
+        self._starts = self._stops = None
+        self._count = 0
+        for start, stop in ranges:
+            self._add_range(start, stop)
+
+    def _next_set(self, index: int) -> Optional[int]:
+        """Primer indice >= index que está en el conjunto o None."""
+        bits = self._bits
+        if bits is None:
+            run = bisect_right(self._starts, index) - 1
+            if run >= 0 and index < self._stops[run]:
+                return index
+            return self._starts[run + 1] if run + 1 < len(self._starts) else None
+
+        byte = index >> 3
+        if byte >= len(bits):
+            return None
+        # Resto del byte actual
+        value = bits[byte] >> (index & 7)
+        if value:
+            return index + ((value & -value).bit_length() - 1)
+        match = _NONZERO_BYTE.search(bits, byte + 1)
+        if match is None:
+            return None
+        byte = match.start()
+        value = bits[byte]
+        return byte * 8 + (value & -value).bit_length() - 1
+
+    def _next_clear(self, index: int) -> int:
+        """Primer indice >= index que no está en el conjunto."""
+        bits = self._bits
+        if bits is None:
+            # Los tramos nunca se tocan, el final de uno siempre está libre
+            run = bisect_right(self._starts, index) - 1
+            if run >= 0 and index < self._stops[run]:
+                return self._stops[run]
+            return index
+
+        byte = index >> 3
+        if byte >= len(bits):
+            return index
+        value = ~(bits[byte] >> (index & 7)) & (0xFF >> (index & 7))
+        if value:
+            return index + ((value & -value).bit_length() - 1)
+        match = _NONFULL_BYTE.search(bits, byte + 1)
+        if match is None:
+            return len(bits) * 8
+        byte = match.start()
+        value = ~bits[byte] & 0xFF
+        return byte * 8 + (value & -value).bit_length() - 1
+
+
+class _CompactMapping(abc.Mapping):
+    """Vista {indice: nuevo indice} de adjust_broken() para un SeqIndexSet. No
+    se materializa, en un conjunto de millones de indices el diccionario
+    ocuparía cientos de MB: recorrerla es lineal y cada consulta usa rank()."""
+
+    __slots__ = ("_indexset",)
+
+    def __init__(self, indexset: SeqIndexSet):
+        self._indexset = indexset
+
+    def __getitem__(self, index: int) -> int:
+        if index not in self._indexset:
+            raise KeyError(index)
+        return self._indexset.rank(index)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._indexset)
+
+    def __len__(self) -> int:
+        return len(self._indexset)
+
+    def items(self):
+        return ((old, new) for new, old in enumerate(self._indexset))
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class SeqMatcher:
+    """Reconocedor precompilado e inmutable de los nombres de una secuencia
+    concreta (name, separator, ext y settings de numeración). Se obtiene con
+    NameNumerator.matcher() y todo lo que necesita (patrón y nombre sin
+    numerar) se calcula una sola vez al crearlo.
+
+    [!] Sus métodos no validan el tipo de la entrada, se espera una str.
+    """
+
+    __slots__ = ("_name", "_ext", "_separator", "_prefix", "_suffix", "_first",
+                 "_offset", "_min_index", "_fullmatch")
+
+    def __init__(
+        self,
+        name: str,
+        ext: Optional[str],
+        separator: str,
+        enumerate_first: bool,
+        from_zero: bool,
+    ):
+        init = object.__setattr__
+        init(self, "_name", name)
+        init(self, "_ext", ext)
+        init(self, "_separator", separator)
+        suffix = "" if ext is None else f".{ext}"
+
+        # Todo nombre numerado empieza por prefix y acaba por suffix, así se
+        # descartan la mayoría de nombres ajenos sin llegar al regex
+        init(self, "_prefix", f"{name}{separator}")
+        init(self, "_suffix", suffix)
+
+        # Nombre del indice 0 cuando va sin decoración (None si se enumera)
+        init(self, "_first", None if enumerate_first else f"{name}{suffix}")
+
+        init(self, "_offset", _index_offset(enumerate_first, from_zero))
+
+        # Si el primero no se enumera el indice 0 no puede llevar número
+        init(self, "_min_index", 0 if enumerate_first else 1)
+
+        pattern = rf"{re.escape(name)}{re.escape(separator)}([0-9]+){re.escape(suffix)}"
+        init(self, "_fullmatch", re.compile(pattern).fullmatch)
+
+    def index_of(self, seqname: str) -> Optional[int]:
+        """Retorna el indice de seqname en la secuencia o None si no forma
+        parte de ella."""
+        if seqname == self._first:
+            return 0
+        if not (seqname.startswith(self._prefix) and seqname.endswith(self._suffix)):
+            return None
+
+        match = self._fullmatch(seqname)
+        if match is None:
+            return None
+
+        index = int(match.group(1)) + self._offset
+        return index if index >= self._min_index else None
+
+    def is_member(self, seqname: str) -> bool:
+        """Retorna True si seqname forma parte de la secuencia."""
+        return self.index_of(seqname) is not None
+
+    def parts(
+        self, seqname: str
+    ) -> Union[Tuple[str, str, str, Optional[str]], Tuple[None, None, None, None]]:
+        """Igual que NameNumerator.extract_seqname_parts pero solo para los
+        nombres de esta secuencia: (name, separator, number, ext). Para el primer
+        nombre sin numerar separator y number son cadenas vacías."""
+        if seqname == self._first:
+            return self._name, "", "", self._ext
+
+        match = self._fullmatch(seqname)
+        if match is None or int(match.group(1)) + self._offset < self._min_index:
+            return None, None, None, None
+        return self._name, self._separator, match.group(1), self._ext
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def ext(self) -> Optional[str]:
+        return self._ext
+
+    @property
+    def separator(self) -> str:
+        return self._separator
+
+    @property
+    def prefix(self) -> str:
+        """Parte común a todos los nombres numerados antes del número."""
+        return self._prefix
+
+    @property
+    def suffix(self) -> str:
+        """Parte común a todos los nombres tras el número ('' o '.ext')."""
+        return self._suffix
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+    def __setstate__(self, state: Tuple[None, Dict[str, Any]]):
+        # pickle y copy restauran los slots sin pasar por __init__
+        for slot, value in state[1].items():
+            object.__setattr__(self, slot, value)
+
+
 class NameNumerator:
+    # Máximo de matchers que se guardan por instancia
+    MATCHER_CACHE_SIZE = 128
+
+    # Crea los matchers, enable_stats() lo sustituye en la instancia
+    _matcher_factory: Callable[..., SeqMatcher] = SeqMatcher
+
     def __init__(
         self,
         separator: str = "_",
@@ -208,15 +824,53 @@ class NameNumerator:
              name, pero a diferencia de name ext no es obligatorio.
         """
 
-        # Settings
-        self._separator: str = self._get_separator(separator)
-        self._enumerate_first: bool = self._get_enumerate_first(enumerate_first)
-        self._from_zero: bool = self._get_from_zero(from_zero)
-        self._min_numlen: int = self._get_min_numlen(min_numlen)
+        # Settings y valores por defecto, compartidos entre todos los
+        # NameNumerator con la misma configuración (ver NumeratorSettings)
+        self._settings = NumeratorSettings._intern(
+            separator, enumerate_first, from_zero, min_numlen, def_name, def_ext,
+            stack=3,
+        )
+        self._init_state()
+
+    def _init_state(self):
+        """Estado propio de cada instancia, que no se comparte ni se serializa."""
+        # Cache LRU de matchers por (name, ext) tal y como se piden
+        self._matchers: "OrderedDict[Tuple, SeqMatcher]" = OrderedDict()
+
+        # Siguiente indice a probar en reserve() por (directorio, name, ext)
+        self._high_water: Dict[Tuple[str, str, Optional[str]], int] = {}
+
+        # Contadores de enable_stats(), ver instrument.py
+        self._recorder = None
+
+        # Caches de enable_cache(), ver cache.py
+        self._caches = None
+
+    @classmethod
+    def from_settings(cls, settings: "NumeratorSettings") -> "NameNumerator":
+        """Crea un NameNumerator a partir de unas settings ya validadas, sin
+        volver a validar nada."""
+        _raise_invalid_type("settings", settings, (NumeratorSettings,))
+        numerator = cls.__new__(cls)
+        numerator._settings = settings
+        numerator._init_state()
+        return numerator
+
+    def with_defaults(
+        self, *, name: Any = _UNCHANGED, ext: Any = _UNCHANGED
+    ) -> "NameNumerator":
+        """Retorna un NameNumerator nuevo con las mismas settings y otro
+        def_name y/o def_ext (None para quitarlo). Solo se valida lo que
+        cambia y las settings resultantes también son compartidas:
+
+            por_directorio = base.with_defaults(name="light", ext="bak")
+        """
+        settings = self._settings._with_defaults(name, ext, stack=3)
+        return self.from_settings(settings)
 
-        # Optional def values
-        self._def_name: Optional[str] = self._get_def_name(def_name)
-        self._def_ext: Optional[str] = self._get_def_ext(def_ext)
+    def __reduce__(self):
+        # Solo viajan las settings, las caches y los contadores se rehacen
+        return (type(self).from_settings, (self._settings,))
 
     #  CAT: seqname
     def get_seqname(
@@ -250,6 +904,31 @@ class NameNumerator:
         strnum = str(number).zfill(self.min_numlen)
         return f"{name}{self.separator}{strnum}{ext}"
 
+    def get_seqnames(
+        self,
+        start: int,
+        stop: int,
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+    ) -> List[str]:
+        """Obtiene los nombres de los indices range(start, stop), igual que
+        [get_seqname(i) for i in range(start, stop)] pero validando una sola vez
+        y formateando todos los números con la misma plantilla."""
+        return list(self._seqnames(start, stop, name, ext, stack=3))
+
+    def iter_seqnames(
+        self,
+        start: int,
+        stop: int,
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+    ) -> Iterator[str]:
+        """Versión perezosa de get_seqnames(), los argumentos se validan al
+        llamarla pero los nombres se generan según se van consumiendo."""
+        return self._seqnames(start, stop, name, ext, stack=3)
+
     def seqname_to_index(
         self,
         seqname: str,
@@ -262,23 +941,7 @@ class NameNumerator:
         numérica del nombre), si no lo es retornara None."""
         # Validations and defaults
         _raise_invalid_type("seqname", seqname, (str,))
-        name = self._get_name(name)
-        ext = self._get_ext(ext)
-
-        # Caso especial donde puede no haber numeración
-        if seqname == self.get_seqname(0, name, ext):
-            return 0
-
-        # Extrae las partes, si cualquiera es None es porque no
-        # se corresponde con un nombre de esta secuencia
-        name_part, separator_part, number_part, suffix_part = (
-            self.extract_seqname_parts(seqname)
-        )
-        if number_part is None:
-            return None
-
-        # Retorna el indice
-        return self.number_to_index(number_part)
+        return self._matcher(name, ext).index_of(seqname)
 
     def seqname_next(
         self,
@@ -315,15 +978,17 @@ class NameNumerator:
         """Retorna true si el nombre forma parte de esta secuencia, sino false"""
         # Validations and defaults
         _raise_invalid_type("seqname", seqname, (str,))
-        name = self._get_name(name)
-        ext = self._get_ext(ext)
-
-        # Caso especial donde puede no haber numeración
-        if seqname == self.get_seqname(0, name, ext):
-            return True
-        name_part = self.extract_seqname_parts(seqname)
+        return self._matcher(name, ext).is_member(seqname)
 
-        return name_part is not None
+    def matcher(
+        self,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+    ) -> SeqMatcher:
+        """Retorna el SeqMatcher de la secuencia (name, ext) con las settings de
+        este objeto. Se guardan los últimos MATCHER_CACHE_SIZE, así que pedirlo
+        repetidamente solo cuesta una búsqueda en un diccionario."""
+        return self._matcher(name, ext)
 
     def extract_seqname_parts(
         self,
@@ -346,8 +1011,7 @@ class NameNumerator:
         # (2) el separador
         # (3) el numero
         # .. no hay más porque hemos recortado la ext antes
-        pattern = rf"^(.*)({re.escape(self.separator)})(\d+)?$"
-        match = re.search(pattern, seqname)
+        match = self._settings._parts_pattern.search(seqname)
         if match:
             name = match.group(1)
             separator = match.group(2)
@@ -374,55 +1038,288 @@ class NameNumerator:
 
     def get_seqindexes(
         self,
-        nlist: List[str],
+        nlist: Iterable[Union[str, "os.PathLike[str]"]],
         *,
         name: Optional[str] = None,
         ext: Optional[str] = None,
-    ) -> List:
+        as_set: bool = False,
+    ) -> Union[List[int], SeqIndexSet]:
         """Retorna una lista ordenada de indices de los seqnames que aparecen en la
-        lista. Esta función no reporta errores, ni por duplicados, ni por secuencias        rotas, por lo que también se suministran las funciones get_missing() y
+        lista. Esta función no reporta errores, ni por duplicados, ni por secuencias
+        rotas, por lo que también se suministran las funciones get_missing() y
         get_duplicates() que obtendrán esta información si la necesitas.
+
+        nlist puede ser cualquier iterable de los aceptados por iter_seqindexes(),
+        solo se guardan los indices de los nombres que forman parte de la
+        secuencia, nunca la lista completa.
+
+        as_set: retorna un SeqIndexSet en lugar de una lista, mucho más compacto
+          para secuencias grandes pero sin información de duplicados.
         """
 
-        _raise_invalid_type("nlist", nlist, (list,))
-        _raise_invalid_elements("nlist", nlist, (str,))
+        _raise_invalid_names("nlist", nlist)
+        _raise_invalid_type("as_set", as_set, (bool,))
+        matcher = self._matcher(name, ext)
+        stream = self._seqindexes_stream("nlist", nlist, matcher)
 
-        seqindexes = []
-        for anyname in nlist:
-            index = self.seqname_to_index(anyname, name=name, ext=ext)
-            if index is not None:
-                seqindexes.append(index)
-        return sorted(seqindexes)
+        if as_set:
+            return SeqIndexSet(index for index, _ in stream)
+        return sorted(index for index, _ in stream)
+
+    def iter_seqindexes(
+        self,
+        iterable: Iterable[Union[str, "os.PathLike[str]"]],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+    ) -> Iterator[Tuple[int, str]]:
+        """Recorre el iterable de forma perezosa y va retornando (index, name) por
+        cada nombre que forma parte de la secuencia, en el orden de entrada.
+
+        Los elementos pueden ser str, os.DirEntry (se usa su .name) u
+        os.PathLike (se usa su basename), así que se le puede pasar directamente
+        os.scandir() o el lector de un manifiesto sin crear una lista intermedia.
+        Para obtener el resultado ordenado usa get_seqindexes().
+        """
+        _raise_invalid_names("iterable", iterable)
+        matcher = self._matcher(name, ext)
+        return self._seqindexes_stream("iterable", iterable, matcher)
+
+    def classify_parallel(
+        self,
+        source: Iterable[Union[str, "os.PathLike[str]"]],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = 65536,
+        as_set: bool = False,
+    ) -> Union[List[int], SeqIndexSet]:
+        """get_seqindexes() repartido entre varios procesos, para listados de
+        decenas de millones de nombres (manifiestos, inventarios, ...).
+
+        source se recorre una sola vez en bloques de chunk_size nombres que se
+        clasifican en un ProcessPoolExecutor de `workers` procesos (por defecto
+        uno por CPU). Cada proceso recibe las settings una vez al arrancar y
+        retorna los indices de cada bloque ya ordenados, que se unen al final
+        en una lista o, con as_set=True, en un único SeqIndexSet. El resultado
+        es el mismo que el de get_seqindexes().
+
+        Con workers=1 no se crea ningún proceso.
+        """
+        _raise_invalid_names("source", source)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        _raise_invalid_type("workers", workers, (int,))
+        _raise_min("workers", workers, 1)
+        _raise_invalid_type("chunk_size", chunk_size, (int,))
+        _raise_min("chunk_size", chunk_size, 1)
+        _raise_invalid_type("as_set", as_set, (bool,))
+        from .parallel import classify
+
+        return classify(self, source, name, ext, workers, chunk_size, as_set)
+
+    def index_file(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        delimiter: bytes = b"\n",
+        as_set: bool = False,
+    ) -> Union[List[int], SeqIndexSet]:
+        """get_seqindexes() de un listado guardado en fichero (la salida de find,
+        un inventario exportado, ...), con un nombre por registro separado por
+        delimiter (b"\\n" o b"\\0"). Como en la línea de comandos, las rutas se
+        comparan por su último componente.
+
+        El fichero se proyecta con mmap y se busca sobre los bytes, sin leerlo
+        ni decodificarlo entero: solo se convierte el número de los miembros,
+        así que la memoria extra solo depende de cuántos miembros hay.
+        """
+        _raise_invalid_type("path", path, (str, os.PathLike))
+        _raise_not_in("delimiter", delimiter, (b"\n", b"\0"))
+        _raise_invalid_type("as_set", as_set, (bool,))
+        from .fileindex import index_file
+
+        return index_file(self, path, name, ext, delimiter, as_set)
+
+    def scan_dir(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        kind: str = "any",
+    ) -> Tuple[List[int], List[os.DirEntry]]:
+        """Busca en el directorio path los elementos de la secuencia y retorna
+        (indices, entradas), ambas listas ordenadas por indice y alineadas.
+
+        kind: "any" para aceptar cualquier tipo de entrada, "file" solo ficheros
+          y "dir" solo directorios (siguiendo enlaces simbólicos).
+
+        Los nombres ajenos se descartan por prefijo/sufijo antes de llegar al
+        regex, y el tipo se comprueba con la información que ya trae os.scandir
+        por lo que normalmente no hace falta ninguna llamada extra a stat.
+        """
+        _raise_invalid_type("path", path, (str, os.PathLike))
+        _raise_not_in("kind", kind, ("any", "file", "dir"))
+        index_of = self._matcher(name, ext).index_of
+
+        found = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                index = index_of(entry.name)
+                if index is None:
+                    continue
+                # El tipo solo se consulta para los miembros de la secuencia
+                if kind == "dir" and not entry.is_dir():
+                    continue
+                if kind == "file" and not entry.is_file():
+                    continue
+                found.append((index, entry))
+
+        found.sort(key=lambda pair: pair[0])
+        return [index for index, _ in found], [entry for _, entry in found]
+
+    def scan_dir_cached(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        kind: str = "any",
+    ) -> SeqIndexSet:
+        """Indices de scan_dir() como SeqIndexSet, guardados en el subdirectorio
+        .namenumerator-cache del propio directorio para que otros procesos (o
+        el siguiente arranque) no tengan que volver a listarlo.
+
+        Mientras no se cree, borre o renombre nada en el directorio basta con
+        un stat para saber que la cache sigue valiendo; si ha cambiado se
+        lista una vez y se aplican las diferencias a lo guardado. Si el
+        directorio no es escribible simplemente se lista siempre. Ver
+        diskcache.py.
+        """
+        _raise_invalid_type("path", path, (str, os.PathLike))
+        _raise_not_in("kind", kind, ("any", "file", "dir"))
+        from .diskcache import scan
+
+        return scan(self, path, name, ext, kind)
+
+    def reserve(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        kind: str = "file",
+        rescan: bool = False,
+    ) -> Tuple[int, str]:
+        """Reserva de forma atómica el siguiente indice libre de la secuencia en
+        el directorio path creando un fichero vacío (kind="file", con
+        O_CREAT|O_EXCL) o un directorio (kind="dir", con mkdir). Retorna
+        (indice, ruta completa).
+
+        Es seguro con varios hilos o procesos a la vez sin ningún lock externo:
+        si otro se adelanta, la creación falla con FileExistsError y se prueba
+        el siguiente indice. El siguiente indice a probar se guarda por
+        directorio, así que solo la primera reserva (o rescan=True) lista el
+        directorio; si se ha compactado o rotado desde fuera usa rescan=True.
+        """
+        _raise_invalid_type("path", path, (str, os.PathLike))
+        _raise_not_in("kind", kind, ("file", "dir"))
+        _raise_invalid_type("rescan", rescan, (bool,))
+        matcher = self._matcher(name, ext)
+        directory = os.fspath(path)
+        key = (os.path.abspath(directory), matcher.name, matcher.ext)
+
+        index = None if rescan else self._high_water.get(key)
+        collisions = 0
+        while True:
+            if index is None:
+                seqindexes, _ = self.scan_dir(
+                    directory, name=matcher.name, ext=matcher.ext
+                )
+                index = seqindexes[-1] + 1 if seqindexes else 0
+                collisions = 0
+
+            target = os.path.join(
+                directory, self.get_seqname(index, matcher.name, matcher.ext)
+            )
+            try:
+                if kind == "dir":
+                    os.mkdir(target)
+                else:
+                    os.close(os.open(target, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                # Con mucha contención es más rápido volver a listar que ir
+                # probando de uno en uno
+                collisions += 1
+                index = None if collisions > 16 else index + 1
+                continue
+
+            self._high_water[key] = index + 1
+            return index, target
+
+    @staticmethod
+    def analyze(seqindexes: Union[List[int], SeqIndexSet]) -> "SequenceReport":
+        """Analiza la lista de indices (normalmente obtenida con get_seqindexes) en
+        una sola pasada lineal y retorna un SequenceReport con los indices
+        faltantes, los duplicados, el indice máximo, si la secuencia es contigua y
+        la reordenación que propondría adjust_broken().
+
+        get_missings(), get_duplicates(), any_duplicated() y adjust_broken() son
+        vistas de este informe, si necesitas varias de ellas llama a esta función
+        una sola vez.
+
+        También acepta un SeqIndexSet, en ese caso missing es otro SeqIndexSet.
+        """
+        return NameNumerator._analyze(seqindexes)
+
+    def watch(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        callback: Optional[Callable[..., None]] = None,
+        poll_interval: float = 2.0,
+    ) -> "SequenceWatcher":
+        """Empieza a vigilar el directorio path y retorna un SequenceWatcher (ver
+        watcher.py) que mantiene al día los indices de la secuencia sin volver a
+        listar el directorio: inotify en Linux o polling cada poll_interval
+        segundos si no está disponible.
+
+        Los cambios llegan a callback(change) y/o con `async for change in
+        watcher`. Llama a stop() (o úsalo con `with`) para terminar.
+        """
+        from .watcher import SequenceWatcher
+
+        return SequenceWatcher(
+            self,
+            path,
+            name=name,
+            ext=ext,
+            callback=callback,
+            poll_interval=poll_interval,
+        ).start()
 
     @staticmethod
     def get_missings(
-        seqindexes: List[int],
-    ) -> List[int]:
+        seqindexes: Union[List[int], SeqIndexSet],
+    ) -> Union[List[int], SeqIndexSet]:
         """Si la lista (normalmente obtenida con get_seqindexes) tiene una secuencia
         rota retornará los indices que deberían estar y no están.
 
         [+] Si también quieres saber que elementos están duplicados, puedes utilizar
         puedes utilizar get_duplicates()
-        """
-        _raise_invalid_type("seqindexes", seqindexes, (list,))
-        _raise_invalid_elements("seqindexes", seqindexes, (int,))
 
-        ordered_seqindexes = sorted(seqindexes)
-        range_list = list(range(len(ordered_seqindexes)))
-
-        # Si las listas son iguales retorna una lista vacia
-        if range_list == ordered_seqindexes:
-            return []
-
-        missing_indexes = []
-        for index in range_list:
-            if index not in ordered_seqindexes:
-                missing_indexes.append(index)
-
-        return missing_indexes
+        [+] Si se le pasa un SeqIndexSet retorna otro SeqIndexSet.
+        """
+        return NameNumerator._analyze(seqindexes).missing
 
     @staticmethod
-    def get_duplicates(seqindexes: List[int]) -> Dict[int, int]:
+    def get_duplicates(seqindexes: Union[List[int], SeqIndexSet]) -> Dict[int, int]:
         """Si la lista (normalmente obtenida con get_seqindexes) contiene
         duplicados, retorna un diccionario con los elementos duplicados y su cuenta.
         Si la lista está bien, retornará un diccionario vacio.
@@ -433,34 +1330,17 @@ class NameNumerator:
         elementos debería ser [0, 1]. Esa información la puedes obtener con
         get_missing() que en este caso retornaría [1]
         """
-        _raise_invalid_type("seqindexes", seqindexes, (list,))
-        _raise_invalid_elements("seqindexes", seqindexes, (int,))
-        count = {}
-        for item in seqindexes:
-            if item in count:
-                count[item] += 1
-            else:
-                count[item] = 1
-
-        # Filtrar solo los elementos con más de una aparición
-        return {item: cnt for item, cnt in count.items() if cnt > 1}
+        return NameNumerator._analyze(seqindexes).duplicates
 
     @staticmethod
-    def any_duplicated(seqindexes: List[int]) -> bool:
+    def any_duplicated(seqindexes: Union[List[int], SeqIndexSet]) -> bool:
         """Verifica si hay algún duplicado en la lista de índices.
         Retorna True si encuentra un duplicado, de lo contrario False.
         """
-        _raise_invalid_type("seqindexes", seqindexes, (list,))
-        _raise_invalid_elements("seqindexes", seqindexes, (int,))
-        seen = set()
-        for item in seqindexes:
-            if item in seen:
-                return True
-            seen.add(item)
-        return False
+        return bool(NameNumerator._analyze(seqindexes).duplicates)
 
     @staticmethod
-    def adjust_broken(seqindexes: List[int]):
+    def adjust_broken(seqindexes: Union[List[int], SeqIndexSet]):
         """Esta función sirve como ayuda para resolver un lista de seqindexes rota
         como por ejemplo [0,2,3], donde vemos que nos falta el indice 1. Lo que
         hará será retornarnos un diccionario con las posiciones a las que se
@@ -474,64 +1354,287 @@ class NameNumerator:
             Una vez que tengas una lista sin duplicados, entonces podrás invocar a
             esta función."""
 
-        _raise_invalid_type("seqindexes", seqindexes, (list,))
-        _raise_invalid_elements("seqindexes", seqindexes, (int,))
-        _raise_contains_duplicates("seqindexes", seqindexes)
+        report = NameNumerator._analyze(seqindexes)
+        if report.adjust is None:
+            _raise_contains_duplicates("seqindexes", seqindexes)
+        return report.adjust
 
-        reordered_indexes = {}
-        for new, old in enumerate(seqindexes):
-            reordered_indexes[old] = new
+    # CAT: Plans
+    @staticmethod
+    def plan_rotate(
+        seqindexes: Union[List[int], SeqIndexSet],
+        keep: Optional[int] = None,
+    ) -> List[Tuple[int, Optional[int]]]:
+        """Calcula los renombrados necesarios para dejar libre el indice 0 y poder
+        añadir un nuevo elemento al principio de la secuencia.
+
+        Retorna una lista ordenada de (src, dst) que se puede ejecutar tal cual,
+        en orden, sin que ningún destino esté ocupado. Solo se desplazan los
+        indices del tramo contiguo que empieza en 0, los que hay tras el primer
+        hueco ya no molestan y se quedan donde están.
+
+        keep: número máximo de elementos tras la rotación, incluido el nuevo. Los
+          que sobran (los de indice más alto) aparecen como (src, None), que
+          significa eliminar, y van al principio del plan.
+
+        Ejemplo: [0, 1, 3] -> [(1, 2), (0, 1)]
+        """
+        ordered = NameNumerator._plan_input(seqindexes)
+        if keep is not None:
+            _raise_invalid_type("keep", keep, (int,))
+            _raise_min("keep", keep, 1)
+
+        plan: List[Tuple[int, Optional[int]]] = []
+        if keep is not None and len(ordered) > keep - 1:
+            plan.extend((index, None) for index in reversed(ordered[keep - 1 :]))
+            ordered = ordered[: keep - 1]
+
+        # Tramo 0..n-1 contiguo, de mayor a menor para no pisar ningún nombre
+        run = 0
+        while run < len(ordered) and ordered[run] == run:
+            run += 1
+        plan.extend((index, index + 1) for index in range(run - 1, -1, -1))
+        return plan
+
+    @staticmethod
+    def plan_compact(
+        seqindexes: Union[List[int], SeqIndexSet],
+        keep_order: bool = False,
+    ) -> List[Tuple[int, int]]:
+        """Calcula los renombrados para que una secuencia rota vuelva a ser
+        0..n-1, como adjust_broken() pero como un plan ordenado (src, dst) sin
+        movimientos nulos que se puede ejecutar en orden sin colisiones.
+
+        Por defecto usa el mínimo de renombrados: cada hueco se rellena con uno
+        de los indices que quedan fuera de 0..n-1, sin tocar el resto.
+
+        keep_order: (True) conserva el orden relativo, desplazando hacia abajo
+          todo lo que hay tras el primer hueco, a costa de más renombrados.
+            [0, 2, 3, 4] -> (False) [(4, 1)] (True) [(2, 1), (3, 2), (4, 3)]
+        """
+        ordered = NameNumerator._plan_input(seqindexes)
+        _raise_invalid_type("keep_order", keep_order, (bool,))
+
+        if keep_order:
+            # De menor a mayor: el destino siempre es menor que el origen y
+            # todo lo que había por debajo ya se ha movido
+            return [(old, new) for new, old in enumerate(ordered) if old != new]
+
+        size = len(ordered)
+        present = set(ordered)
+        gaps = (index for index in range(size) if index not in present)
+        outside = (index for index in ordered if index >= size)
+        return list(zip(outside, gaps))
+
+    def apply_plan(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        plan: List[Tuple[int, Optional[int]]],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        workers: int = 8,
+    ) -> "ExecutionReport":
+        """Aplica sobre el directorio path un plan de indices (src, dst) como los
+        de plan_rotate()/plan_compact(), dst None significa eliminar.
+
+        Usa un RenameExecutor (ver executor.py): los renombrados independientes
+        se ejecutan en paralelo y todo queda en un journal, así que si se
+        interrumpe se puede continuar con RenameExecutor(path).resume() o
+        deshacer con rollback(). Retorna un ExecutionReport con el número de
+        operaciones y su velocidad (rate).
+        """
+        from .executor import RenameExecutor
+
+        _raise_invalid_type("plan", plan, (list,))
+        matcher = self._matcher(name, ext)
+        name, ext = matcher.name, matcher.ext
+
+        renames = [
+            (
+                self.get_seqname(src, name, ext),
+                None if dst is None else self.get_seqname(dst, name, ext),
+            )
+            for src, dst in plan
+        ]
+        return RenameExecutor(path, workers=workers).run(renames)
+
+    def migrate_plan(
+        self,
+        other: "NameNumerator",
+        names: Iterable[Union[str, "os.PathLike[str]"]],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        to_name: Optional[str] = None,
+        to_ext: Optional[str] = None,
+    ) -> List[Tuple[str, str]]:
+        """Calcula los renombrados (src, dst) que pasan cada miembro de la
+        secuencia en names (un listado del directorio, como el que acepta
+        iter_seqindexes()) al nombre que le da other para el mismo indice, por
+        ejemplo para pasar de min_numlen=1 a min_numlen=4.
+
+        to_name/to_ext: secuencia destino, por defecto los de other y si no
+          tiene, los mismos name/ext del origen.
+
+        Si algún destino ya existe y no se va a mover, o dos nombres van al
+        mismo destino (img_1 e img_01), lanza MigrationError sin tocar nada.
+        El plan va agrupado en cadenas independientes, con los ciclos rotos
+        mediante un nombre temporal, así que se puede aplicar en orden o en
+        paralelo con RenameExecutor:
+
+            plan = old.migrate_plan(new, os.scandir(path))
+            RenameExecutor(path).run(plan)
+        """
+        _raise_invalid_type("other", other, (NameNumerator,))
+        _raise_invalid_names("names", names)
+        from .migration import plan
 
-        return reordered_indexes
+        return plan(self, other, names, name, ext, to_name, to_ext)
+
+    #  CAT: Instrumentation
+    def enable_stats(self, tracer: Optional[Callable[[str], Any]] = None):
+        """Empieza a contar llamadas y tiempos de los métodos de esta instancia
+        y cómo se resuelven los nombres (ver stats()).
+
+        tracer: opcional, se llama con el nombre del método antes de cada
+          llamada medida y puede retornar un context manager que envuelve la
+          llamada (por ejemplo para emitir spans):
+            nd.enable_stats(lambda name: tracer.start_as_current_span(name))
+
+        Los métodos se sustituyen en la instancia por versiones medidas, así
+        que mientras está desactivado no cuesta nada.
+        """
+        from .instrument import enable
+
+        enable(self, tracer)
+
+    def disable_stats(self):
+        """Deja de medir, los contadores se conservan hasta reset_stats()."""
+        from .instrument import disable
+
+        disable(self)
+
+    def stats(self) -> "NumeratorStats":
+        """Retorna un NumeratorStats con las llamadas y segundos por método y
+        los contadores del reconocimiento de nombres."""
+        from .instrument import snapshot
+
+        return snapshot(self)
+
+    def reset_stats(self):
+        """Pone a cero todos los contadores."""
+        if self._recorder is not None:
+            self._recorder.reset()
+
+    #  CAT: Caches
+    def enable_cache(self, maxsize: int = 1024):
+        """Guarda los últimos maxsize resultados de get_seqname (indice ->
+        nombre) y de seqname_to_index/is_seqname (nombre -> indice) en dos
+        caches LRU de esta instancia, así pedir muchas veces los mismos nombres
+        solo cuesta una búsqueda en un diccionario. Cambiar def_name o def_ext
+        vacía las caches. Si ya estaban activas se vacían y los contadores de
+        cache_info() vuelven a cero.
+
+        Igual que enable_stats(), los métodos se sustituyen en la instancia, así
+        que mientras está desactivado no cuesta nada.
+        """
+        from .cache import enable
+
+        enable(self, maxsize)
+
+    def disable_cache(self):
+        """Vuelve a calcular cada nombre y libera las caches."""
+        from .cache import disable
+
+        disable(self)
+
+    def cache_info(self) -> "CacheStats":
+        """Retorna un CacheStats con aciertos, fallos, ocupación y hit_rate de
+        la cache directa y de la inversa."""
+        from .cache import snapshot
+
+        return snapshot(self)
 
     #  CAT: Properties
+    @property
+    def settings(self) -> "NumeratorSettings":
+        """Settings inmutables actuales, sirven como clave de cache."""
+        return self._settings
+
     @property
     def separator(self):
-        return self._separator
+        return self._settings._separator
 
     @property
     def enumerate_first(self) -> bool:
-        return self._enumerate_first
+        return self._settings._enumerate_first
 
     @property
     def from_zero(self) -> bool:
-        return self._from_zero
+        return self._settings._from_zero
 
     @property
     def min_numlen(self) -> int:
-        return self._min_numlen
+        return self._settings._min_numlen
 
     @property
     def def_name(self) -> Optional[str]:
         """Retorna el valor por defecto o None"""
-        return self._def_name
+        return self._settings._def_name
 
     @def_name.setter
     def def_name(self, value: Optional[str]):
-        """Permite reasignar el nombre por defecto"""
-        self._def_name = self._get_def_name(value)
+        """Permite reasignar el nombre por defecto. Las settings no se
+        modifican, se sustituyen por otras (las de with_defaults)."""
+        self._settings = self._settings._with_defaults(value, _UNCHANGED, stack=3)
+        self._matchers.clear()
+        if self._caches is not None:
+            self._caches.clear()
 
     @property
     def def_ext(self) -> Optional[str]:
         """Retorna la extensión por defecto o None"""
-        return self._def_ext
+        return self._settings._def_ext
 
     @def_ext.setter
     def def_ext(self, value: Optional[str]):
-        self._def_ext = self._get_def_ext(value)
+        self._settings = self._settings._with_defaults(_UNCHANGED, value, stack=3)
+        self._matchers.clear()
+        if self._caches is not None:
+            self._caches.clear()
 
     #  CAT: Private Methods
+    def _install_wrappers(self):
+        """Vuelve a montar en la instancia los envoltorios de enable_cache() y
+        enable_stats() que estén activos. Las caches van por dentro, así las
+        estadísticas cuentan también las llamadas que resuelve la cache."""
+        from . import cache, instrument
+
+        for name in (
+            cache.METHODS + instrument.PUBLIC_METHODS + instrument.PRIVATE_METHODS
+        ):
+            self.__dict__.pop(name, None)
+        self.__dict__.pop("_matcher_factory", None)
+        self._matchers.clear()
+
+        if self._caches is not None:
+            cache.install(self)
+        if self._recorder is not None and self._recorder.enabled:
+            instrument.install(self)
+
     def _get_name(self, name: Optional[str], *, stack=2):
         """Obtiene name o def_name"""
         vname = "name"
-        _raise_required_def(vname, name, self._def_name, stack=stack)
-        assert self._def_name is not None, ""
+        def_name = self._settings._def_name
+        _raise_required_def(vname, name, def_name, stack=stack)
 
         # Si name no se ha indicado usamos def_name
         if name is None:
-            return self._def_name
+            assert def_name is not None, ""
+            return def_name
 
-        _raise_invalid_type(vname, name, (str,))
+        _raise_invalid_type(vname, name, (str,), stack=stack)
         _raise_contains_points(vname, name, stack=stack)
         _raise_requires_one_char(vname, name, stack=stack)
 
@@ -543,14 +1646,162 @@ class NameNumerator:
 
         # Si no hay ext retornamos def_ext que también puede se None
         if ext is None:
-            return self._def_ext
+            return self._settings._def_ext
 
-        _raise_invalid_type(vname, ext, (str,))
+        _raise_invalid_type(vname, ext, (str,), stack=stack)
         _raise_contains_points(vname, ext, stack=stack)
         _raise_requires_one_char(vname, ext, stack=stack)
 
         return ext
 
+    def _seqnames(
+        self,
+        start: int,
+        stop: int,
+        name: Optional[str],
+        ext: Optional[str],
+        *,
+        stack=2,
+    ) -> Iterator[str]:
+        """Valida los argumentos de get_seqnames/iter_seqnames y retorna un
+        iterador perezoso de los nombres."""
+        _raise_invalid_type("start", start, (int,), stack=stack - 1)
+        _raise_min("start", start, 0, stack=stack - 1)
+        _raise_invalid_type("stop", stop, (int,), stack=stack - 1)
+        name = self._get_name(name, stack=stack)
+        ext = self._get_ext(ext, stack=stack)
+        suffix = "" if ext is None else f".{ext}"
+
+        # Plantilla %-format: prefix + número con ceros a la izquierda + suffix
+        template = (
+            f"{name}{self.separator}".replace("%", "%%")
+            + f"%0{self.min_numlen}d"
+            + suffix.replace("%", "%%")
+        )
+
+        # number = index - offset
+        shift = -_index_offset(self.enumerate_first, self.from_zero)
+
+        # Caso especial para el primer nombre que puede ir sin decoración
+        if start == 0 and stop > 0 and not self.enumerate_first:
+            numbers = range(1 + shift, stop + shift)
+            return chain((f"{name}{suffix}",), map(template.__mod__, numbers))
+
+        numbers = range(start + shift, max(start, stop) + shift)
+        return map(template.__mod__, numbers)
+
+    def _matcher(
+        self, name: Optional[str], ext: Optional[str], *, stack=3
+    ) -> SeqMatcher:
+        """Implementación de matcher(), stack apunta a la función pública que
+        la invoca para los mensajes de error."""
+        key = (name, ext)
+        matchers = self._matchers
+        try:
+            matchers.move_to_end(key)
+            return matchers[key]
+        except (KeyError, TypeError):
+            # TypeError: name/ext no hashables, la validación dará el error
+            pass
+
+        settings = self._settings
+        matcher = self._matcher_factory(
+            self._get_name(name, stack=stack),
+            self._get_ext(ext, stack=stack),
+            settings._separator,
+            settings._enumerate_first,
+            settings._from_zero,
+        )
+        matchers[key] = matcher
+        if len(matchers) > self.MATCHER_CACHE_SIZE:
+            matchers.popitem(last=False)
+        return matcher
+
+    @staticmethod
+    def _seqindexes_stream(
+        vname: str, iterable: Iterable[Any], matcher: SeqMatcher
+    ) -> Iterator[Tuple[int, str]]:
+        """Generador de iter_seqindexes/get_seqindexes, obtiene el nombre de
+        cada elemento y lo pasa por el matcher."""
+        index_of = matcher.index_of
+        for position, item in enumerate(iterable):
+            # str es lo habitual así que se comprueba primero y sin llamadas
+            itemname = item if type(item) is str else _entry_name(item)
+            if itemname is None:
+                _raise_invalid_type(
+                    f"{vname} (element: {position})", item, (str, os.PathLike)
+                )
+
+            index = index_of(itemname)
+            if index is not None:
+                yield index, itemname
+
+    @staticmethod
+    def _analyze(seqindexes: List[int], *, stack=2) -> "SequenceReport":
+        """Implementación de analyze(), stack apunta a la función pública que la
+        invoca para los mensajes de error."""
+        _raise_invalid_type(
+            "seqindexes", seqindexes, (list, SeqIndexSet), stack=stack
+        )
+        if isinstance(seqindexes, SeqIndexSet):
+            return NameNumerator._analyze_set(seqindexes)
+        _raise_invalid_elements("seqindexes", seqindexes, (int,), stack=stack)
+
+        # La única pasada sobre la entrada: Counter cuenta en C
+        counts = Counter(seqindexes)
+        size = len(seqindexes)
+
+        # Con n elementos deberían estar los indices 0..n-1, si falta alguno
+        # es que la secuencia está rota (o tiene duplicados)
+        missing = [index for index in range(size) if index not in counts]
+        duplicates = {item: cnt for item, cnt in counts.items() if cnt > 1}
+
+        adjust = None
+        if not duplicates:
+            adjust = {old: new for new, old in enumerate(seqindexes)}
+
+        return SequenceReport(
+            count=size,
+            max_index=max(counts) if counts else None,
+            missing=missing,
+            duplicates=duplicates,
+            contiguous=not missing,
+            adjust=adjust,
+        )
+
+    @staticmethod
+    def _analyze_set(seqindexes: SeqIndexSet) -> "SequenceReport":
+        """_analyze() para un SeqIndexSet: no puede haber duplicados y los
+        faltantes se retornan también como SeqIndexSet."""
+        size = len(seqindexes)
+        missing = SeqIndexSet.from_ranges(seqindexes.missing_ranges(size))
+        return SequenceReport(
+            count=size,
+            max_index=seqindexes.max_index,
+            missing=missing,
+            duplicates={},
+            contiguous=not missing,
+            adjust=_CompactMapping(seqindexes),
+        )
+
+    @staticmethod
+    def _plan_input(
+        seqindexes: Union[List[int], SeqIndexSet], *, stack=2
+    ) -> List[int]:
+        """Valida la entrada de los plan_* y la retorna ordenada."""
+        _raise_invalid_type(
+            "seqindexes", seqindexes, (list, SeqIndexSet), stack=stack
+        )
+        if isinstance(seqindexes, SeqIndexSet):
+            return seqindexes.to_list()
+
+        _raise_invalid_elements("seqindexes", seqindexes, (int,), stack=stack)
+        _raise_contains_duplicates("seqindexes", seqindexes, stack=stack)
+        ordered = sorted(seqindexes)
+        if ordered:
+            _raise_min("seqindexes (element: min)", ordered[0], 0, stack=stack)
+        return ordered
+
     @staticmethod
     def _validate_index(index: int, *, stack=2):
         """Válida que el indice sea mayor que cero así como su tipo de dato."""
@@ -624,97 +1875,347 @@ class NameNumerator:
         perr = _func_emsg(stack=stack)
         raise NotPartOfSeq(
             seqname,
-            f"{perr} '{BGRAY}{seqname}{END}' no forma parte de esta secuencia",
+            f"{perr} '{_hl(seqname)}' no forma parte de esta secuencia",
         )
 
 
-#  INFO: Ejemplo de uso real
-
-# Estoy haciendo un programa de backups que permite establecer categorías, ejemplo light para todo aquello que no sea muy pesado, y como no es muy pesado pues el usuario decide que quiere conservar hasta 10 backups de lo mismo. Para guardar las backups, he decidido que se almacenen en las siguientes carpetas:
+class NumeratorSettings:
+    """Settings de un NameNumerator (separator, enumerate_first, from_zero,
+    min_numlen) y sus valores por defecto (def_name, def_ext), inmutables y
+    hashables, así que sirven como clave de cache y se pueden compartir entre
+    hilos.
+
+    Las instancias se internan: la misma configuración siempre retorna el
+    mismo objeto y solo se valida la primera vez, así que crear un
+    NameNumerator por directorio no repite las validaciones ni ocupa más
+    memoria que una referencia. La tabla no mantiene vivas las instancias:
+    las configuraciones que ya no usa nadie desaparecen de ella, salvo las
+    RECENT_SIZE usadas más recientemente, que se retienen para que crear y
+    descartar un NameNumerator en bucle tampoco las vuelva a validar. Al
+    serializarse con pickle solo viajan los seis valores y al cargarse se
+    vuelven a internar.
+    """
 
-# light.bak light_1.bak light_2.bak light_3.bak ...
+    __slots__ = ("_separator", "_enumerate_first", "_from_zero", "_min_numlen",
+                 "_def_name", "_def_ext", "_parts_pattern", "_hash", "__weakref__")
 
-# Por lo que voy a crear un NameDecorator que haga este trabajo por mi:
-nd = NameNumerator(
-    def_name="light",
-    def_ext="bak",
-)
+    # Máximo de configuraciones recientes retenidas
+    RECENT_SIZE = 32
 
-# ¿Qué nombre de carpeta le correspondería a 0?
-print(f"A 0 le corresponde {nd.get_seqname(0, "light", "bak")}")
-
-# Pero como tenemos settings por defecto para name y ext no hace falta que
-# indiquemos esos valores en ninguna función, se usarán si no los especificamos
-
-nombres_validos = [nd.get_seqname(i) for i in range(10)]
-print("Nombres válidos: ", nombres_validos)
-
-# Vale, ya se como voy a poner de nombre a mis carpetas, pero digamos que yo
-# quiero saber si hay alguna ya creada, le pasamos todos los nombres que hay
-# en la carpeta para que nos diga cuales hay
-nombres_en_la_carpeta = [
-    "videoPrivado.mp4",
-    "light_1.bak",
-    "light.bak",
-    "light_2.bak",
-]
-
-usados = nd.get_seqindexes(nombres_en_la_carpeta)
-usados_list = [nd.get_seqname(i) for i in usados]
-print(f"Se han usado estos nombres: {usados_list}")
-
-# Tenemos los indices y como puedes ver hemos obtenido los nombres a traves de
-# ellos. Digamos que quiero hacer una backup más, lo haríamos así.
-if len(usados) < 10:
-    print(
-        f"{nd.get_seqname(len(usados))} está disponible para usar como carpeta de"
-        f" backups"
+    # Configuración (tal y como se pidió) -> instancia, sin retenerla
+    _interned: "weakref.WeakValueDictionary[Tuple, NumeratorSettings]" = (
+        weakref.WeakValueDictionary()
     )
+    # Las más recientes, retenidas, por delante de _interned (LRU)
+    _recent: "OrderedDict[Tuple, NumeratorSettings]" = OrderedDict()
 
-    # Creariamos la backup en tmp_light, y ahora vamos a asignarle el nombre que
-    # le corresponde, pero para ello vamos a renombrar todos los demas:
-    for i in reversed(usados):
-        old_name = nd.get_seqname(i)
-        new_name = nd.get_seqname(i + 1)
-        print(f"renombrando {old_name} a {new_name} ... ")
-
-    print(f"renombrando tmp_light a {nd.get_seqname(0)}")
-
-# Y listo, ese sería el funcionamiento en un mundo maravilloso en el que no ocurren
-# cosas malas. Ahora vamos a suponer que el usuario se come una carpeta.
-nombres_en_la_carpeta = [
-    "videoPrivado.mp4",
-    "light_1.bak",
-    "light_2.bak",
-]
-usados = nd.get_seqindexes(nombres_en_la_carpeta)
-print(f"Veremos que algo no esta bien: {usados}")
-
-missings = nd.get_missings(usados)
-if missings:
-    # Obtenemos los nombres faltantes y los imprimimos
-    misings_str = f"{END},{BGRAY} ".join(nd.get_seqname(i) for i in missings)
-    print(
-        f"\n{BYELLOW}[!] Aviso{END}: Las siguientes carpetas deberían estar y no"
-        f" están: '{BGRAY}{misings_str}{END}'"
-    )
-    print(f"\n Vamos a reordenar las carpetas primero ...")
-
-    # Vamos a ayudarnos de NameDecorator para que nos ayude a ajustar los nombres
-    solucion_propuesta = nd.adjust_broken(usados)
-    for indice, nuevo_indice in solucion_propuesta.items():
-        nombre = nd.get_seqname(indice)
-        nuevo_nombre = nd.get_seqname(nuevo_indice)
-    
-        print(f" Renombrando carpeta {nombre} a {nuevo_nombre} ... ")
-    
-    # usados = solucion_propuesta.values()
-    usados = range(len(usados))
-    usados_list = [nd.get_seqname(i) for i in usados]
-
-print(f"\nSe nos ha quedado así: {usados_list}")
-
-# Y eso sería todo en cuanto al uso principal que yo voy a usar, adicionalmente
-# hay funciones que son útiles para ciertas situaciones como cuando se permite
-# que haya duplicados y se le pasan nombres duplicados, pero ahora que entiendes
-# el proposito de la clase te dejo que lo investigues tu Zetaky.
+    def __new__(
+        cls,
+        separator: str = "_",
+        enumerate_first: bool = False,
+        from_zero: bool = False,
+        min_numlen: int = 1,
+        *,
+        def_name: Optional[str] = None,
+        def_ext: Optional[str] = None,
+    ) -> "NumeratorSettings":
+        """Mismos argumentos que NameNumerator."""
+        return cls._intern(
+            separator, enumerate_first, from_zero, min_numlen, def_name, def_ext
+        )
+
+    def with_defaults(
+        self, *, name: Any = _UNCHANGED, ext: Any = _UNCHANGED
+    ) -> "NumeratorSettings":
+        """Retorna las settings con otro def_name y/o def_ext (None para
+        quitarlo), validando solo lo que cambia."""
+        return self._with_defaults(name, ext, stack=3)
+
+    @property
+    def separator(self) -> str:
+        return self._separator
+
+    @property
+    def enumerate_first(self) -> bool:
+        return self._enumerate_first
+
+    @property
+    def from_zero(self) -> bool:
+        return self._from_zero
+
+    @property
+    def min_numlen(self) -> int:
+        return self._min_numlen
+
+    @property
+    def def_name(self) -> Optional[str]:
+        return self._def_name
+
+    @property
+    def def_ext(self) -> Optional[str]:
+        return self._def_ext
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, NumeratorSettings):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        return (NumeratorSettings._intern, self._fields())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name[1:]}={getattr(self, name)!r}" for name in self.__slots__[:6]
+        )
+        return f"NumeratorSettings({fields})"
+
+    #  CAT: Private Methods
+    @classmethod
+    def _intern(
+        cls,
+        separator: str,
+        enumerate_first: bool,
+        from_zero: bool,
+        min_numlen: int,
+        def_name: Optional[str],
+        def_ext: Optional[str],
+        *,
+        stack=3,
+    ) -> "NumeratorSettings":
+        """Retorna la instancia interna de la configuración, validándola y
+        creándola si es la primera vez. stack apunta a la función pública que
+        la invoca para los mensajes de error."""
+        key = (separator, enumerate_first, from_zero, min_numlen, def_name, def_ext)
+        # True == 1 y 2.0 == 2, solo se confía en la clave con los tipos exactos
+        if (
+            type(enumerate_first) is bool
+            and type(from_zero) is bool
+            and type(min_numlen) is int
+        ):
+            try:
+                return cls._lookup(key)
+            except (KeyError, TypeError):
+                pass
+
+        fields = (
+            NameNumerator._get_separator(separator, stack=stack),
+            NameNumerator._get_enumerate_first(enumerate_first, stack=stack),
+            NameNumerator._get_from_zero(from_zero, stack=stack),
+            NameNumerator._get_min_numlen(min_numlen, stack=stack),
+            NameNumerator._get_def_name(def_name, stack=stack),
+            NameNumerator._get_def_ext(def_ext, stack=stack),
+        )
+        parts_pattern = re.compile(rf"^(.*)({re.escape(separator)})(\d+)?$")
+        return cls._store(fields, parts_pattern)
+
+    def _with_defaults(
+        self, name: Any, ext: Any, *, stack=3
+    ) -> "NumeratorSettings":
+        """Implementación de with_defaults() y de los setters de NameNumerator:
+        lo que no cambia ya está validado y se copia tal cual."""
+        if name is _UNCHANGED:
+            name = self._def_name
+        elif name is not None:
+            name = NameNumerator._get_def_name(name, stack=stack)
+        if ext is _UNCHANGED:
+            ext = self._def_ext
+        elif ext is not None:
+            ext = NameNumerator._get_def_ext(ext, stack=stack)
+
+        fields = (self._separator, self._enumerate_first, self._from_zero,
+                  self._min_numlen, name, ext)
+        try:
+            return self._lookup(fields)
+        except KeyError:
+            return self._store(fields, self._parts_pattern)
+
+    @classmethod
+    def _store(cls, fields: Tuple, parts_pattern: Any) -> "NumeratorSettings":
+        """Crea la instancia con los fields (ya validados, en el orden de
+        __slots__) y la interna. Si otro hilo se ha adelantado retorna la
+        suya."""
+        settings = object.__new__(cls)
+        init = object.__setattr__
+        for slot, value in zip(cls.__slots__, fields):
+            init(settings, slot, value)
+        init(settings, "_parts_pattern", parts_pattern)
+        init(settings, "_hash", hash(fields))
+        return cls._remember(fields, cls._interned.setdefault(fields, settings))
+
+    @classmethod
+    def _lookup(cls, key: Tuple) -> "NumeratorSettings":
+        """Busca la instancia interna de key, primero entre las recientes.
+        Lanza KeyError si no existe (o TypeError si key no es hashable)."""
+        recent = cls._recent
+        try:
+            recent.move_to_end(key)
+            return recent[key]
+        except KeyError:
+            return cls._remember(key, cls._interned[key])
+
+    @classmethod
+    def _remember(
+        cls, key: Tuple, settings: "NumeratorSettings"
+    ) -> "NumeratorSettings":
+        """Retiene settings entre las recientes y la retorna."""
+        recent = cls._recent
+        recent[key] = settings
+        if len(recent) > cls.RECENT_SIZE:
+            try:
+                recent.popitem(last=False)
+            except KeyError:
+                # Otro hilo la ha vaciado entre medias
+                pass
+        return settings
+
+    def _fields(self) -> Tuple:
+        return (self._separator, self._enumerate_first, self._from_zero,
+                self._min_numlen, self._def_name, self._def_ext)
+
+
+class SequenceRegistry:
+    """Conjunto de secuencias (name, ext) que comparten las settings de un
+    NameNumerator. Permite clasificar un listado entre todas ellas en una sola
+    pasada: cada nombre se descompone una vez en (name, ext, número) y la
+    secuencia se busca en un diccionario, así que añadir más secuencias no
+    encarece la clasificación.
+
+    Ejemplo: SequenceRegistry(nd, [("light", "bak"), ("heavy", "bak")])
+    """
+
+    def __init__(
+        self,
+        numerator: NameNumerator,
+        sequences: Iterable[Tuple[str, Optional[str]]] = (),
+    ):
+        _raise_invalid_type("numerator", numerator, (NameNumerator,))
+        self._numerator = numerator
+        self._separator = numerator.separator
+        self._enumerate_first = numerator.enumerate_first
+        self._offset = _index_offset(numerator.enumerate_first, numerator.from_zero)
+        self._min_index = 0 if numerator.enumerate_first else 1
+        self._keys: set = set()
+
+        for name, ext in sequences:
+            self.add(name, ext)
+
+    def add(
+        self, name: Optional[str] = None, ext: Optional[str] = None
+    ) -> Tuple[str, Optional[str]]:
+        """Registra la secuencia (name, ext), usando los valores por defecto del
+        numerador si no se indican, y retorna su clave."""
+        matcher = self._numerator._matcher(name, ext)
+        key = (matcher.name, matcher.ext)
+        self._keys.add(key)
+        return key
+
+    def remove(
+        self, name: Optional[str] = None, ext: Optional[str] = None
+    ) -> Tuple[str, Optional[str]]:
+        """Elimina la secuencia (name, ext) si estaba registrada y retorna su
+        clave."""
+        matcher = self._numerator._matcher(name, ext)
+        key = (matcher.name, matcher.ext)
+        self._keys.discard(key)
+        return key
+
+    def seqname_to_key(
+        self, seqname: str
+    ) -> Optional[Tuple[Tuple[str, Optional[str]], int]]:
+        """Retorna ((name, ext), index) si seqname pertenece a alguna de las
+        secuencias registradas, sino None."""
+        _raise_invalid_type("seqname", seqname, (str,))
+        return self._classify(seqname)
+
+    def iter_classify(
+        self, iterable: Iterable[Union[str, "os.PathLike[str]"]]
+    ) -> Iterator[Tuple[Tuple[str, Optional[str]], int, str]]:
+        """Recorre el iterable de forma perezosa y retorna (clave, index, name)
+        por cada nombre que pertenece a alguna secuencia registrada. Acepta los
+        mismos elementos que NameNumerator.iter_seqindexes()."""
+        _raise_invalid_names("iterable", iterable)
+        return self._classify_stream(iterable)
+
+    def classify(
+        self, iterable: Iterable[Union[str, "os.PathLike[str]"]]
+    ) -> Dict[Tuple[str, Optional[str]], List[int]]:
+        """Retorna un diccionario {(name, ext): indices ordenados} con una entrada
+        por cada secuencia registrada, aunque no aparezca en el listado."""
+        _raise_invalid_names("iterable", iterable)
+        result: Dict[Tuple[str, Optional[str]], List[int]] = {
+            key: [] for key in self._keys
+        }
+        for key, index, _ in self._classify_stream(iterable):
+            result[key].append(index)
+        for seqindexes in result.values():
+            seqindexes.sort()
+        return result
+
+    @property
+    def numerator(self) -> NameNumerator:
+        return self._numerator
+
+    @property
+    def sequences(self) -> Tuple[Tuple[str, Optional[str]], ...]:
+        """Claves (name, ext) registradas, ordenadas."""
+        return tuple(sorted(self._keys, key=lambda key: (key[0], key[1] or "")))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Tuple[str, Optional[str]]) -> bool:
+        return key in self._keys
+
+    #  CAT: Private Methods
+    def _classify(
+        self, seqname: str
+    ) -> Optional[Tuple[Tuple[str, Optional[str]], int]]:
+        """Descompone seqname y busca su secuencia, ni name ni ext pueden
+        contener puntos así que la ext es lo que hay tras el primero."""
+        stem, dot, ext = seqname.partition(".")
+        ext = ext if dot else None
+
+        # Caso especial para el primer nombre que puede ir sin decoración
+        key = (stem, ext)
+        if not self._enumerate_first and key in self._keys:
+            return key, 0
+
+        name, separator, number = stem.rpartition(self._separator)
+        if not separator or not (number.isascii() and number.isdigit()):
+            return None
+
+        key = (name, ext)
+        if key not in self._keys:
+            return None
+
+        index = int(number) + self._offset
+        if index < self._min_index:
+            return None
+        return key, index
+
+    def _classify_stream(
+        self, iterable: Iterable[Any]
+    ) -> Iterator[Tuple[Tuple[str, Optional[str]], int, str]]:
+        """Generador de iter_classify/classify."""
+        classify = self._classify
+        for position, item in enumerate(iterable):
+            itemname = item if type(item) is str else _entry_name(item)
+            if itemname is None:
+                _raise_invalid_type(
+                    f"iterable (element: {position})", item, (str, os.PathLike)
+                )
+
+            found = classify(itemname)
+            if found is not None:
+                yield found[0], found[1], itemname
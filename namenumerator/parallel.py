@@ -0,0 +1,142 @@
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from heapq import merge
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+from .namenumerator import (
+    NameNumerator,
+    NumeratorSettings,
+    SeqIndexSet,
+    SeqMatcher,
+    _SPARSE_BYTES_PER_INDEX,
+    _SPARSE_MIN_BYTES,
+    _entry_name,
+    _raise_invalid_type,
+)
+import os
+
+#  INFO: Clasificación en varios procesos
+#
+# NameNumerator.classify_parallel() reparte la entrada en bloques de nombres y
+# los clasifica en un ProcessPoolExecutor. Cada proceso recibe las settings
+# (ya validadas) una sola vez al arrancar y construye su propio matcher; por
+# cada bloque solo viajan los nombres de ida y los indices encontrados de
+# vuelta, empaquetados en un array('q') ordenado. El proceso principal solo
+# recorre la entrada y une los resultados parciales: en una lista ordenada o,
+# con as_set=True, en un único SeqIndexSet.
+
+# Matcher de cada proceso, lo crea _init_worker()
+_MATCHER: Optional[SeqMatcher] = None
+
+
+def classify(
+    numerator: NameNumerator,
+    source: Iterable[Any],
+    name: Optional[str],
+    ext: Optional[str],
+    workers: int,
+    chunk_size: int,
+    as_set: bool,
+) -> Union[List[int], SeqIndexSet]:
+    """Implementación de NameNumerator.classify_parallel(), los argumentos ya
+    están validados."""
+    matcher = numerator._matcher(name, ext, stack=4)
+    blocks = _blocks(source, chunk_size)
+
+    if workers == 1:
+        # Sin procesos: mismo resultado y sin coste de arranque
+        shards = [_classify(matcher.index_of, block) for block in blocks]
+    else:
+        shards = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(numerator.settings, matcher.name, matcher.ext),
+        ) as pool:
+            # Como mucho dos bloques en vuelo por proceso, la entrada nunca se
+            # carga entera en memoria
+            pending = deque()
+            for block in blocks:
+                pending.append(pool.submit(_classify_block, block))
+                if len(pending) >= 2 * workers:
+                    shards.append(pending.popleft().result())
+            shards.extend(future.result() for future in pending)
+
+    return _merge_sets(shards) if as_set else _merge_sorted(shards)
+
+
+def _blocks(source: Iterable[Any], chunk_size: int) -> Iterator[List[str]]:
+    """Agrupa los nombres de source en listas de chunk_size. Acepta los mismos
+    elementos que NameNumerator.iter_seqindexes()."""
+    block = []
+    for position, item in enumerate(source):
+        # str es lo habitual así que se comprueba primero y sin llamadas
+        itemname = item if type(item) is str else _entry_name(item)
+        if itemname is None:
+            _raise_invalid_type(
+                f"source (element: {position})", item, (str, os.PathLike), stack=3
+            )
+        block.append(itemname)
+        if len(block) == chunk_size:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def _init_worker(settings: NumeratorSettings, name: str, ext: Optional[str]):
+    global _MATCHER
+    _MATCHER = NameNumerator.from_settings(settings).matcher(name, ext)
+
+
+def _classify_block(block: List[str]) -> Union[array, List[int]]:
+    """Tarea de cada bloque, se ejecuta en los procesos del pool."""
+    return _classify(_MATCHER.index_of, block)
+
+
+def _classify(
+    index_of: Callable[[str], Optional[int]], block: List[str]
+) -> Union[array, List[int]]:
+    """Indices ordenados de los miembros del bloque (array('q') si caben en 64
+    bits, que se serializa como bytes). Ocupa lo mismo con as_set=True: un
+    bitmap por bloque llegaría hasta el mayor indice aunque hubiera pocos."""
+    indexes = [index for index in map(index_of, block) if index is not None]
+    indexes.sort()
+    try:
+        return array("q", indexes)
+    except OverflowError:
+        return indexes
+
+
+def _merge_sorted(shards: List[Union[array, List[int]]]) -> List[int]:
+    """Mezcla de k vías de las secuencias ordenadas. Se concatenan y se ordenan:
+    timsort detecta cada tramo ya ordenado y los va mezclando en C, así que es
+    O(n log k) y mucho más rápido que heapq.merge."""
+    merged = list(chain.from_iterable(shards))
+    merged.sort()
+    return merged
+
+
+def _merge_sets(shards: List[Union[array, List[int]]]) -> SeqIndexSet:
+    """Un solo SeqIndexSet con los indices de todos los bloques. Si el bitmap
+    compensa (con el mismo criterio que SeqIndexSet) se reserva una vez con el
+    tamaño del mayor; si no, los indices se añaden en orden y el conjunto usa
+    tramos, así un indice enorme suelto no reserva memoria proporcional a su
+    valor."""
+    top = max((shard[-1] for shard in shards if len(shard)), default=-1)
+    size = (top >> 3) + 1 if top >= 0 else 0
+    if size > _SPARSE_MIN_BYTES and size > _SPARSE_BYTES_PER_INDEX * sum(
+        map(len, shards)
+    ):
+        indexset = SeqIndexSet()
+        add = indexset._add
+        for index in merge(*shards):
+            add(index)
+        return indexset
+
+    bits = bytearray(size)
+    for shard in shards:
+        for index in shard:
+            bits[index >> 3] |= 1 << (index & 7)
+    return SeqIndexSet._from_bits(bits)
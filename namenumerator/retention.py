@@ -0,0 +1,227 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+from .namenumerator import (
+    NameNumerator,
+    SeqIndexSet,
+    _func_emsg,
+    _hl,
+    _raise_invalid_type,
+    _raise_min,
+)
+from .executor import ExecutionReport, RenameExecutor
+import heapq
+import os
+
+#  INFO: Políticas de retención
+#
+# RetentionPolicy decide qué miembros de una secuencia se conservan y cuáles
+# sobran con reglas del estilo abuelo-padre-hijo: los N más recientes y el
+# más reciente de cada uno de los últimos N días, semanas, meses y años. Todo
+# se resuelve en una sola pasada sobre los indices: cada regla por fecha
+# guarda el mejor candidato de cada periodo en un diccionario y "los N más
+# recientes" es un montículo de tamaño N, así que el coste es O(n log k).
+
+# Periodo de cada regla por fecha a partir de la fecha local del mtime
+_PERIODS: Dict[str, Callable[[datetime], Tuple[int, ...]]] = {
+    "daily": lambda date: (date.year, date.month, date.day),
+    "weekly": lambda date: tuple(date.isocalendar()[:2]),
+    "monthly": lambda date: (date.year, date.month),
+    "yearly": lambda date: (date.year,),
+}
+
+
+class RetentionPlan(NamedTuple):
+    """Resultado de RetentionPolicy.select(), ambas listas ordenadas."""
+
+    keep: List[int]
+    prune: List[int]
+
+
+class RetentionPolicy:
+    """Reglas de retención de una secuencia, cada una opcional:
+
+    last: conserva los `last` más recientes.
+    daily/weekly/monthly/yearly: conserva el más reciente de cada uno de los
+      últimos N días/semanas ISO/meses/años que tienen algún miembro. Necesitan
+      el mtime de cada indice.
+
+    Un miembro se conserva si lo pide cualquiera de las reglas. La antigüedad
+    se mide por mtime si se conoce y si no por el indice: como en
+    plan_rotate(), el indice 0 es el más reciente.
+
+    Ejemplo, 10 copias y además una por día de la última semana y una por mes
+    del último año:
+        policy = RetentionPolicy(last=10, daily=7, monthly=12)
+        plan, report = policy.apply(nd, "/backups", name="light", ext="bak")
+    """
+
+    def __init__(
+        self,
+        *,
+        last: Optional[int] = None,
+        daily: Optional[int] = None,
+        weekly: Optional[int] = None,
+        monthly: Optional[int] = None,
+        yearly: Optional[int] = None,
+    ):
+        rules = {
+            "daily": daily, "weekly": weekly, "monthly": monthly, "yearly": yearly
+        }
+        for vname, value in (("last", last), *rules.items()):
+            if value is not None:
+                _raise_invalid_type(vname, value, (int,))
+                _raise_min(vname, value, 1)
+        if last is None and all(value is None for value in rules.values()):
+            # Sin reglas se eliminaría todo, nunca es lo que se quiere
+            perr = _func_emsg(stack=1)
+            raise ValueError(f"{perr} hace falta al menos una regla.")
+
+        self._last = last
+        self._periods = {name: count for name, count in rules.items() if count}
+
+    #  CAT: Public
+    def select(
+        self,
+        seqindexes: Union[List[int], SeqIndexSet],
+        mtimes: Optional[Mapping[int, float]] = None,
+    ) -> RetentionPlan:
+        """Reparte los indices entre los que se conservan y los que sobran.
+
+        mtimes: {indice: mtime} (segundos, como os.stat), obligatorio si hay
+          reglas por fecha. Los indices repetidos se cuentan una vez.
+        """
+        return self._select(seqindexes, mtimes, stack=2)
+
+    def apply(
+        self,
+        numerator: NameNumerator,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        workers: int = 8,
+    ) -> Tuple[RetentionPlan, ExecutionReport]:
+        """Lista la secuencia en el directorio path, consulta los mtimes si
+        hay reglas por fecha (en paralelo, en un pool de `workers` hilos) y
+        elimina lo que sobra con un RenameExecutor del mismo tamaño, con su
+        journal. Si dos nombres tienen el mismo indice (img_1 e img_01) se
+        conservan o eliminan los dos."""
+        _raise_invalid_type("numerator", numerator, (NameNumerator,))
+        _raise_invalid_type("workers", workers, (int,))
+        _raise_min("workers", workers, 1)
+        seqindexes, entries = numerator.scan_dir(path, name=name, ext=ext)
+
+        mtimes = None
+        if self._periods:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                stats = pool.map(_entry_mtime, entries, chunksize=256)
+                mtimes = dict(zip(seqindexes, stats))
+
+        plan = self._select(seqindexes, mtimes, stack=2)
+        prune = set(plan.prune)
+        deletions = [
+            (entry.name, None)
+            for index, entry in zip(seqindexes, entries)
+            if index in prune
+        ]
+        report = RenameExecutor(path, workers=workers).run(deletions)
+        return plan, report
+
+    @property
+    def last(self) -> Optional[int]:
+        return self._last
+
+    @property
+    def periods(self) -> Dict[str, int]:
+        """Reglas por fecha activas, {"daily": N, ...}."""
+        return dict(self._periods)
+
+    def __repr__(self) -> str:
+        rules = {"last": self._last, **self._periods}
+        args = ", ".join(f"{name}={count}" for name, count in rules.items() if count)
+        return f"RetentionPolicy({args})"
+
+    #  CAT: Private Methods
+    def _select(
+        self,
+        seqindexes: Union[List[int], SeqIndexSet],
+        mtimes: Optional[Mapping[int, float]],
+        *,
+        stack=2,
+    ) -> RetentionPlan:
+        """Implementación de select(), stack apunta a la función pública que
+        la invoca para los mensajes de error."""
+        _raise_invalid_type("seqindexes", seqindexes, (list, SeqIndexSet), stack=stack)
+        if self._periods:
+            if mtimes is None:
+                perr = _func_emsg(stack=stack)
+                raise ValueError(
+                    f"{perr} las reglas '{_hl(', '.join(self._periods))}'"
+                    f" necesitan '{_hl('mtimes')}'."
+                )
+            _raise_invalid_type("mtimes", mtimes, (Mapping,), stack=stack)
+
+        if isinstance(seqindexes, list):
+            _raise_min_elements(seqindexes, stack=stack)
+            indexes = dict.fromkeys(seqindexes)
+        else:
+            indexes = seqindexes
+
+        last = self._last
+        heap: List[Tuple] = []  # los `last` más recientes, el más viejo arriba
+        periods = [
+            (_PERIODS[name], count, {}) for name, count in self._periods.items()
+        ]
+        fromtimestamp = datetime.fromtimestamp
+
+        for index in indexes:
+            # Mayor es más reciente; a igual mtime, el indice más bajo
+            if mtimes is None:
+                recency = (-index,)
+            else:
+                try:
+                    mtime = mtimes[index]
+                except KeyError:
+                    perr = _func_emsg(stack=stack)
+                    raise ValueError(
+                        f"{perr} falta el mtime del indice '{_hl(index)}'."
+                    )
+                recency = (mtime, -index)
+
+            if last is not None:
+                if len(heap) < last:
+                    heapq.heappush(heap, recency)
+                elif recency > heap[0]:
+                    heapq.heapreplace(heap, recency)
+
+            if periods:
+                date = fromtimestamp(mtime)
+                for period, _, best in periods:
+                    key = period(date)
+                    current = best.get(key)
+                    if current is None or recency > current:
+                        best[key] = recency
+
+        # Cada regla por fecha se queda con sus `count` periodos más recientes
+        chosen = heap
+        for _, count, best in periods:
+            chosen += (best[key] for key in heapq.nlargest(count, best))
+
+        keep = sorted({-recency[-1] for recency in chosen})
+        kept = set(keep)
+        prune = sorted(index for index in indexes if index not in kept)
+        return RetentionPlan(keep, prune)
+
+
+def _raise_min_elements(seqindexes: List[int], *, stack=1):
+    """Lanza excepción si algún elemento no es un int >= 0."""
+    for position, index in enumerate(seqindexes):
+        if type(index) is not int or index < 0:
+            vname = f"seqindexes (element: {position})"
+            _raise_invalid_type(vname, index, (int,), stack=stack + 1)
+            _raise_min(vname, index, 0, stack=stack + 1)
+
+
+def _entry_mtime(entry: os.DirEntry) -> float:
+    return entry.stat(follow_symlinks=False).st_mtime
@@ -0,0 +1,200 @@
+from heapq import heapify, heappop, heappush, heapreplace
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from .namenumerator import (
+    NameNumerator,
+    _entry_name,
+    _raise_invalid_names,
+    _raise_invalid_type,
+)
+import os
+
+#  INFO: Seguimiento incremental de una secuencia
+#
+# En lugar de volver a listar el directorio y llamar a get_seqindexes cada vez
+# que hay que decidir el siguiente nombre, SequenceTracker se inicializa una
+# vez con el listado y después se mantiene al día con add()/remove().
+
+# Los heaps se reconstruyen cuando las entradas caducadas superan a las vivas,
+# así no crecen sin límite con añadidos y bajas repetidos del mismo indice
+_REBUILD_MIN = 64
+
+
+class SequenceTracker:
+    """Estado incremental de una secuencia (name, ext) de un NameNumerator.
+
+    Las consultas (next_free, lowest_gap, max_index, is_contiguous) cuestan
+    O(log n) amortizado: el máximo se mantiene en un heap con borrado perezoso
+    y los huecos en un heap de rangos libres [start, stop) que se van
+    recortando según se ocupan. Ambos se reconstruyen cuando acumulan más del
+    doble de entradas caducadas que vivas.
+
+    Ejemplo:
+        tracker = SequenceTracker(nd, os.scandir(path))
+        nuevo = tracker.allocate()  # nombre reservado en memoria
+    """
+
+    def __init__(
+        self,
+        numerator: NameNumerator,
+        names: Iterable[Union[str, "os.PathLike[str]"]] = (),
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+    ):
+        _raise_invalid_type("numerator", numerator, (NameNumerator,))
+        _raise_invalid_names("names", names)
+        self._numerator = numerator
+        self._matcher = numerator.matcher(name, ext)
+
+        self._names: Dict[str, int] = {}  # nombre -> indice
+        self._counts: Dict[int, int] = {}  # indice -> nombres con ese indice
+        self._duplicated = 0  # indices con más de un nombre
+        self._limit = 0  # 1 + indice más alto visto alguna vez
+        self._max_heap: List[int] = []  # -indice
+        self._free: List[Tuple[int, int]] = []  # rangos [start, stop) libres
+
+        for item in names:
+            self.add(item)
+
+    #  CAT: Events
+    def add(self, item: Union[str, "os.PathLike[str]"]) -> Optional[int]:
+        """Registra un nombre nuevo. Retorna su indice o None si no forma parte
+        de la secuencia (o ya estaba registrado)."""
+        itemname = item if type(item) is str else _entry_name(item)
+        if itemname is None:
+            _raise_invalid_type("item", item, (str, os.PathLike))
+
+        index = self._matcher.index_of(itemname)
+        if index is None or itemname in self._names:
+            return None
+        self._names[itemname] = index
+
+        count = self._counts.get(index, 0)
+        self._counts[index] = count + 1
+        if count == 1:
+            self._duplicated += 1
+        elif count == 0:
+            heappush(self._max_heap, -index)
+            if index > self._limit:
+                # Todo lo que hay entre el antiguo máximo y este está libre
+                heappush(self._free, (self._limit, index))
+            self._limit = max(self._limit, index + 1)
+            if len(self._max_heap) > 3 * len(self._counts) + _REBUILD_MIN:
+                self._rebuild_max_heap()
+        return index
+
+    def remove(self, item: Union[str, "os.PathLike[str]"]) -> Optional[int]:
+        """Da de baja un nombre. Retorna el indice que tenía o None si no
+        estaba registrado."""
+        itemname = item if type(item) is str else _entry_name(item)
+        if itemname is None:
+            _raise_invalid_type("item", item, (str, os.PathLike))
+
+        index = self._names.pop(itemname, None)
+        if index is None:
+            return None
+
+        count = self._counts[index]
+        if count == 2:
+            self._duplicated -= 1
+        if count > 1:
+            self._counts[index] = count - 1
+        else:
+            del self._counts[index]
+            heappush(self._free, (index, index + 1))
+            if len(self._free) > 3 * (len(self._counts) + 1) + _REBUILD_MIN:
+                self._rebuild_free()
+        return index
+
+    def allocate(self, fill_gaps: bool = False) -> str:
+        """Registra y retorna el nombre del siguiente indice libre: tras el más
+        alto (next_free) o, con fill_gaps, el hueco más bajo (lowest_gap). No
+        crea nada en disco."""
+        _raise_invalid_type("fill_gaps", fill_gaps, (bool,))
+        index = self.lowest_gap() if fill_gaps else self.next_free()
+        seqname = self._numerator.get_seqname(
+            index, self._matcher.name, self._matcher.ext
+        )
+        self.add(seqname)
+        return seqname
+
+    #  CAT: Queries
+    def max_index(self) -> Optional[int]:
+        """Indice más alto registrado o None si no hay ninguno."""
+        heap = self._max_heap
+        while heap and -heap[0] not in self._counts:
+            heappop(heap)
+        return -heap[0] if heap else None
+
+    def next_free(self) -> int:
+        """Indice siguiente al más alto registrado (0 si no hay ninguno)."""
+        max_index = self.max_index()
+        return 0 if max_index is None else max_index + 1
+
+    def lowest_gap(self) -> int:
+        """Indice libre más bajo, si no hay huecos coincide con next_free()."""
+        free = self._free
+        counts = self._counts
+        while free:
+            start, stop = free[0]
+            # Recorta por delante lo que se ha ocupado desde que se añadió
+            while start < stop and start in counts:
+                start += 1
+            if start < stop:
+                if start != free[0][0]:
+                    heapreplace(free, (start, stop))
+                return start
+            heappop(free)
+        return self.next_free()
+
+    def seqindexes(self) -> List[int]:
+        """Lista ordenada de los indices registrados, con un elemento por
+        nombre como get_seqindexes()."""
+        return sorted(self._names.values())
+
+    def names(self) -> List[str]:
+        """Nombres registrados, sin orden definido."""
+        return list(self._names)
+
+    def is_contiguous(self) -> bool:
+        """True si los indices son exactamente 0..n-1, sin huecos ni
+        duplicados."""
+        return not self._duplicated and self.lowest_gap() == self.next_free()
+
+    #  CAT: Private Methods
+    def _rebuild_max_heap(self):
+        """Rehace el heap del máximo solo con los indices registrados."""
+        self._max_heap = [-index for index in self._counts]
+        heapify(self._max_heap)
+
+    def _rebuild_free(self):
+        """Rehace el heap de rangos libres como el complemento de los indices
+        registrados en [0, _limit). Ordenado ya cumple la propiedad de heap."""
+        free = []
+        start = 0
+        for index in sorted(self._counts):
+            if start < index:
+                free.append((start, index))
+            start = index + 1
+        if start < self._limit:
+            free.append((start, self._limit))
+        self._free = free
+
+    @property
+    def numerator(self) -> NameNumerator:
+        return self._numerator
+
+    @property
+    def name(self) -> str:
+        return self._matcher.name
+
+    @property
+    def ext(self) -> Optional[str]:
+        return self._matcher.ext
+
+    def __len__(self) -> int:
+        """Número de nombres registrados."""
+        return len(self._names)
+
+    def __contains__(self, seqname: object) -> bool:
+        return seqname in self._names
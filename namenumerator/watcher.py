@@ -0,0 +1,327 @@
+from collections import abc
+from typing import (
+    AsyncIterator, Callable, List, NamedTuple, Optional, Tuple, Union
+)
+from .namenumerator import NameNumerator, _raise_invalid_type, _raise_min
+from .tracker import SequenceTracker
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+
+#  INFO: Vigilancia de un directorio
+#
+# SequenceWatcher mantiene al día los miembros de una secuencia dentro de un
+# directorio sin tener que volver a listarlo. En Linux usa inotify (a través de
+# ctypes, sin dependencias) y en el resto de sistemas, o si inotify no está
+# disponible, compara listados cada `poll_interval` segundos.
+
+# Constantes de <sys/inotify.h>
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class MembershipChange(NamedTuple):
+    """Un nombre ha entrado ("added") o salido ("removed") de la secuencia."""
+
+    kind: str
+    name: str
+    index: int
+
+
+class SequenceWatcher:
+    """Vigila el directorio path y mantiene en un SequenceTracker los miembros
+    de la secuencia (name, ext) del numerador.
+
+    Los cambios se entregan llamando a callback(change) desde el hilo del
+    watcher y/o con `async for change in watcher`. Las consultas
+    (seqindexes, next_free, lowest_gap, ...) se pueden hacer desde cualquier
+    hilo.
+
+    use_inotify: None para usar inotify si está disponible, False para forzar
+      el modo polling.
+    """
+
+    def __init__(
+        self,
+        numerator: NameNumerator,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        name: Optional[str] = None,
+        ext: Optional[str] = None,
+        callback: Optional[Callable[[MembershipChange], None]] = None,
+        poll_interval: float = 2.0,
+        use_inotify: Optional[bool] = None,
+    ):
+        _raise_invalid_type("path", path, (str, os.PathLike))
+        _raise_invalid_type("poll_interval", poll_interval, (int, float))
+        _raise_min("poll_interval", poll_interval, 0)
+        if callback is not None:
+            _raise_invalid_type("callback", callback, (abc.Callable,))
+
+        self._path = os.fspath(path)
+        self._tracker = SequenceTracker(numerator, name=name, ext=ext)
+        self._callback = callback
+        self._poll_interval = poll_interval
+        if use_inotify is None:
+            use_inotify = _inotify_available()
+        _raise_invalid_type("use_inotify", use_inotify, (bool,))
+        self._use_inotify = use_inotify
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._finished = False
+        self._thread: Optional[threading.Thread] = None
+        self._subscribers: List[Tuple[asyncio.Queue, asyncio.AbstractEventLoop]] = []
+
+    #  CAT: Lifecycle
+    def start(self) -> "SequenceWatcher":
+        """Hace el listado inicial y empieza a vigilar en un hilo aparte. Lanza
+        FileNotFoundError si el directorio no existe."""
+        if self._thread is not None:
+            return self
+
+        fd = self._inotify_open() if self._use_inotify else None
+        # El listado va después de abrir inotify para no perder nada entre
+        # medias; si un evento repite algo del listado el tracker lo ignora
+        if not self._rescan():
+            if fd is not None:
+                os.close(fd)
+            raise FileNotFoundError(
+                errno.ENOENT, os.strerror(errno.ENOENT), self._path
+            )
+
+        target = self._inotify_loop if fd is not None else self._poll_loop
+        self._thread = threading.Thread(
+            target=target, args=(fd,), name="SequenceWatcher", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Deja de vigilar y espera a que termine el hilo."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._finish()
+
+    def __enter__(self) -> "SequenceWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    async def __aiter__(self) -> AsyncIterator[MembershipChange]:
+        """Entrega los cambios en el bucle de asyncio que itera, hasta stop() o
+        hasta que el directorio desaparece o se mueve."""
+        queue: asyncio.Queue = asyncio.Queue()
+        subscriber = (queue, asyncio.get_running_loop())
+        with self._lock:
+            if self._finished:
+                return
+            self._subscribers.append(subscriber)
+        try:
+            while True:
+                change = await queue.get()
+                if change is None:
+                    return
+                yield change
+        finally:
+            with self._lock:
+                self._subscribers.remove(subscriber)
+
+    #  CAT: Queries
+    def seqindexes(self) -> List[int]:
+        """Lista ordenada de indices actuales, como get_seqindexes()."""
+        with self._lock:
+            return self._tracker.seqindexes()
+
+    def next_free(self) -> int:
+        with self._lock:
+            return self._tracker.next_free()
+
+    def lowest_gap(self) -> int:
+        with self._lock:
+            return self._tracker.lowest_gap()
+
+    def max_index(self) -> Optional[int]:
+        with self._lock:
+            return self._tracker.max_index()
+
+    def is_contiguous(self) -> bool:
+        with self._lock:
+            return self._tracker.is_contiguous()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._use_inotify
+
+    @property
+    def stopped(self) -> bool:
+        """True tras stop() o si el directorio vigilado ha desaparecido o se ha
+        movido."""
+        return self._stop.is_set()
+
+    #  CAT: Private Methods
+    def _added(self, itemname: str):
+        with self._lock:
+            index = self._tracker.add(itemname)
+        if index is not None:
+            self._emit(MembershipChange("added", itemname, index))
+
+    def _removed(self, itemname: str):
+        with self._lock:
+            index = self._tracker.remove(itemname)
+        if index is not None:
+            self._emit(MembershipChange("removed", itemname, index))
+
+    def _emit(self, change: MembershipChange):
+        if self._callback is not None:
+            self._callback(change)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for queue, loop in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, change)
+
+    def _finish(self):
+        """Fin de la vigilancia, por stop() o desde el hilo: entrega a cada
+        suscriptor la marca de fin (None) una sola vez."""
+        self._stop.set()
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+            subscribers = list(self._subscribers)
+        for queue, loop in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    def _rescan(self) -> bool:
+        """Compara el directorio con el estado actual y emite las diferencias.
+        Se usa al empezar, en cada ciclo de polling y si inotify desborda.
+        Retorna False si el directorio ya no existe (sus miembros se dan de
+        baja)."""
+        exists = True
+        try:
+            with os.scandir(self._path) as entries:
+                current = {entry.name for entry in entries}
+        except FileNotFoundError:
+            current = set()
+            exists = False
+
+        with self._lock:
+            known = set(self._tracker.names())
+        for itemname in known - current:
+            self._removed(itemname)
+        for itemname in current - known:
+            self._added(itemname)
+        return exists
+
+    def _poll_loop(self, _fd: None):
+        while not self._stop.wait(self._poll_interval):
+            if not self._rescan():
+                # Igual que con inotify, el directorio ha desaparecido
+                self._finish()
+                break
+
+    def _inotify_open(self) -> Optional[int]:
+        """Abre inotify sobre el directorio o retorna None y pasa a polling."""
+        try:
+            fd = _LIBC.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1")
+            wd = _LIBC.inotify_add_watch(fd, os.fsencode(self._path), _WATCH_MASK)
+            if wd < 0:
+                os.close(fd)
+                raise OSError(ctypes.get_errno(), "inotify_add_watch")
+        except OSError:
+            self._use_inotify = False
+            return None
+        return fd
+
+    def _inotify_loop(self, fd: int):
+        # select con timeout para poder comprobar stop() de vez en cuando
+        timeout = min(self._poll_interval, 0.5) or 0.5
+        try:
+            while not self._stop.is_set():
+                readable, _, _ = select.select([fd], [], [], timeout)
+                if not readable:
+                    continue
+                try:
+                    data = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                if self._handle_events(data):
+                    # El directorio ha desaparecido o se ha movido: se termina
+                    # igual que con stop() para que los suscriptores lo vean
+                    self._finish()
+                    break
+        finally:
+            os.close(fd)
+
+    def _handle_events(self, data: bytes) -> bool:
+        """Procesa un bloque de eventos. Retorna True si hay que dejar de
+        vigilar."""
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                self._rescan()
+            elif mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                self._rescan()
+                return True
+            elif mask & (IN_CREATE | IN_MOVED_TO):
+                self._added(os.fsdecode(raw))
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                self._removed(os.fsdecode(raw))
+        return False
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    """Carga libc con las funciones de inotify o retorna None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libname = ctypes.util.find_library("c") or "libc.so.6"
+        libc = ctypes.CDLL(libname, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32
+        ]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+_LIBC = _load_libc()
+
+
+def _inotify_available() -> bool:
+    return _LIBC is not None
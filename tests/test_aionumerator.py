@@ -0,0 +1,130 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from namenumerator import AsyncNameNumerator, NameNumerator
+
+
+@pytest.fixture
+def nd():
+    return NameNumerator(def_name="img", def_ext="png")
+
+
+def make(directory, *itemnames):
+    for itemname in itemnames:
+        open(os.path.join(directory, itemname), "w").close()
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_scan_and_iter(tmp_path, nd):
+    make(tmp_path, "img.png", "img_2.png", "other.txt")
+
+    async def main():
+        async with AsyncNameNumerator(nd) as anum:
+            seqindexes, entries = await anum.scan_dir(tmp_path)
+            stream = anum.iter_seqindexes(tmp_path, chunk_size=1)
+            pairs = [pair async for pair in stream]
+            return seqindexes, entries, pairs
+
+    seqindexes, entries, pairs = run(main())
+    assert seqindexes == [0, 2]
+    assert len(entries) == 2
+    assert sorted(pairs) == [(0, "img.png"), (2, "img_2.png")]
+
+
+def test_scan_many_and_rotate_many(tmp_path, nd):
+    paths = []
+    for number in range(3):
+        directory = tmp_path / str(number)
+        directory.mkdir()
+        make(directory, "img.png", "img_1.png", "img_2.png")
+        paths.append(directory)
+
+    async def main():
+        async with AsyncNameNumerator(nd, concurrency=2) as anum:
+            reports = await anum.rotate_many(paths, keep=3)
+            return reports, await anum.scan_many(paths)
+
+    reports, scanned = run(main())
+    assert [report.renamed for report in reports.values()] == [2, 2, 2]
+    assert [report.deleted for report in reports.values()] == [1, 1, 1]
+    assert scanned == {os.fspath(path): [1, 2] for path in paths}
+
+
+def test_reserve_unique(tmp_path, nd):
+    async def main():
+        async with AsyncNameNumerator(nd, max_workers=4) as anum:
+            return await asyncio.gather(*(anum.reserve(tmp_path) for _ in range(20)))
+
+    indexes = [index for index, _ in run(main())]
+    assert sorted(indexes) == list(range(20))
+
+
+def test_calls_do_not_block_the_loop(tmp_path, nd, monkeypatch):
+    threads = []
+
+    def slow_scan_dir(*args, **kwargs):
+        threads.append(threading.get_ident())
+        time.sleep(0.3)
+        return [], []
+
+    monkeypatch.setattr(nd, "scan_dir", slow_scan_dir)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        async with AsyncNameNumerator(nd) as anum:
+            await anum.scan_many([tmp_path] * 4)
+        task.cancel()
+        return ticks
+
+    ticks = run(main())
+    # Los cuatro listados van en paralelo fuera del hilo del bucle
+    assert ticks >= 10
+    assert threading.get_ident() not in threads
+    assert len(threads) == 4
+
+
+def test_concurrency_limit(tmp_path, nd, monkeypatch):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_scan_dir(*args, **kwargs):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return [], []
+
+    monkeypatch.setattr(nd, "scan_dir", slow_scan_dir)
+
+    async def main():
+        async with AsyncNameNumerator(nd, max_workers=8, concurrency=2) as anum:
+            await anum.scan_many([tmp_path] * 6)
+
+    run(main())
+    assert peak == 2
+
+
+def test_invalid_arguments(nd):
+    with pytest.raises(ValueError, match="concurrency"):
+        AsyncNameNumerator(nd, concurrency=0)
+    with pytest.raises(ValueError, match="numerator"):
+        AsyncNameNumerator("img")
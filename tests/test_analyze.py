@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from namenumerator import NameNumerator, SeqIndexSet
+
+
+def naive(seqindexes):
+    size = len(seqindexes)
+    missing = [index for index in range(size) if index not in seqindexes]
+    duplicates = {
+        index: seqindexes.count(index)
+        for index in set(seqindexes)
+        if seqindexes.count(index) > 1
+    }
+    return missing, duplicates
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_naive_computation(seed):
+    rng = random.Random(seed)
+    seqindexes = sorted(rng.randrange(30) for _ in range(rng.randrange(25)))
+    missing, duplicates = naive(seqindexes)
+
+    report = NameNumerator.analyze(seqindexes)
+    assert report.count == len(seqindexes)
+    assert report.missing == missing
+    assert report.duplicates == duplicates
+    assert report.max_index == (max(seqindexes) if seqindexes else None)
+    assert report.contiguous == (not missing)
+
+    assert NameNumerator.get_missings(seqindexes) == missing
+    assert NameNumerator.get_duplicates(seqindexes) == duplicates
+    assert NameNumerator.any_duplicated(seqindexes) == bool(duplicates)
+    if duplicates:
+        assert report.adjust is None
+        with pytest.raises(ValueError, match="adjust_broken"):
+            NameNumerator.adjust_broken(seqindexes)
+    else:
+        adjust = NameNumerator.adjust_broken(seqindexes)
+        assert adjust == {old: new for new, old in enumerate(seqindexes)}
+
+
+def test_set_input():
+    indexset = SeqIndexSet([0, 2, 3, 9])
+    report = NameNumerator.analyze(indexset)
+    assert report.count == 4
+    assert isinstance(report.missing, SeqIndexSet)
+    assert report.missing.to_list() == [1]
+    assert report.duplicates == {}
+    assert report.max_index == 9
+    assert dict(report.adjust.items()) == {0: 0, 2: 1, 3: 2, 9: 3}
+    assert NameNumerator.get_missings(indexset).to_list() == [1]
+
+
+def test_large_sequence_is_linear():
+    # Con la versión cuadrática esto tardaba segundos
+    seqindexes = list(range(200_000))
+    del seqindexes[1000]
+    report = NameNumerator.analyze(seqindexes)
+    assert report.missing == [1000]
+    assert not report.contiguous
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError, match="analyze"):
+        NameNumerator.analyze((0, 1))
+    with pytest.raises(ValueError, match="get_missings"):
+        NameNumerator.get_missings(["0"])
@@ -0,0 +1,80 @@
+import pytest
+
+from namenumerator import NameNumerator
+
+
+@pytest.fixture
+def nd():
+    nd = NameNumerator(def_name="img", def_ext="png")
+    nd.enable_cache(maxsize=4)
+    return nd
+
+
+def test_forward_hits_and_eviction(nd):
+    assert nd.get_seqname(1) == "img_1.png"
+    assert nd.get_seqname(1) == "img_1.png"
+    for index in range(2, 6):
+        nd.get_seqname(index)
+    forward = nd.cache_info().forward
+    assert (forward.hits, forward.misses, forward.size) == (1, 5, 4)
+    assert forward.hit_rate == pytest.approx(1 / 6)
+
+    # El 1 es el más antiguo y ya no está
+    nd.get_seqname(1)
+    assert nd.cache_info().forward.misses == 6
+
+
+def test_reverse_shared(nd):
+    assert nd.seqname_to_index("img_3.png") == 3
+    assert nd.is_seqname("img_3.png")
+    assert not nd.is_seqname("other.png")
+    assert nd.seqname_to_index("other.png") is None
+    reverse = nd.cache_info().reverse
+    assert (reverse.hits, reverse.misses) == (2, 2)
+
+
+def test_def_name_and_def_ext_invalidate(nd):
+    assert nd.get_seqname(2) == "img_2.png"
+    assert nd.seqname_to_index("img_2.png") == 2
+
+    nd.def_name = "photo"
+    assert nd.get_seqname(2) == "photo_2.png"
+    assert nd.seqname_to_index("img_2.png") is None
+    nd.def_ext = "jpg"
+    assert nd.get_seqname(2) == "photo_2.jpg"
+    assert nd.is_seqname("photo_2.jpg")
+    assert not nd.is_seqname("photo_2.png")
+    assert nd.cache_info().forward.hits == 0
+
+
+def test_errors_are_not_cached(nd):
+    for _ in range(2):
+        with pytest.raises(ValueError, match=r"get_seqname\(\)"):
+            nd.get_seqname(-1)
+        with pytest.raises(ValueError, match=r"get_seqname\(\)"):
+            nd.get_seqname(1.0)
+        with pytest.raises(ValueError, match=r"seqname_to_index\(\)"):
+            nd.seqname_to_index(["img.png"])
+    assert nd.cache_info().forward.size == 0
+
+
+def test_enable_again_resets_and_disable(nd):
+    nd.get_seqname(1)
+    nd.enable_cache(maxsize=8)
+    info = nd.cache_info()
+    assert (info.forward.misses, info.forward.maxsize) == (0, 8)
+
+    nd.disable_cache()
+    assert not nd.cache_info().enabled
+    assert "get_seqname" not in vars(nd)
+    assert nd.get_seqname(1) == "img_1.png"
+    with pytest.raises(ValueError, match="maxsize"):
+        nd.enable_cache(maxsize=0)
+
+
+def test_stats_count_cached_calls(nd):
+    nd.enable_stats()
+    nd.get_seqname(1)
+    nd.get_seqname(1)
+    assert nd.stats().methods["get_seqname"].calls == 2
+    assert nd.cache_info().forward.hits == 1
@@ -0,0 +1,106 @@
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from namenumerator import cli
+
+
+def run(monkeypatch, argv, data=b""):
+    """Ejecuta main() con data en stdin y retorna (código, stdout)."""
+    stdout = io.BytesIO()
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+    monkeypatch.setattr(sys, "stdout", io.TextIOWrapper(stdout))
+    code = cli.main(argv)
+    sys.stdout.flush()
+    return code, stdout.getvalue()
+
+
+NAMES = b"light.bak\nsub/light_1.bak\nlight_4.bak\nlight_01.bak\nother.txt\n"
+COMMON = ["--name", "light", "--ext", "bak"]
+
+
+def test_index(monkeypatch):
+    code, output = run(monkeypatch, ["index", *COMMON], NAMES)
+    assert code == 0
+    assert output == (
+        b"0\tlight.bak\n1\tsub/light_1.bak\n4\tlight_4.bak\n1\tlight_01.bak\n"
+    )
+
+
+def test_gaps(monkeypatch):
+    assert run(monkeypatch, ["gaps", *COMMON], NAMES) == (
+        0, b"light_2.bak\nlight_3.bak\n"
+    )
+    assert run(monkeypatch, ["gaps", *COMMON, "--indexes"], NAMES) == (0, b"2\n3\n")
+
+
+def test_dups(monkeypatch):
+    assert run(monkeypatch, ["dups", *COMMON], NAMES) == (0, b"1\t2\n")
+
+
+def test_next(monkeypatch):
+    assert run(monkeypatch, ["next", *COMMON], NAMES) == (0, b"light_5.bak\n")
+    assert run(monkeypatch, ["next", *COMMON, "--fill-gaps", "--indexes"], NAMES) == (
+        0, b"2\n"
+    )
+    assert run(monkeypatch, ["next", *COMMON]) == (0, b"light.bak\n")
+
+
+def test_names_null_delimited(monkeypatch):
+    assert run(monkeypatch, ["names", *COMMON, "-0", "1", "3"]) == (
+        0, b"light_1.bak\0light_2.bak\0"
+    )
+
+
+def test_rotate(monkeypatch):
+    assert run(monkeypatch, ["rotate", *COMMON, "--keep", "3"], NAMES) == (
+        0, b"light_4.bak\t\nlight_1.bak\tlight_2.bak\nlight.bak\tlight_1.bak\n"
+    )
+
+
+def test_rotate_apply(monkeypatch, tmp_path):
+    for itemname in ("light.bak", "light_1.bak"):
+        open(tmp_path / itemname, "w").close()
+    code, output = run(monkeypatch, ["rotate", *COMMON, "--apply", str(tmp_path)])
+    assert (code, output) == (0, b"")
+    assert sorted(os.listdir(tmp_path)) == ["light_1.bak", "light_2.bak"]
+
+
+def test_invalid_settings(monkeypatch, capsys):
+    code, _ = run(monkeypatch, ["next", "--name", "light", "--separator", "1"])
+    assert code == 1
+    assert "separator" in capsys.readouterr().err
+
+
+def test_chunk_boundaries(monkeypatch):
+    # Nombres partidos entre bloques de lectura
+    monkeypatch.setattr(cli, "CHUNK_SIZE", 7)
+    data = b"".join(b"light_%d.bak\n" % index for index in range(50))
+    assert run(monkeypatch, ["next", *COMMON], data) == (0, b"light_50.bak\n")
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="RLIMIT_AS solo en Linux")
+@pytest.mark.parametrize(
+    "command", [["next"], ["next", "--fill-gaps"], ["dups"], ["rotate"]]
+)
+def test_sparse_index_memory(command):
+    # Un indice enorme suelto no puede reservar memoria proporcional a su valor
+    import resource
+
+    def limit():
+        resource.setrlimit(resource.RLIMIT_AS, (512 << 20, 512 << 20))
+
+    data = b"light.bak\nlight_99999999999999.bak\nlight_99999999999999.bak\n"
+    result = subprocess.run(
+        [sys.executable, "-m", "namenumerator", *command, *COMMON],
+        input=data,
+        capture_output=True,
+        preexec_fn=limit,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout
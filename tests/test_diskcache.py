@@ -0,0 +1,211 @@
+import os
+import time
+
+import pytest
+
+from namenumerator import NameNumerator
+from namenumerator import diskcache
+
+
+@pytest.fixture
+def nd():
+    return NameNumerator(def_name="img", def_ext="png")
+
+
+@pytest.fixture
+def listings(monkeypatch):
+    """Cuenta los listados completos que hace la cache."""
+    calls = []
+    listing = diskcache._listing
+
+    def counting(directory):
+        calls.append(directory)
+        return listing(directory)
+
+    monkeypatch.setattr(diskcache, "_listing", counting)
+    return calls
+
+
+def touch(directory, itemname):
+    open(os.path.join(directory, itemname), "w").close()
+
+
+def fill(directory, nd, indexes):
+    for index in indexes:
+        touch(directory, nd.get_seqname(index))
+
+
+def prepare(directory):
+    """Crea el subdirectorio de la cache, que cambia el mtime del directorio
+    solo la primera vez."""
+    os.mkdir(os.path.join(directory, diskcache.CACHE_DIRNAME))
+
+
+def settle(directory):
+    """Lleva el mtime del directorio al pasado, como si llevara un rato sin
+    cambiar."""
+    past = time.time_ns() - 10_000_000_000
+    os.utime(directory, ns=(past, past))
+
+
+def cache_path(directory):
+    return os.path.join(directory, diskcache.CACHE_DIRNAME, diskcache.CACHE_FILENAME)
+
+
+def stamp(directory):
+    with open(cache_path(directory), "rb") as stream:
+        return diskcache._HEADER.unpack_from(stream.read())[2]
+
+
+def test_second_scan_uses_cache(tmp_path, nd, listings):
+    fill(tmp_path, nd, [0, 1, 2])
+    touch(tmp_path, "other.txt")
+    prepare(tmp_path)
+    settle(tmp_path)
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1, 2]
+    assert len(listings) == 1
+
+    del listings[:]
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1, 2]
+    # Otra secuencia sale del listado guardado
+    assert nd.scan_dir_cached(tmp_path, name="other", ext="txt").to_list() == [0]
+    assert listings == []
+
+
+def test_change_is_applied_with_one_listing(tmp_path, nd, listings):
+    fill(tmp_path, nd, [0, 1])
+    touch(tmp_path, "other_1.txt")
+    prepare(tmp_path)
+    settle(tmp_path)
+    nd.scan_dir_cached(tmp_path)
+    nd.scan_dir_cached(tmp_path, name="other", ext="txt")
+
+    fill(tmp_path, nd, [5])
+    touch(tmp_path, "other_2.txt")
+    os.remove(os.path.join(tmp_path, nd.get_seqname(0)))
+    settle(tmp_path)
+    del listings[:]
+    assert nd.scan_dir_cached(tmp_path).to_list() == [1, 5]
+    assert len(listings) == 1
+
+    # La otra secuencia también se ha puesto al día sin volver a listar
+    del listings[:]
+    assert nd.scan_dir_cached(tmp_path, name="other", ext="txt").to_list() == [1, 2]
+    assert listings == []
+
+
+def test_removed_duplicate_keeps_index(tmp_path, nd):
+    touch(tmp_path, "img_1.png")
+    touch(tmp_path, "img_01.png")
+    settle(tmp_path)
+    assert nd.scan_dir_cached(tmp_path).to_list() == [1]
+    os.remove(os.path.join(tmp_path, "img_01.png"))
+    assert nd.scan_dir_cached(tmp_path).to_list() == [1]
+    os.remove(os.path.join(tmp_path, "img_1.png"))
+    assert nd.scan_dir_cached(tmp_path).to_list() == []
+
+
+def test_recent_change_is_not_stamped(tmp_path, nd, listings, monkeypatch):
+    def no_sleep(seconds):
+        raise AssertionError("la cache no debe esperar")
+
+    monkeypatch.setattr(time, "sleep", no_sleep)
+    fill(tmp_path, nd, [0, 1])
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1]
+    # El mtime es de este mismo tick: otro cambio ahora no lo cambiaría
+    assert stamp(tmp_path) == 0
+
+    settle(tmp_path)
+    del listings[:]
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1]
+    assert len(listings) == 1
+    assert stamp(tmp_path) == os.stat(tmp_path).st_mtime_ns
+
+
+def test_file_created_during_listing(tmp_path, nd, monkeypatch):
+    fill(tmp_path, nd, [0, 1, 2])
+    settle(tmp_path)
+    listing = diskcache._listing
+
+    def racing_listing(directory):
+        result = listing(directory)
+        # Otro proceso crea un miembro justo después de listar
+        fill(tmp_path, nd, [7])
+        return result
+
+    monkeypatch.setattr(diskcache, "_listing", racing_listing)
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1, 2]
+    monkeypatch.setattr(diskcache, "_listing", listing)
+    assert stamp(tmp_path) == 0
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1, 2, 7]
+
+
+def test_file_created_after_store(tmp_path, nd, monkeypatch):
+    fill(tmp_path, nd, [0, 1, 2])
+    settle(tmp_path)
+    replace = os.replace
+
+    def racing_replace(src, dst):
+        replace(src, dst)
+        if dst == cache_path(tmp_path):
+            fill(tmp_path, nd, [7])
+
+    monkeypatch.setattr(os, "replace", racing_replace)
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1, 2]
+    monkeypatch.setattr(os, "replace", replace)
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1, 2, 7]
+
+
+def test_sequences_and_kinds_are_separate(tmp_path, nd):
+    fill(tmp_path, nd, [0, 3])
+    os.mkdir(os.path.join(tmp_path, nd.get_seqname(1)))
+    touch(tmp_path, "other_1.txt")
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1, 3]
+    assert nd.scan_dir_cached(tmp_path, kind="file").to_list() == [0, 3]
+    assert nd.scan_dir_cached(tmp_path, kind="dir").to_list() == [1]
+    assert nd.scan_dir_cached(tmp_path, name="other", ext="txt").to_list() == [1]
+
+
+def test_corrupt_cache_is_ignored(tmp_path, nd):
+    fill(tmp_path, nd, [0, 1])
+    settle(tmp_path)
+    nd.scan_dir_cached(tmp_path)
+    with open(cache_path(tmp_path), "ab") as stream:
+        stream.write(b"basura")
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1]
+
+
+def test_first_scan_is_stamped_on_the_next(tmp_path, nd, listings):
+    fill(tmp_path, nd, [0, 1])
+    settle(tmp_path)
+    nd.scan_dir_cached(tmp_path)
+    # Crear el subdirectorio de la cache ha cambiado el mtime ahora mismo
+    assert stamp(tmp_path) == 0
+    settle(tmp_path)
+    nd.scan_dir_cached(tmp_path)
+    del listings[:]
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1]
+    assert listings == []
+
+
+def test_old_cache_file_is_replaced(tmp_path, nd):
+    fill(tmp_path, nd, [0, 1])
+    with open(os.path.join(tmp_path, diskcache.CACHE_DIRNAME), "wb") as stream:
+        stream.write(b"NNC\x03")
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1]
+    assert os.path.isfile(cache_path(tmp_path))
+
+
+def test_invalid_kind(tmp_path, nd):
+    with pytest.raises(ValueError):
+        nd.scan_dir_cached(tmp_path, kind="link")
+
+
+def test_sparse_sequence_round_trip(tmp_path, nd, listings):
+    fill(tmp_path, nd, [0, 1, 99_999_999_999_999])
+    prepare(tmp_path)
+    settle(tmp_path)
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1, 99_999_999_999_999]
+    del listings[:]
+    assert nd.scan_dir_cached(tmp_path).to_list() == [0, 1, 99_999_999_999_999]
+    assert listings == []
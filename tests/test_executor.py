@@ -0,0 +1,170 @@
+import os
+
+import pytest
+
+from namenumerator import RenameError, RenameExecutor
+from namenumerator import executor
+
+
+class Killed(BaseException):
+    """Simula que el proceso muere a mitad de la ejecución."""
+
+
+def make(directory, *itemnames):
+    for itemname in itemnames:
+        with open(os.path.join(directory, itemname), "w") as stream:
+            stream.write(itemname)
+
+
+def contents(directory):
+    """{nombre: contenido} de los ficheros, sin el journal."""
+    result = {}
+    for itemname in os.listdir(directory):
+        if itemname != executor.JOURNAL_NAME:
+            with open(os.path.join(directory, itemname)) as stream:
+                result[itemname] = stream.read()
+    return result
+
+
+@pytest.fixture
+def kill_after(monkeypatch):
+    """Hace que el proceso "muera" tras `count` renombrados. Con
+    after_rename=True muere justo después del último, antes de anotarlo en el
+    journal."""
+
+    def install(count, after_rename=False):
+        rename = os.rename
+        calls = []
+
+        def dying_rename(src, dst):
+            if len(calls) == count:
+                if after_rename:
+                    rename(src, dst)
+                raise Killed()
+            calls.append((src, dst))
+            rename(src, dst)
+
+        monkeypatch.setattr(executor.os, "rename", dying_rename)
+        return lambda: monkeypatch.setattr(executor.os, "rename", rename)
+
+    return install
+
+
+# a_1 -> a_2 -> a_3 es una cadena, x <-> y es un ciclo
+PLAN = [("a_2", "a_3"), ("a_1", "a_2"), ("x", "y"), ("y", "x"), ("old", None)]
+FILES = ("a_1", "a_2", "x", "y", "old")
+FINAL = {"a_2": "a_1", "a_3": "a_2", "x": "y", "y": "x"}
+
+
+def test_run(tmp_path):
+    make(tmp_path, *FILES)
+    report = RenameExecutor(tmp_path, workers=2).run(list(PLAN))
+    assert contents(tmp_path) == FINAL
+    assert (report.renamed, report.deleted) == (5, 1)
+    assert not RenameExecutor(tmp_path).pending()
+
+
+def test_cycle_uses_temporary_name():
+    chains = executor._plan_chains([("x", "y"), ("y", "z"), ("z", "x")])
+    assert len(chains) == 1
+    (chain,) = chains
+    temporary = chain[0][1]
+    assert temporary.endswith(".namenumerator-tmp")
+    assert chain[-1][0] == temporary
+    assert sorted(src for src, _ in chain if src != temporary) == ["x", "y", "z"]
+
+
+@pytest.mark.parametrize("count", range(5))
+@pytest.mark.parametrize("after_rename", [False, True])
+def test_resume_after_kill(tmp_path, kill_after, count, after_rename):
+    make(tmp_path, *FILES)
+    restore = kill_after(count, after_rename)
+    renamer = RenameExecutor(tmp_path, workers=1)
+    with pytest.raises(Killed):
+        renamer.run(list(PLAN))
+    restore()
+
+    assert renamer.pending()
+    with pytest.raises(RenameError):
+        renamer.run(list(PLAN))
+    renamer.resume()
+    assert contents(tmp_path) == FINAL
+    assert not renamer.pending()
+
+
+@pytest.mark.parametrize("count", range(5))
+@pytest.mark.parametrize("after_rename", [False, True])
+def test_rollback_after_kill(tmp_path, kill_after, count, after_rename):
+    make(tmp_path, *FILES)
+    restore = kill_after(count, after_rename)
+    renamer = RenameExecutor(tmp_path, workers=1)
+    with pytest.raises(Killed):
+        renamer.run(list(PLAN))
+    restore()
+
+    renamer.rollback()
+    remaining = contents(tmp_path)
+    # La eliminación no se deshace, todo lo demás vuelve a su sitio
+    remaining.pop("old", None)
+    assert remaining == {itemname: itemname for itemname in FILES if itemname != "old"}
+    assert not renamer.pending()
+
+
+def test_rollback_unrecorded_rename(tmp_path, kill_after):
+    # Muere tras el segundo renombrado sin anotarlo, a_2 no puede quedar vacío
+    make(tmp_path, "a_1", "a_2", "a_3")
+    restore = kill_after(1, after_rename=True)
+    renamer = RenameExecutor(tmp_path, workers=1)
+    with pytest.raises(Killed):
+        renamer.run([("a_3", "a_4"), ("a_2", "a_3"), ("a_1", "a_2")])
+    restore()
+    assert sorted(contents(tmp_path)) == ["a_1", "a_3", "a_4"]
+
+    report = renamer.rollback()
+    assert report.renamed == 2
+    assert contents(tmp_path) == {"a_1": "a_1", "a_2": "a_2", "a_3": "a_3"}
+    assert not renamer.pending()
+
+
+def test_rollback_keeps_journal_on_error(tmp_path, kill_after):
+    make(tmp_path, "a_1", "a_2", "b")
+    restore = kill_after(2)
+    renamer = RenameExecutor(tmp_path, workers=1)
+    with pytest.raises(Killed):
+        renamer.run([("a_2", "a_3"), ("a_1", "a_2"), ("b", "c")])
+    restore()
+    os.remove(tmp_path / "a_3")
+
+    with pytest.raises(RenameError, match="rollback"):
+        renamer.rollback()
+    assert renamer.pending()
+    # Se ha deshecho lo que se podía
+    assert contents(tmp_path) == {"a_1": "a_1", "b": "b"}
+
+
+def test_rollback_inside_cycle(tmp_path, kill_after):
+    # Muere justo después de mover x al nombre temporal
+    make(tmp_path, "x", "y")
+    restore = kill_after(1)
+    renamer = RenameExecutor(tmp_path, workers=1)
+    with pytest.raises(Killed):
+        renamer.run([("x", "y"), ("y", "x")])
+    restore()
+    assert any(name.endswith(".namenumerator-tmp") for name in os.listdir(tmp_path))
+
+    renamer.rollback()
+    assert contents(tmp_path) == {"x": "x", "y": "y"}
+
+
+@pytest.mark.parametrize("method", ["resume", "rollback"])
+def test_without_journal(tmp_path, method):
+    renamer = RenameExecutor(tmp_path)
+    with pytest.raises(RenameError, match=method):
+        getattr(renamer, method)()
+
+
+def test_invalid_plan(tmp_path):
+    with pytest.raises(ValueError):
+        RenameExecutor(tmp_path).run([("a", "b"), ("c", "b")])
+    with pytest.raises(ValueError):
+        RenameExecutor(tmp_path).run([("a", "a")])
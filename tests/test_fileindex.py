@@ -0,0 +1,74 @@
+import os
+import random
+
+import pytest
+
+from namenumerator import NameNumerator
+
+SETTINGS = [
+    {},
+    {"enumerate_first": True},
+    {"from_zero": True},
+    {"enumerate_first": True, "from_zero": True, "min_numlen": 3},
+    {"separator": "-"},
+]
+
+
+def candidates(nd, rng, ext):
+    """Nombres mezclados: miembros, casi miembros y rutas."""
+    names = []
+    for _ in range(300):
+        index = rng.randrange(40)
+        seqname = nd.get_seqname(index, "light", ext)
+        names.append(
+            rng.choice(
+                [
+                    seqname,
+                    "sub/dir/" + seqname,
+                    "x" + seqname,
+                    seqname + ".old",
+                    seqname.replace("light", "light.light"),
+                    f"light_0{index}" + ("" if ext is None else f".{ext}"),
+                    "light" + ("" if ext is None else f".{ext}"),
+                    "other.txt",
+                ]
+            )
+        )
+    return names
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+@pytest.mark.parametrize("ext", ["bak", None])
+@pytest.mark.parametrize("delimiter", [b"\n", b"\0"])
+def test_matches_get_seqindexes(tmp_path, settings, ext, delimiter):
+    nd = NameNumerator(**settings)
+    names = candidates(nd, random.Random(len(settings)), ext)
+    listing = tmp_path / "listing"
+    listing.write_bytes(delimiter.join(map(os.fsencode, names)))
+
+    basenames = [itemname.rsplit("/", 1)[-1] for itemname in names]
+    expected = nd.get_seqindexes(basenames, name="light", ext=ext)
+    result = nd.index_file(listing, name="light", ext=ext, delimiter=delimiter)
+    assert result == expected
+    indexset = nd.index_file(
+        listing, name="light", ext=ext, delimiter=delimiter, as_set=True
+    )
+    assert indexset.to_list() == sorted(set(expected))
+
+
+def test_empty_and_no_members(tmp_path):
+    nd = NameNumerator(def_name="light", def_ext="bak")
+    listing = tmp_path / "listing"
+    listing.write_bytes(b"")
+    assert nd.index_file(listing) == []
+    assert len(nd.index_file(listing, as_set=True)) == 0
+    listing.write_bytes(b"other.txt\nlight.txt\n")
+    assert nd.index_file(listing) == []
+
+
+def test_invalid_arguments(tmp_path):
+    nd = NameNumerator(def_name="light")
+    with pytest.raises(ValueError, match="delimiter"):
+        nd.index_file(tmp_path / "listing", delimiter=b",")
+    with pytest.raises(FileNotFoundError):
+        nd.index_file(tmp_path / "missing")
@@ -0,0 +1,84 @@
+"""Control del coste de "import namenumerator" con python -X importtime.
+
+Lanza varios intérpretes nuevos, toma el mejor tiempo acumulado del paquete y
+falla si supera el presupuesto, si el import escribe algo en stdout o si carga
+alguno de los módulos pesados que solo deben importarse bajo demanda.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+BUDGET_MS = 35.0
+REPEAT = 7
+
+# Módulos que "import namenumerator" no debe cargar
+FORBIDDEN = (
+    "argparse",
+    "asyncio",
+    "concurrent.futures",
+    "ctypes",
+    "inspect",
+    "json",
+    "namenumerator.colors",
+    "shutil",
+    "threading",
+)
+
+CODE = f"""
+import sys
+import namenumerator
+loaded = [name for name in {FORBIDDEN!r} if name in sys.modules]
+sys.stderr.write("forbidden: " + ",".join(loaded) + "\\n")
+"""
+
+
+def measure() -> tuple:
+    """Retorna (microsegundos acumulados, stdout, módulos prohibidos)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CODE],
+        cwd=ROOT,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = None
+    forbidden = []
+    for line in result.stderr.splitlines():
+        if line.startswith("forbidden: "):
+            forbidden = [name for name in line[11:].split(",") if name]
+        elif line.startswith("import time:") and line.endswith("| namenumerator"):
+            cumulative = int(line.split("|")[1])
+    return cumulative, result.stdout, forbidden
+
+
+@pytest.fixture(scope="module")
+def runs():
+    # La primera ejecución escribe los .pyc, no se cuenta
+    measure()
+    return [measure() for _ in range(REPEAT)]
+
+
+def test_import_budget(runs):
+    best_ms = min(cumulative for cumulative, _, _ in runs) / 1000
+    assert best_ms <= BUDGET_MS, f"import namenumerator: {best_ms:.2f} ms"
+
+
+def test_import_is_silent(runs):
+    assert all(stdout == "" for _, stdout, _ in runs)
+
+
+def test_import_is_lazy(runs):
+    assert all(forbidden == [] for _, _, forbidden in runs)
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    # Sin .pyc se mediría la compilación del código fuente
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
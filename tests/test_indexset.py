@@ -0,0 +1,132 @@
+import pickle
+import random
+import tracemalloc
+
+import pytest
+
+from namenumerator import NameNumerator, SeqIndexSet
+
+
+def is_sparse(indexset):
+    return indexset._bits is None
+
+
+def test_set_operations():
+    indexset = SeqIndexSet([5, 0, 1, 5, 3])
+    assert len(indexset) == 4
+    assert indexset.to_list() == [0, 1, 3, 5]
+    assert 3 in indexset and 2 not in indexset
+    assert -1 not in indexset and "3" not in indexset
+
+    indexset.add(2)
+    indexset.discard(5)
+    indexset.discard(40)
+    assert list(indexset) == [0, 1, 2, 3]
+    assert indexset == SeqIndexSet.from_ranges([(0, 4)])
+    assert indexset != SeqIndexSet([0, 1, 2])
+    assert eval(repr(indexset)) == indexset
+
+
+def test_queries():
+    indexset = SeqIndexSet.from_ranges([(0, 3), (10, 12), (20, 21)])
+    assert indexset.max_index == 20
+    assert indexset.popcount() == len(indexset) == 6
+    assert list(indexset.ranges()) == [(0, 3), (10, 12), (20, 21)]
+    assert list(indexset.missing_ranges()) == [(3, 10), (12, 20)]
+    assert list(indexset.missing_ranges(25)) == [(3, 10), (12, 20), (21, 25)]
+    assert [indexset.rank(index) for index in (0, 2, 3, 11, 21, 100)] == [
+        0, 2, 3, 4, 6, 6
+    ]
+    assert SeqIndexSet().max_index is None
+
+
+@pytest.mark.parametrize(
+    "start, expected", [(0, 3), (2, 3), (3, 3), (10, 12), (11, 12), (20, 21)]
+)
+def test_next_free(start, expected):
+    indexset = SeqIndexSet.from_ranges([(0, 3), (10, 12), (20, 21)])
+    assert indexset.next_free(start) == expected
+    with pytest.raises(ValueError, match="next_free"):
+        indexset.next_free(-1)
+
+
+def test_stray_high_index_does_not_allocate_a_bitmap():
+    tracemalloc.start()
+    try:
+        indexset = SeqIndexSet([0, 1, 2, 99_999_999_999_999])
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 100_000
+    assert is_sparse(indexset)
+    assert indexset.to_list() == [0, 1, 2, 99_999_999_999_999]
+    assert indexset.next_free(0) == 3
+    assert indexset.max_index == 99_999_999_999_999
+    assert list(indexset.missing_ranges()) == [(3, 99_999_999_999_999)]
+
+
+def test_representation_follows_density():
+    assert not is_sparse(SeqIndexSet(range(0, 100_000, 2)))
+    # Un solo tramo enorme ocupa lo mismo que uno pequeño
+    assert is_sparse(SeqIndexSet.from_ranges([(0, 10**12)]))
+
+    # Al rellenar los huecos de un conjunto disperso vuelve al bitmap
+    indexset = SeqIndexSet([10**6])
+    assert is_sparse(indexset)
+    indexset_list = [10**6]
+    for index in range(0, 10**6, 3):
+        indexset.add(index)
+        indexset_list.append(index)
+    assert not is_sparse(indexset)
+    assert indexset.to_list() == sorted(indexset_list)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_python_set(seed):
+    rng = random.Random(seed)
+    top = rng.choice([100, 10**5, 10**15])
+    indexset = SeqIndexSet()
+    expected = set()
+    for _ in range(300):
+        operation = rng.random()
+        if operation < 0.5:
+            index = rng.randrange(top)
+            indexset.add(index)
+            expected.add(index)
+        elif operation < 0.7:
+            start = rng.randrange(top)
+            stop = start + rng.randrange(50)
+            indexset._add_range(start, stop)
+            expected.update(range(start, stop))
+        elif expected:
+            index = rng.choice(sorted(expected))
+            indexset.discard(index)
+            expected.discard(index)
+        assert len(indexset) == len(expected)
+
+    assert indexset.to_list() == sorted(expected)
+    assert indexset.popcount() == len(expected)
+    for _ in range(50):
+        index = rng.randrange(top)
+        assert (index in indexset) == (index in expected)
+        assert indexset.rank(index) == sum(1 for item in expected if item < index)
+        free = index
+        while free in expected:
+            free += 1
+        assert indexset.next_free(index) == free
+
+
+def test_pickle():
+    for indexset in (SeqIndexSet([1, 5]), SeqIndexSet([1, 10**15])):
+        assert pickle.loads(pickle.dumps(indexset)) == indexset
+
+
+def test_numerator_apis_accept_and_return_sets():
+    nd = NameNumerator(def_name="img")
+    names = [nd.get_seqname(index) for index in (0, 1, 3, 10**14)]
+    indexset = nd.get_seqindexes(names, as_set=True)
+    assert indexset.to_list() == [0, 1, 3, 10**14]
+    assert NameNumerator.get_missings(SeqIndexSet([0, 2])).to_list() == [1]
+    assert dict(NameNumerator.adjust_broken(SeqIndexSet([0, 2])).items()) == {
+        0: 0, 2: 1
+    }
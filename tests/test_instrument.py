@@ -0,0 +1,102 @@
+import pytest
+
+from namenumerator import NameNumerator
+from namenumerator import instrument
+
+
+# Métodos públicos que no se miden: configuración y la propia instrumentación
+NOT_MEASURED = {
+    "from_settings",
+    "with_defaults",
+    "enable_stats",
+    "disable_stats",
+    "stats",
+    "reset_stats",
+    "enable_cache",
+    "disable_cache",
+    "cache_info",
+}
+
+
+@pytest.fixture
+def nd():
+    return NameNumerator(def_name="img", def_ext="png")
+
+
+def test_every_public_method_is_measured():
+    public = {
+        name
+        for name, value in vars(NameNumerator).items()
+        if not name.startswith("_") and callable(getattr(NameNumerator, name))
+    }
+    assert public - NOT_MEASURED == set(instrument.PUBLIC_METHODS)
+
+
+def test_counts_calls_and_names(nd):
+    assert nd.stats().enabled is False
+    nd.enable_stats()
+    nd.get_seqname(3)
+    assert nd.get_seqindexes(["img.png", "img_2.png", "x.png", "img_x.png"]) == [0, 2]
+    nd.plan_compact([0, 2])
+
+    stats = nd.stats()
+    assert stats.enabled
+    assert stats.methods["get_seqname"].calls == 1
+    assert stats.methods["get_seqindexes"].calls == 1
+    assert stats.methods["plan_compact"].calls == 1
+    assert stats.methods["get_seqindexes"].seconds >= 0
+    assert (stats.first_name_hits, stats.fast_reject_hits) == (1, 1)
+    assert (stats.fast_reject_misses, stats.regex_failures) == (2, 1)
+    assert stats.parsed == 4
+
+
+def test_new_methods_are_measured(nd, tmp_path):
+    (tmp_path / "img_1.png").write_text("")
+    listing = tmp_path / "listing"
+    listing.write_text("img.png\nimg_3.png\n")
+    nd.enable_stats()
+    nd.scan_dir_cached(tmp_path)
+    nd.index_file(listing)
+    nd.migrate_plan(NameNumerator("-", def_name="img", def_ext="png"), ["img.png"])
+    methods = nd.stats().methods
+    for name in ("scan_dir_cached", "index_file", "migrate_plan"):
+        assert methods[name].calls == 1
+
+
+def test_disable_and_reset(nd):
+    nd.enable_stats()
+    nd.get_seqname(1)
+    nd.disable_stats()
+    nd.get_seqname(2)
+    assert nd.stats().methods["get_seqname"].calls == 1
+    assert "get_seqname" not in vars(nd)
+
+    nd.reset_stats()
+    assert nd.stats().methods == {}
+
+
+def test_tracer(nd):
+    spans = []
+
+    class Span:
+        def __init__(self, name):
+            self.name = name
+
+        def __enter__(self):
+            spans.append(("enter", self.name))
+
+        def __exit__(self, *exc_info):
+            spans.append(("exit", self.name))
+
+    nd.enable_stats(Span)
+    nd.get_seqname(1)
+    assert ("enter", "get_seqname") in spans
+    assert ("exit", "get_seqname") in spans
+    with pytest.raises(ValueError, match="tracer"):
+        nd.enable_stats(tracer="no")
+
+
+def test_error_messages_keep_public_name(nd):
+    nd.enable_stats()
+    with pytest.raises(ValueError, match=r"get_seqname\(\)"):
+        nd.get_seqname(-1)
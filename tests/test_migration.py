@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from namenumerator import NameNumerator, RenameExecutor
+from namenumerator.migration import MigrationError
+
+
+@pytest.fixture
+def old():
+    return NameNumerator(def_name="img", def_ext="png")
+
+
+def test_migrate_directory(tmp_path, old):
+    new = NameNumerator("-", min_numlen=3, def_name="img", def_ext="png")
+    names = ["img.png", "img_1.png", "img_2.png", "img_10.png", "other.txt"]
+    for itemname in names:
+        open(os.path.join(tmp_path, itemname), "w").close()
+
+    with os.scandir(tmp_path) as entries:
+        plan = old.migrate_plan(new, entries)
+    assert sorted(plan) == [
+        ("img_1.png", "img-001.png"),
+        ("img_10.png", "img-010.png"),
+        ("img_2.png", "img-002.png"),
+    ]
+    RenameExecutor(tmp_path).run(plan)
+    assert sorted(os.listdir(tmp_path)) == [
+        "img-001.png", "img-002.png", "img-010.png", "img.png", "other.txt"
+    ]
+
+
+def test_overlapping_names_are_chained(old):
+    # Con from_zero cada miembro va al nombre que deja libre el anterior
+    new = NameNumerator(from_zero=True, def_name="img", def_ext="png")
+    present = {"img.png", "img_1.png", "img_2.png", "img_3.png"}
+    plan = old.migrate_plan(new, sorted(present, reverse=True))
+    for src, dst in plan:
+        assert src in present and dst not in present
+        present.remove(src)
+        present.add(dst)
+    assert present == {"img.png", "img_0.png", "img_1.png", "img_2.png"}
+
+
+def test_collisions(old):
+    new = NameNumerator("-", def_name="img", def_ext="png")
+    with pytest.raises(MigrationError) as info:
+        old.migrate_plan(new, ["img_1.png", "img_01.png"])
+    assert len(info.value.collisions) == 1
+    with pytest.raises(MigrationError) as info:
+        old.migrate_plan(new, ["img_1.png", "img-1.png"])
+    assert info.value.collisions == [("img_1.png", "img-1.png")]
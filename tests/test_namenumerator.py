@@ -0,0 +1,59 @@
+import os
+import pickle
+
+import pytest
+
+from namenumerator import NameNumerator, SequenceRegistry, SequenceTracker
+
+
+@pytest.fixture
+def nd():
+    return NameNumerator(def_name="light", def_ext="bak")
+
+
+NAMES = ["light.bak", "light_2.bak", "other_1.bak"]
+
+
+def test_get_seqindexes_accepts_iterables(nd, tmp_path):
+    assert nd.get_seqindexes(NAMES) == [0, 2]
+    assert nd.get_seqindexes(iter(NAMES)) == [0, 2]
+    assert list(nd.iter_seqindexes(NAMES)) == [(0, "light.bak"), (2, "light_2.bak")]
+    for itemname in NAMES:
+        open(os.path.join(tmp_path, itemname), "w").close()
+    with os.scandir(tmp_path) as entries:
+        assert nd.get_seqindexes(entries) == [0, 2]
+
+
+@pytest.mark.parametrize("names", ["light.bak", b"light.bak", 3])
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda nd, names: nd.get_seqindexes(names),
+        lambda nd, names: nd.iter_seqindexes(names),
+        lambda nd, names: nd.classify_parallel(names, workers=1),
+        lambda nd, names: nd.migrate_plan(nd, names),
+        lambda nd, names: SequenceRegistry(nd, [("light", "bak")]).classify(names),
+        lambda nd, names: SequenceRegistry(nd).iter_classify(names),
+        lambda nd, names: SequenceTracker(nd, names),
+    ],
+)
+def test_single_name_is_not_a_listing(nd, call, names):
+    with pytest.raises(ValueError, match="iterable de nombres"):
+        call(nd, names)
+
+
+def test_matcher_is_immutable(nd):
+    matcher = nd.matcher()
+    with pytest.raises(AttributeError):
+        matcher._prefix = "other_"
+    with pytest.raises(AttributeError):
+        matcher.extra = 1
+    with pytest.raises(AttributeError):
+        del matcher._first
+    assert matcher.index_of("light_2.bak") == 2
+
+
+def test_matcher_pickle(nd):
+    matcher = pickle.loads(pickle.dumps(nd.matcher()))
+    assert (matcher.name, matcher.ext) == ("light", "bak")
+    assert matcher.index_of("light_2.bak") == 2
@@ -0,0 +1,48 @@
+import pytest
+
+from namenumerator import NameNumerator
+
+
+@pytest.fixture
+def nd():
+    return NameNumerator(def_name="img", def_ext="png")
+
+
+def names(nd, indexes):
+    return [nd.get_seqname(index) for index in indexes] + ["other.txt"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("as_set", [False, True])
+def test_same_result_as_get_seqindexes(nd, workers, as_set):
+    source = names(nd, [70_000, 3, 0, 3, 9, 150_000, 1])
+    expected = nd.get_seqindexes(source, as_set=as_set)
+    result = nd.classify_parallel(
+        source, workers=workers, chunk_size=2, as_set=as_set
+    )
+    if as_set:
+        assert result.to_list() == expected.to_list() == [0, 1, 3, 9, 70_000, 150_000]
+        assert len(result) == 6
+    else:
+        assert result == expected == [0, 1, 3, 3, 9, 70_000, 150_000]
+
+
+@pytest.mark.parametrize("as_set", [False, True])
+def test_no_members(nd, as_set):
+    result = nd.classify_parallel(["other.txt"], workers=1, as_set=as_set)
+    assert list(result) == []
+
+
+def test_indexes_beyond_64_bits(nd):
+    index = 2**70
+    result = nd.classify_parallel(names(nd, [index, 2]), workers=1)
+    assert result == [2, index]
+
+
+@pytest.mark.parametrize("index", [2**40, 2**70])
+def test_sparse_set(nd, index):
+    # Un indice enorme suelto no reserva un bitmap hasta él
+    result = nd.classify_parallel(
+        names(nd, [index, 2, 0, 1]), workers=1, chunk_size=2, as_set=True
+    )
+    assert list(result.ranges()) == [(0, 3), (index, index + 1)]
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from namenumerator import NameNumerator, SeqIndexSet
+
+
+def apply(seqindexes, plan):
+    """Ejecuta el plan sobre un conjunto comprobando que ningún destino está
+    ocupado y que cada origen existe."""
+    present = set(seqindexes)
+    for src, dst in plan:
+        assert src in present
+        present.remove(src)
+        if dst is not None:
+            assert dst not in present
+            present.add(dst)
+    return present
+
+
+def random_sequence(seed):
+    rng = random.Random(seed)
+    top = rng.randrange(1, 60)
+    return rng.sample(range(top), rng.randrange(0, min(top, 30)))
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_compact_is_minimal_and_collision_free(seed):
+    seqindexes = random_sequence(seed)
+    size = len(seqindexes)
+    plan = NameNumerator.plan_compact(seqindexes)
+    assert apply(seqindexes, plan) == set(range(size))
+    # Solo se mueve lo que está fuera de 0..n-1, que es obligatorio moverlo
+    assert len(plan) == sum(1 for index in seqindexes if index >= size)
+    assert all(src != dst for src, dst in plan)
+    assert NameNumerator.plan_compact(SeqIndexSet(seqindexes)) == plan
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_compact_keep_order(seed):
+    seqindexes = random_sequence(seed)
+    plan = NameNumerator.plan_compact(seqindexes, keep_order=True)
+    assert apply(seqindexes, plan) == set(range(len(seqindexes)))
+    moved = dict(plan)
+    final = [moved.get(index, index) for index in sorted(seqindexes)]
+    assert final == sorted(final)
+
+
+def test_compact_examples():
+    assert NameNumerator.plan_compact([0, 2, 3, 4]) == [(4, 1)]
+    assert NameNumerator.plan_compact([0, 2, 3, 4], keep_order=True) == [
+        (2, 1), (3, 2), (4, 3)
+    ]
+    assert NameNumerator.plan_compact([0, 1, 2]) == []
+    with pytest.raises(ValueError, match="plan_compact"):
+        NameNumerator.plan_compact([0, 0])
+
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("keep", [None, 1, 3, 10])
+def test_rotate_frees_zero_without_collisions(seed, keep):
+    seqindexes = random_sequence(seed)
+    plan = NameNumerator.plan_rotate(seqindexes, keep=keep)
+    result = apply(seqindexes, plan)
+    assert 0 not in result
+    if keep is not None:
+        assert len(result) <= keep - 1
+
+    # Solo se mueve el tramo contiguo desde 0; el resto no estorba
+    kept = sorted(seqindexes)[: None if keep is None else keep - 1]
+    run = 0
+    while run < len(kept) and kept[run] == run:
+        run += 1
+    renames = [step for step in plan if step[1] is not None]
+    deletions = [step for step in plan if step[1] is None]
+    assert len(renames) == run
+    assert len(deletions) == len(seqindexes) - len(kept)
+
+
+def test_rotate_examples():
+    assert NameNumerator.plan_rotate([0, 1, 3]) == [(1, 2), (0, 1)]
+    assert NameNumerator.plan_rotate([1, 2]) == []
+    assert NameNumerator.plan_rotate([0, 1, 2, 3], keep=3) == [
+        (3, None), (2, None), (1, 2), (0, 1)
+    ]
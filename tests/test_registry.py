@@ -0,0 +1,89 @@
+import itertools
+import pathlib
+
+import pytest
+
+from namenumerator import NameNumerator, SequenceRegistry
+
+SEQUENCES = [("light", "bak"), ("heavy", "bak"), ("db", "log")]
+
+
+@pytest.fixture
+def nd():
+    return NameNumerator(def_name="light", def_ext="bak")
+
+
+def listing(nd):
+    names = ["other.txt", "light_x.bak", "heavy.tar", "db_0.log"]
+    for position, (name, ext) in enumerate(SEQUENCES):
+        names += nd.get_seqnames(position, 20 + position, name=name, ext=ext)
+    return names
+
+
+def test_classify_matches_get_seqindexes(nd):
+    names = listing(nd)
+    registry = SequenceRegistry(nd, SEQUENCES)
+    result = registry.classify(names)
+    assert set(result) == set(SEQUENCES)
+    for name, ext in SEQUENCES:
+        assert result[(name, ext)] == nd.get_seqindexes(names, name=name, ext=ext)
+
+
+def test_unlisted_sequence_is_empty(nd):
+    registry = SequenceRegistry(nd, [("light", "bak"), ("empty", "log")])
+    assert registry.classify(["light.bak"]) == {
+        ("light", "bak"): [0], ("empty", "log"): []
+    }
+    assert registry.seqname_to_key("light_4.bak") == (("light", "bak"), 4)
+    assert registry.seqname_to_key("empty.bak") is None
+
+
+def test_iter_classify_is_lazy(nd):
+    registry = SequenceRegistry(nd, SEQUENCES)
+    consumed = []
+
+    def source():
+        for itemname in listing(nd):
+            consumed.append(itemname)
+            yield itemname
+
+    found = registry.iter_classify(source())
+    assert next(found) == (("light", "bak"), 0, "light.bak")
+    assert len(consumed) == 5
+
+
+def test_iter_seqindexes_streams_any_listing(nd):
+    consumed = []
+
+    def source():
+        for index in itertools.count():
+            consumed.append(index)
+            yield nd.get_seqname(index) if index % 2 else "other.txt"
+
+    stream = nd.iter_seqindexes(source())
+    assert list(itertools.islice(stream, 3)) == [
+        (1, "light_1.bak"), (3, "light_3.bak"), (5, "light_5.bak")
+    ]
+    assert consumed == list(range(6))
+
+    items = [pathlib.Path("/backups/light_2.bak"), "light.bak", b"light_1.bak"]
+    stream = nd.iter_seqindexes(items)
+    assert next(stream) == (2, "light_2.bak")
+    assert next(stream) == (0, "light.bak")
+    with pytest.raises(ValueError, match=r"iterable \(element: 2\)"):
+        next(stream)
+
+
+@pytest.mark.parametrize(
+    "value, type_name", [("light.bak", "str"), (b"light.bak", "bytes"), (3, "int")]
+)
+def test_invalid_names_message(nd, value, type_name):
+    with pytest.raises(ValueError) as info:
+        nd.iter_seqindexes(value)
+    message = str(info.value)
+    assert message.startswith("[!] Error en iter_seqindexes():")
+    assert "'iterable'" in message and "iterable de nombres" in message
+    assert message.endswith(f"no '{type_name}'.")
+
+    with pytest.raises(ValueError, match="Error en classify\\(\\).*'iterable'"):
+        SequenceRegistry(nd, SEQUENCES).classify(value)
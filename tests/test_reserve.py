@@ -0,0 +1,95 @@
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+from namenumerator import NameNumerator
+
+
+@pytest.fixture
+def nd():
+    return NameNumerator(def_name="run", def_ext="log")
+
+
+def reserve_many(path, count, queue):
+    nd = NameNumerator(def_name="run", def_ext="log")
+    queue.put([nd.reserve(path)[0] for _ in range(count)])
+
+
+def test_reserve_next_free(tmp_path, nd):
+    open(tmp_path / "run.log", "w").close()
+    open(tmp_path / "run_4.log", "w").close()
+    index, target = nd.reserve(tmp_path)
+    assert (index, target) == (5, os.path.join(tmp_path, "run_5.log"))
+    assert os.path.isfile(target)
+    assert nd.reserve(tmp_path)[0] == 6
+
+
+def test_reserve_dir(tmp_path, nd):
+    index, target = nd.reserve(tmp_path, name="batch", ext=None, kind="dir")
+    assert index == 0
+    assert os.path.isdir(target)
+    with pytest.raises(ValueError, match="kind"):
+        nd.reserve(tmp_path, kind="link")
+
+
+def test_reserve_skips_names_created_outside(tmp_path, nd):
+    assert nd.reserve(tmp_path)[0] == 0
+    # Otro proceso se adelanta sin que este lo sepa
+    open(tmp_path / "run_1.log", "w").close()
+    open(tmp_path / "run_2.log", "w").close()
+    assert nd.reserve(tmp_path)[0] == 3
+
+
+def test_reserve_rescan(tmp_path, nd):
+    for _ in range(3):
+        nd.reserve(tmp_path)
+    for itemname in os.listdir(tmp_path):
+        os.remove(tmp_path / itemname)
+    assert nd.reserve(tmp_path)[0] == 3
+    assert nd.reserve(tmp_path, rescan=True)[0] == 4
+    os.remove(tmp_path / "run_3.log")
+    os.remove(tmp_path / "run_4.log")
+    assert nd.reserve(tmp_path, rescan=True)[0] == 0
+
+
+def test_reserve_threads_unique(tmp_path, nd):
+    results = []
+    lock = threading.Lock()
+
+    def worker():
+        indexes = [nd.reserve(tmp_path)[0] for _ in range(50)]
+        with lock:
+            results.extend(indexes)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == list(range(400))
+    assert len(os.listdir(tmp_path)) == 400
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="fork no disponible",
+)
+def test_reserve_processes_unique(tmp_path):
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    processes = [
+        context.Process(target=reserve_many, args=(str(tmp_path), 40, queue))
+        for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    results = []
+    for _ in processes:
+        results.extend(queue.get(timeout=30))
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    assert len(results) == len(set(results)) == 160
+    assert len(os.listdir(tmp_path)) == 160
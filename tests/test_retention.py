@@ -0,0 +1,112 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from namenumerator import NameNumerator, RetentionPolicy, SeqIndexSet
+
+
+def at(*date):
+    """mtime (segundos) de una fecha local."""
+    return datetime(*date).timestamp()
+
+
+def test_last_by_index():
+    plan = RetentionPolicy(last=3).select([4, 0, 2, 1, 3])
+    assert plan == ([0, 1, 2], [3, 4])
+    assert RetentionPolicy(last=3).select(SeqIndexSet([0, 1, 2, 3, 4])) == plan
+
+
+def test_last_edge_cases():
+    policy = RetentionPolicy(last=3)
+    assert policy.select([]) == ([], [])
+    assert policy.select([5, 7]) == ([5, 7], [])
+    # Los repetidos cuentan una vez
+    assert policy.select([0, 0, 1, 1, 2, 3]) == ([0, 1, 2], [3])
+
+
+def test_last_by_mtime_and_ties():
+    mtimes = {0: 10.0, 1: 30.0, 2: 30.0, 3: 20.0}
+    # A igual mtime gana el indice más bajo
+    assert RetentionPolicy(last=2).select(list(mtimes), mtimes) == ([1, 2], [0, 3])
+    assert RetentionPolicy(last=1).select(list(mtimes), mtimes) == ([1], [0, 2, 3])
+
+
+def test_daily_keeps_newest_of_each_day():
+    mtimes = {
+        0: at(2024, 5, 3, 18),
+        1: at(2024, 5, 3, 9),
+        2: at(2024, 5, 2, 23),
+        3: at(2024, 5, 2, 1),
+        4: at(2024, 5, 1, 12),
+    }
+    plan = RetentionPolicy(daily=2).select(list(mtimes), mtimes)
+    assert plan == ([0, 2], [1, 3, 4])
+    # Las reglas se suman: last conserva además el 1
+    plan = RetentionPolicy(last=2, daily=3).select(list(mtimes), mtimes)
+    assert plan == ([0, 1, 2, 4], [3])
+
+
+def test_weekly_uses_iso_weeks_across_years():
+    mtimes = {
+        0: at(2025, 1, 2),  # semana 1 de 2025
+        1: at(2024, 12, 30),  # también semana 1 de 2025
+        2: at(2024, 12, 27),  # semana 52 de 2024
+    }
+    assert RetentionPolicy(weekly=2).select(list(mtimes), mtimes) == ([0, 2], [1])
+
+
+def test_monthly_and_yearly():
+    mtimes = {
+        0: at(2024, 3, 5),
+        1: at(2024, 3, 1),
+        2: at(2024, 2, 28),
+        3: at(2023, 12, 31),
+        4: at(2022, 6, 1),
+    }
+    assert RetentionPolicy(monthly=2).select(list(mtimes), mtimes) == (
+        [0, 2], [1, 3, 4]
+    )
+    assert RetentionPolicy(yearly=5).select(list(mtimes), mtimes) == (
+        [0, 3, 4], [1, 2]
+    )
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="regla"):
+        RetentionPolicy()
+    with pytest.raises(ValueError, match="last"):
+        RetentionPolicy(last=0)
+    with pytest.raises(ValueError, match="daily"):
+        RetentionPolicy(daily=1.5)
+    with pytest.raises(ValueError, match="mtimes"):
+        RetentionPolicy(daily=1).select([0, 1])
+    with pytest.raises(ValueError, match=r"select\(\).*'1'"):
+        RetentionPolicy(daily=1).select([0, 1], {0: 0.0})
+    with pytest.raises(ValueError, match="element: 1"):
+        RetentionPolicy(last=1).select([0, -1])
+
+
+def test_repr():
+    assert repr(RetentionPolicy(last=3, monthly=2)) == (
+        "RetentionPolicy(last=3, monthly=2)"
+    )
+
+
+def test_apply(tmp_path):
+    nd = NameNumerator(def_name="light", def_ext="bak")
+    days = {0: 5, 1: 5, 2: 4, 3: 3}
+    for index, day in days.items():
+        path = tmp_path / nd.get_seqname(index)
+        path.write_text("")
+        mtime = at(2024, 5, day, 12 - index)
+        os.utime(path, (mtime, mtime))
+    # Mismo indice que light_3.bak, se elimina con él
+    (tmp_path / "light_03.bak").write_text("")
+    os.utime(tmp_path / "light_03.bak", (at(2024, 5, 3), at(2024, 5, 3)))
+    (tmp_path / "other.txt").write_text("")
+
+    plan, report = RetentionPolicy(daily=2).apply(nd, tmp_path)
+    assert plan == ([0, 2], [1, 3])
+    assert report.deleted == 3
+    assert sorted(os.listdir(tmp_path)) == ["light.bak", "light_2.bak", "other.txt"]
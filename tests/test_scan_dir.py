@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from namenumerator import NameNumerator
+
+
+@pytest.fixture
+def nd():
+    return NameNumerator(def_name="light", def_ext="bak")
+
+
+@pytest.fixture
+def backups(tmp_path, nd):
+    for index in (3, 0, 2):
+        os.mkdir(tmp_path / nd.get_seqname(index))
+    (tmp_path / nd.get_seqname(5)).write_text("")
+    for position in range(50):
+        (tmp_path / f"unrelated_{position}.txt").write_text("")
+    (tmp_path / "light_x.bak").write_text("")
+    return tmp_path
+
+
+def test_indexes_and_entries_are_aligned(backups, nd):
+    seqindexes, entries = nd.scan_dir(backups)
+    assert seqindexes == [0, 2, 3, 5]
+    assert [entry.name for entry in entries] == [
+        nd.get_seqname(index) for index in seqindexes
+    ]
+    assert all(isinstance(entry, os.DirEntry) for entry in entries)
+
+
+def test_kind(backups, nd):
+    assert nd.scan_dir(backups, kind="dir")[0] == [0, 2, 3]
+    assert nd.scan_dir(backups, kind="file")[0] == [5]
+
+
+def test_symlink_to_directory_counts_as_dir(backups, nd):
+    os.symlink(backups / nd.get_seqname(0), backups / nd.get_seqname(7))
+    assert nd.scan_dir(backups, kind="dir")[0] == [0, 2, 3, 7]
+
+
+def test_foreign_names_are_rejected_before_the_regex(backups, nd):
+    nd.enable_stats()
+    nd.scan_dir(backups)
+    stats = nd.stats()
+    assert stats.fast_reject_hits == 50
+    # Solo los numerados de la secuencia (y light_x.bak) llegan al regex
+    assert stats.fast_reject_misses == 4
+    assert stats.regex_failures == 1
+
+
+def test_other_sequence_and_errors(backups, nd):
+    assert nd.scan_dir(backups, name="unrelated", ext="txt")[0] == list(range(1, 50))
+    assert nd.scan_dir(str(backups), name="missing")[0] == []
+    with pytest.raises(ValueError, match="scan_dir"):
+        nd.scan_dir(backups, kind="link")
+    with pytest.raises(FileNotFoundError):
+        nd.scan_dir(backups / "nope")
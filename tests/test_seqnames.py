@@ -0,0 +1,45 @@
+import itertools
+
+import pytest
+
+from namenumerator import NameNumerator
+
+SETTINGS = [
+    dict(separator=separator, enumerate_first=first, from_zero=zero,
+         min_numlen=numlen)
+    for separator, first, zero, numlen in itertools.product(
+        ["_", "-%"], [False, True], [False, True], [1, 3]
+    )
+]
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+@pytest.mark.parametrize("start, stop", [(0, 12), (0, 1), (5, 1200), (3, 3), (4, 2)])
+@pytest.mark.parametrize("ext", [None, "png"])
+def test_same_as_get_seqname(settings, start, stop, ext):
+    nd = NameNumerator(**settings, def_name="i%mg")
+    expected = [nd.get_seqname(index, ext=ext) for index in range(start, stop)]
+    assert nd.get_seqnames(start, stop, ext=ext) == expected
+    assert list(nd.iter_seqnames(start, stop, ext=ext)) == expected
+
+
+def test_round_trip():
+    nd = NameNumerator(min_numlen=2, def_name="img", def_ext="png")
+    names = nd.get_seqnames(0, 150)
+    assert nd.get_seqindexes(names) == list(range(150))
+
+
+def test_iter_seqnames_is_lazy():
+    nd = NameNumerator(def_name="img")
+    names = nd.iter_seqnames(0, 10**15)
+    assert list(itertools.islice(names, 3)) == ["img", "img_1", "img_2"]
+
+
+def test_arguments_are_validated_on_call():
+    nd = NameNumerator(def_name="img")
+    with pytest.raises(ValueError, match="iter_seqnames"):
+        nd.iter_seqnames(-1, 3)
+    with pytest.raises(ValueError, match="get_seqnames"):
+        nd.get_seqnames(0, "3")
+    with pytest.raises(ValueError, match="get_seqnames"):
+        NameNumerator().get_seqnames(0, 3)
@@ -0,0 +1,46 @@
+import gc
+import pickle
+
+import pytest
+
+from namenumerator import NameNumerator, NumeratorSettings
+
+
+def test_interned():
+    settings = NumeratorSettings("-", min_numlen=3, def_name="img")
+    assert NumeratorSettings("-", min_numlen=3, def_name="img") is settings
+    assert NameNumerator("-", min_numlen=3, def_name="img").settings is settings
+    assert pickle.loads(pickle.dumps(settings)) is settings
+
+
+def test_intern_table_does_not_keep_unused_settings():
+    gc.collect()
+    size = len(NumeratorSettings._interned)
+    for position in range(100):
+        NumeratorSettings(def_name=f"unused{position}")
+    gc.collect()
+    # Solo quedan las recientes
+    assert len(NumeratorSettings._recent) == NumeratorSettings.RECENT_SIZE
+    assert len(NumeratorSettings._interned) <= size + NumeratorSettings.RECENT_SIZE
+
+
+def test_repeated_construction_skips_validation(monkeypatch):
+    settings_id = id(NameNumerator(def_name="short-lived").settings)
+    gc.collect()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("validado otra vez")
+
+    monkeypatch.setattr(NameNumerator, "_get_separator", staticmethod(fail))
+    monkeypatch.setattr(NameNumerator, "_get_def_name", staticmethod(fail))
+    settings = NameNumerator(def_name="short-lived").settings
+    assert id(settings) == settings_id
+    assert settings.def_name == "short-lived"
+
+
+def test_immutable():
+    settings = NumeratorSettings()
+    with pytest.raises(AttributeError):
+        settings._separator = "-"
+    with pytest.raises(AttributeError):
+        del settings._def_name
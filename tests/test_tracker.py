@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from namenumerator import NameNumerator, SequenceTracker
+
+
+@pytest.fixture
+def nd():
+    return NameNumerator(def_name="img", def_ext="png")
+
+
+def test_queries(nd):
+    tracker = SequenceTracker(nd, ["img.png", "img_1.png", "img_3.png", "x.txt"])
+    assert tracker.seqindexes() == [0, 1, 3]
+    assert (tracker.max_index(), tracker.next_free(), tracker.lowest_gap()) == (3, 4, 2)
+    assert not tracker.is_contiguous()
+
+    assert tracker.allocate(fill_gaps=True) == "img_2.png"
+    assert tracker.is_contiguous()
+    assert tracker.allocate() == "img_4.png"
+    assert tracker.remove("img_4.png") == 4
+    assert tracker.remove("img_4.png") is None
+    assert tracker.add("other.png") is None
+
+
+def test_duplicates(nd):
+    tracker = SequenceTracker(nd, ["img.png", "img_1.png", "img_01.png"])
+    assert tracker.seqindexes() == [0, 1, 1]
+    assert not tracker.is_contiguous()
+    tracker.remove("img_01.png")
+    assert tracker.is_contiguous()
+
+
+def test_matches_full_recount(nd):
+    rng = random.Random(0)
+    tracker = SequenceTracker(nd)
+    present = set()
+    for _ in range(2000):
+        index = rng.randrange(60)
+        itemname = nd.get_seqname(index)
+        if index in present and rng.random() < 0.6:
+            tracker.remove(itemname)
+            present.discard(index)
+        else:
+            tracker.add(itemname)
+            present.add(index)
+
+        assert tracker.seqindexes() == sorted(present)
+        assert tracker.max_index() == (max(present) if present else None)
+        next_free = max(present) + 1 if present else 0
+        assert tracker.next_free() == next_free
+        gaps = set(range(next_free)) - present
+        assert tracker.lowest_gap() == min(gaps, default=next_free)
+
+
+def test_heaps_bounded_under_churn(nd):
+    tracker = SequenceTracker(nd, [nd.get_seqname(index) for index in range(10)])
+    for _ in range(10000):
+        tracker.remove("img_5.png")
+        tracker.add("img_5.png")
+        tracker.remove("img_9.png")
+        tracker.add("img_9.png")
+    assert len(tracker._max_heap) <= 3 * 10 + 64
+    assert len(tracker._free) <= 3 * 11 + 64
+    assert (tracker.max_index(), tracker.lowest_gap()) == (9, 10)
+    assert tracker.is_contiguous()
@@ -0,0 +1,56 @@
+import pytest
+
+from namenumerator import NameNumerator
+from namenumerator import namenumerator as module
+
+
+@pytest.fixture
+def no_error_context(monkeypatch):
+    """Falla si algo formatea un mensaje de error."""
+
+    def forbidden(*, stack=1):
+        raise AssertionError("_func_emsg en el camino feliz")
+
+    monkeypatch.setattr(module, "_func_emsg", forbidden)
+
+
+def test_valid_input_does_not_build_error_context(no_error_context):
+    nd = NameNumerator("-", min_numlen=3, def_name="img", def_ext="png")
+    assert nd.get_seqname(0) == "img.png"
+    assert nd.get_seqname(12) == "img-012.png"
+    assert nd.seqname_to_index("img-012.png") == 12
+    assert nd.get_seqnames(0, 3) == ["img.png", "img-001.png", "img-002.png"]
+    assert nd.analyze([0, 1, 2]).contiguous
+
+
+@pytest.mark.parametrize(
+    "call, function, vname",
+    [
+        (lambda nd: nd.get_seqname(-1), "get_seqname", "index"),
+        (lambda nd: nd.get_seqname("1"), "get_seqname", "index"),
+        (lambda nd: nd.seqname_to_index(3), "seqname_to_index", "seqname"),
+        (lambda nd: nd.get_seqnames(0, 2, name="a.b"), "get_seqnames", "name"),
+        (lambda nd: NameNumerator(separator=""), "__init__", "separator"),
+        (lambda nd: NameNumerator(min_numlen=-1), "__init__", "min_numlen"),
+        (lambda nd: NameNumerator(separator="1"), "__init__", "separator"),
+    ],
+)
+def test_error_names_public_caller(call, function, vname):
+    nd = NameNumerator(def_name="img")
+    with pytest.raises(ValueError) as info:
+        call(nd)
+    message = str(info.value)
+    assert message.startswith(f"[!] Error en {function}():")
+    assert f"'{vname}'" in message
+
+
+def test_no_colors_without_terminal():
+    # Con pytest capturando stderr no hay terminal: mensajes sin códigos ANSI
+    with pytest.raises(ValueError) as info:
+        NameNumerator().get_seqname(-1, "img")
+    assert "\x1b[" not in str(info.value)
+
+
+def test_missing_name_without_default():
+    with pytest.raises(ValueError, match="get_seqname"):
+        NameNumerator().get_seqname(1)
@@ -0,0 +1,142 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from namenumerator import NameNumerator, SequenceWatcher
+from namenumerator.watcher import _inotify_available
+
+
+@pytest.fixture
+def nd():
+    return NameNumerator(def_name="img", def_ext="png")
+
+
+def touch(directory, itemname):
+    open(os.path.join(directory, itemname), "w").close()
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_tracks_changes(tmp_path, nd, use_inotify):
+    if use_inotify and not _inotify_available():
+        pytest.skip("inotify no disponible")
+    touch(tmp_path, nd.get_seqname(0))
+    changes = []
+    watcher = SequenceWatcher(
+        nd,
+        tmp_path,
+        callback=changes.append,
+        poll_interval=0.05,
+        use_inotify=use_inotify,
+    )
+    with watcher:
+        assert watcher.seqindexes() == [0]
+        touch(tmp_path, nd.get_seqname(2))
+        touch(tmp_path, "other.txt")
+        wait_for(lambda: watcher.seqindexes() == [0, 2])
+        assert watcher.lowest_gap() == 1
+        os.remove(os.path.join(tmp_path, nd.get_seqname(0)))
+        wait_for(lambda: watcher.seqindexes() == [2])
+    assert watcher.stopped
+    assert [change.kind for change in changes] == ["added", "added", "removed"]
+
+
+def test_async_iteration_ends_on_stop(tmp_path, nd):
+    async def main(watcher):
+        changes = []
+
+        async def consume():
+            async for change in watcher:
+                changes.append(change)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        touch(tmp_path, nd.get_seqname(1))
+        await asyncio.sleep(0.3)
+        watcher.stop()
+        await asyncio.wait_for(task, 5)
+        return changes
+
+    watcher = SequenceWatcher(nd, tmp_path, poll_interval=0.05, use_inotify=False)
+    changes = asyncio.run(main(watcher.start()))
+    assert [change.index for change in changes] == [1]
+
+
+@pytest.mark.skipif(not _inotify_available(), reason="inotify no disponible")
+def test_async_iteration_ends_when_directory_is_removed(tmp_path, nd):
+    directory = tmp_path / "watched"
+    directory.mkdir()
+    touch(directory, nd.get_seqname(0))
+
+    async def main(watcher):
+        changes = []
+
+        async def consume():
+            async for change in watcher:
+                changes.append(change)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        os.remove(directory / nd.get_seqname(0))
+        directory.rmdir()
+        await asyncio.wait_for(task, 5)
+        return changes
+
+    watcher = SequenceWatcher(nd, directory, use_inotify=True).start()
+    changes = asyncio.run(main(watcher))
+    assert watcher.stopped
+    assert [change.kind for change in changes] == ["removed"]
+    watcher.stop()
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_start_without_directory(tmp_path, nd, use_inotify):
+    watcher = SequenceWatcher(nd, tmp_path / "missing", use_inotify=use_inotify)
+    with pytest.raises(FileNotFoundError):
+        watcher.start()
+
+
+def test_polling_stops_when_directory_is_removed(tmp_path, nd):
+    directory = tmp_path / "watched"
+    directory.mkdir()
+    touch(directory, nd.get_seqname(0))
+    changes = []
+    watcher = SequenceWatcher(
+        nd, directory, callback=changes.append, poll_interval=0.02, use_inotify=False
+    ).start()
+
+    os.remove(directory / nd.get_seqname(0))
+    directory.rmdir()
+    wait_for(lambda: watcher.stopped)
+    watcher._thread.join(5)
+    assert not watcher._thread.is_alive()
+    assert [change.kind for change in changes] == ["added", "removed"]
+    watcher.stop()
+
+
+def test_emit_with_subscribers_changing(tmp_path, nd):
+    # Un suscriptor que se da de baja durante la entrega no hace saltar al resto
+    watcher = SequenceWatcher(nd, tmp_path, use_inotify=False)
+    loop = asyncio.new_event_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    class Leaving:
+        def call_soon_threadsafe(self, *args):
+            watcher._subscribers.remove(leaving)
+
+    leaving = (asyncio.Queue(), Leaving())
+    watcher._subscribers.extend([leaving, (queue, loop)])
+    try:
+        watcher._added(nd.get_seqname(3))
+        loop.run_until_complete(asyncio.sleep(0))
+        assert queue.qsize() == 1
+    finally:
+        loop.close()